@@ -8,9 +8,14 @@ import sys
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Union
 from domain.document import Document, Page, Section
-from domain.pipeline import PipelineConfig, PipelineStepConfig, PipelineRun, PipelineStatus, StepType
+from domain.pipeline import PipelineConfig, PipelineStepConfig, PipelineRun, PipelineError, PipelineStatus, StepType
 from domain.chunk import Chunk, Metadata, ChunkType
 from infrastructure.loaders.document_factory import DocumentFactory
+from infrastructure.processors.line_splitter import LineSplitter
+from infrastructure.processors.delimiter_splitter import DelimiterSplitter
+from infrastructure.processors.paragraph_splitter import ParagraphSplitter
+from infrastructure.processors.sentence_splitter import SentenceSplitter
+from infrastructure.processors.regex_extractor import RegexExtractor
 from infrastructure.processors.metadata_propagator import MetadataPropagator
 from infrastructure.security.script_sandbox import ScriptSandbox
 from application.resource_monitor import ResourceMonitor
@@ -18,6 +23,16 @@ from datetime import datetime
 import time
 import os
 
+# Processor classes by step type (instantiated per call by _get_step_processor)
+_PROCESSOR_CLASSES = {
+    StepType.LINE_SPLITTER: LineSplitter,
+    StepType.DELIMITER_SPLITTER: DelimiterSplitter,
+    StepType.PARAGRAPH_SPLITTER: ParagraphSplitter,
+    StepType.SENTENCE_SPLITTER: SentenceSplitter,
+    StepType.REGEX_EXTRACTOR: RegexExtractor,
+    StepType.METADATA_PROPAGATOR: MetadataPropagator
+}
+
 class DocumentExecutor:
     """
     Executes pipeline steps for individual documents
@@ -46,6 +61,7 @@ class DocumentExecutor:
         run = PipelineRun(
             id=f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.basename(document_path)}",
             pipeline_id=pipeline_config.id,
+            pipeline_name=pipeline_config.name,
             start_time=datetime.now(),
             status=PipelineStatus.RUNNING,
             document_paths=[document_path],
@@ -81,12 +97,9 @@ class DocumentExecutor:
             run.end_time = datetime.now()
             run.status = PipelineStatus.FAILED
             run.error_count = 1
-            run.errors = [{
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "document_path": document_path
-            }]
+            run.errors = []
+            run.errors_raw.clear()
+            run.record_error(PipelineError.from_exception(e, document_path=document_path))
             
             # Log failure
             from infrastructure.database.logging_service import LoggingService
@@ -117,8 +130,9 @@ class DocumentExecutor:
             step_start_time = time.time()
             
             try:
-                # Get input for this step
-                input_data = self._get_step_input(step_config, step_results, document)
+                # Get input for this step (output of input step, document otherwise)
+                prev_id = step_config.input_step_id
+                input_data = step_results[prev_id]["output"] if prev_id and prev_id in step_results else document
                 
                 # Execute step
                 output_data = self._execute_step(step_config, input_data, document, run)
@@ -133,8 +147,7 @@ class DocumentExecutor:
                 from infrastructure.database.logging_service import LoggingService, LogLevel
                 logging_service = LoggingService(self.db)
                 logging_service.log_message(
-                    level=LogLevel.INFO,
-                    message=f"Step completed: {step_config.name}",
+                    LogLevel.INFO, "Step completed: %s", step_config.name,
                     pipeline_id=run.pipeline_id,
                     pipeline_run_id=run.id,
                     extra_data={
@@ -153,12 +166,10 @@ class DocumentExecutor:
                 
             except Exception as e:
                 # Log step failure
-                error_msg = f"Step failed: {step_config.name} - {str(e)}"
                 from infrastructure.database.logging_service import LoggingService, LogLevel
                 logging_service = LoggingService(self.db)
                 logging_service.log_message(
-                    level=LogLevel.ERROR,
-                    message=error_msg,
+                    LogLevel.ERROR, "Step failed: %s - %s", step_config.name, e,
                     pipeline_id=run.pipeline_id,
                     pipeline_run_id=run.id,
                     extra_data={
@@ -169,13 +180,7 @@ class DocumentExecutor:
                 )
                 
                 # Add to run errors
-                run.errors.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "step_id": step_config.id,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "stage": f"step_{step_config.name}"
-                })
+                run.record_error(PipelineError.from_exception(e, stage=f"step_{step_config.name}", step_id=step_config.id))
                 
                 # If step is critical (not optional), stop processing
                 if not step_config.params.get("optional", False):
@@ -183,24 +188,6 @@ class DocumentExecutor:
         
         return all_chunks
     
-    def _get_step_input(self, step_config: PipelineStepConfig, step_results: Dict[str, Any], 
-                       document: Document):
-        """
-        Get input data for step based on configuration
-        """
-        if step_config.input_step_id:
-            # Use output from previous step
-            prev_result = step_results.get(step_config.input_step_id)
-            if prev_result:
-                return prev_result["output"]
-        
-        # For initial steps, input comes from document
-        if step_config.type == StepType.DOCUMENT_LOADER:
-            return document
-        
-        # For other steps without explicit input, return document or empty
-        return document
-    
     def _execute_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
         """
         Execute individual pipeline step
@@ -284,8 +271,9 @@ class DocumentExecutor:
                 chunks = splitter.process(page.raw_text, step_config.params)
                 # Propagate metadata
                 for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
+                    meta = chunk.ensure_owned_meta()
+                    meta.document_id = document.id
+                    meta.page_num = page.number
                 all_chunks.extend(chunks)
             return all_chunks
         elif isinstance(input_data, list):
@@ -317,8 +305,9 @@ class DocumentExecutor:
             for page in input_data.pages:
                 chunks = splitter.process(page.raw_text, step_config.params)
                 for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
+                    meta = chunk.ensure_owned_meta()
+                    meta.document_id = document.id
+                    meta.page_num = page.number
                 all_chunks.extend(chunks)
             return all_chunks
         elif isinstance(input_data, list):
@@ -367,23 +356,12 @@ class DocumentExecutor:
         """
         Get appropriate processor for step type
         """
-        from domain.interfaces import IChunkProcessor
-        
-        processor_map = {
-            StepType.LINE_SPLITTER: "infrastructure.processors.LineSplitter",
-            StepType.DELIMITER_SPLITTER: "infrastructure.processors.DelimiterSplitter", 
-            StepType.PARAGRAPH_SPLITTER: "infrastructure.processors.ParagraphSplitter",
-            StepType.SENTENCE_SPLITTER: "infrastructure.processors.SentenceSplitter",
-            StepType.REGEX_EXTRACTOR: "infrastructure.processors.RegexExtractor",
-            StepType.METADATA_PROPAGATOR: "infrastructure.processors.MetadataPropagator"
-        }
-        
-        if step_type in processor_map:
-            module_path, class_name = processor_map[step_type].rsplit('.', 1)
-            module = __import__(module_path, fromlist=[class_name])
-            return getattr(module, class_name)()
+        # Instances stay per call since some processors keep state
+        processor_class = _PROCESSOR_CLASSES.get(step_type)
+        if processor_class is None:
+            raise ValueError(f"No processor found for step type: {step_type}")
         
-        raise ValueError(f"No processor found for step type: {step_type}")
+        return processor_class()
     
     def validate_document_compatibility(self, pipeline_config: PipelineConfig, document_path: str) -> List[str]:
         """
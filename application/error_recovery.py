@@ -5,7 +5,7 @@ Error Recovery Service - Handles failures and recovery strategies
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Set
 from domain.pipeline import PipelineConfig, PipelineRun, PipelineStatus
 from datetime import datetime, timedelta
 import json
@@ -452,6 +452,48 @@ class ErrorRecoveryService:
             except OSError:
                 pass  # File might be in use
     
+    def get_processed_documents(self, pipeline_id: str, document_paths: List[str]) -> Set[str]:
+        """
+        Get documents already processed successfully by pipeline and not modified since
+        Args:
+            pipeline_id: Pipeline identifier
+            document_paths: Document paths to check
+        Returns:
+            Set of document paths that can be skipped on re-run
+        """
+        processed = set()
+        paths = list(document_paths)
+        
+        # Document runs store their path in metadata (one query per 500 paths)
+        for i in range(0, len(paths), 500):
+            batch = paths[i:i + 500]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.db.execute_query(f"""
+                SELECT json_extract(metadata_json, '$.source_document') AS document_path,
+                       MAX(end_time) AS end_time
+                FROM pipeline_runs
+                WHERE pipeline_id = ? AND status = ?
+                  AND json_extract(metadata_json, '$.source_document') IN ({placeholders})
+                GROUP BY document_path
+            """, (pipeline_id, PipelineStatus.COMPLETED.value, *batch))
+            
+            for row in rows:
+                try:
+                    modified_at = datetime.fromtimestamp(os.path.getmtime(row["document_path"]))
+                except OSError:
+                    continue  # Missing documents are reported by the executor
+                
+                if row["end_time"] and datetime.fromisoformat(row["end_time"]) >= modified_at:
+                    processed.add(row["document_path"])
+        
+        return processed
+    
+    def is_already_processed(self, pipeline_id: str, document_path: str) -> bool:
+        """
+        Check if document was processed successfully by pipeline and not modified since
+        """
+        return document_path in self.get_processed_documents(pipeline_id, [document_path])
+    
     def get_error_statistics(self, pipeline_id: str, days_back: int = 7) -> Dict[str, Any]:
         """
         Get error statistics for pipeline
@@ -5,8 +5,8 @@ Manages pipeline lifecycle: creation, validation, execution, monitoring
 """
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Union
-from domain.pipeline import PipelineConfig, PipelineStepConfig, PipelineRun, PipelineStatus, StepType
+from typing import Dict, Any, List, Optional, Union, Set, Tuple, Callable
+from domain.pipeline import PipelineConfig, PipelineStepConfig, PipelineRun, PipelineError, PipelineStatus, StepType, RunProgress
 from domain.document import Document
 from domain.chunk import Chunk
 from infrastructure.database.unified_db import UnifiedDatabase
@@ -18,12 +18,52 @@ from infrastructure.security.script_sandbox import ScriptSandbox, ScriptSecurity
 from application.task_dispatcher import TaskDispatcher
 from application.error_recovery import ErrorRecoveryService
 from application.resource_monitor import ResourceMonitor
+from infrastructure.processors.line_splitter import LineSplitter
+from infrastructure.processors.delimiter_splitter import DelimiterSplitter
+from infrastructure.processors.paragraph_splitter import ParagraphSplitter
+from infrastructure.processors.sentence_splitter import SentenceSplitter
+from infrastructure.processors.regex_extractor import RegexExtractor
+from infrastructure.processors.metadata_propagator import MetadataPropagator
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+from multiprocessing import get_context
 from datetime import datetime
+import hashlib
 import json
-import secrets
+import logging
 import threading
 import time
 import os
+import stat
+
+try:
+    import orjson
+except ImportError:  # Optional, stdlib json is used without it
+    orjson = None
+
+# Stateless chunk processors shared by all pipeline runs
+_PROCESSORS = {
+    StepType.LINE_SPLITTER: LineSplitter(),
+    StepType.DELIMITER_SPLITTER: DelimiterSplitter(),
+    StepType.PARAGRAPH_SPLITTER: ParagraphSplitter(),
+    StepType.SENTENCE_SPLITTER: SentenceSplitter(),
+    StepType.REGEX_EXTRACTOR: RegexExtractor()
+}
+
+# Step input kinds known before execution (None when only known at run time)
+_INPUT_DOCUMENT = "document"
+_INPUT_CHUNK_LIST = "chunk_list"
+
+# Exporter steps pass their input through unchanged
+_PASS_THROUGH_STEPS = {StepType.DB_EXPORTER, StepType.FILE_EXPORTER, StepType.JSON_EXPORTER}
+
+# Steps that may modify their input chunks in place, never run concurrently with other steps of their level
+_IN_PLACE_STEPS = {StepType.METADATA_PROPAGATOR, StepType.USER_SCRIPT}
+
+# Exporter steps writing buffered files, run by the parent when documents are processed in worker processes
+_BUFFERED_EXPORT_STEPS = {StepType.FILE_EXPORTER, StepType.JSON_EXPORTER}
+
+# Executable step: (result slot, input result slot or None, step configuration, step handler)
+_PlannedStep = Tuple[int, Optional[int], PipelineStepConfig, Callable]
 
 class PipelineManager:
     """
@@ -42,9 +82,54 @@ class PipelineManager:
         # Track current pipeline ID
         self.current_pipeline_id = None
         
-        # Active pipeline runs
+        # Active pipeline runs (run_id -> run) and run IDs per pipeline
         self.active_runs: Dict[str, PipelineRun] = {}
-        self.run_lock = threading.Lock()
+        self._active_by_pipeline: Dict[str, Set[str]] = {}
+        
+        # Run tracking of a pipeline is guarded by one of the shard locks
+        self._shard_locks = [threading.Lock() for _ in range(16)]
+        self._executor_lock = threading.Lock()
+        
+        # Parsed configurations (pipeline_id -> (time.monotonic() when loaded, config)) and
+        # validation results (config hash -> (errors, levels))
+        self._config_cache: Dict[str, Tuple[float, PipelineConfig]] = {}
+        self.config_cache_ttl = 5.0  # seconds, picks up changes saved by other managers
+        self._validation_cache: Dict[str, Tuple[List[str], Optional[List[List[str]]]]] = {}
+        self.validation_cache_size = 256
+        
+        # Document lists longer than this are validated per directory via scandir
+        self.scandir_threshold = 64
+        
+        # Script process pools of runs with USER_SCRIPT steps
+        # (run_id -> [validated script codes, pool or None until the first script call])
+        self._script_pools: Dict[str, list] = {}
+        self._script_pools_lock = threading.Lock()
+        
+        # File exporters shared by export steps (created on first use)
+        self._file_exporter = None
+        self._json_exporter = None
+        
+        # Chunks of file/JSON export steps written in batches
+        # ((run_id, stage, output_path, file_name) -> [export callable, chunks, written parts])
+        self._export_buffers: Dict[Tuple[str, str, str, str], list] = {}
+        self._export_buffers_lock = threading.Lock()
+        self.export_batch_size = 1000
+        
+        # Chunks of export steps kept for the parent process by a document worker ([(step_id, chunks)])
+        self._collected_exports: List[Tuple[str, List[Any]]] = []
+        
+        # Long-lived target database exporters (db_config key -> (exporter, lock))
+        self._exporter_pool: Dict[str, tuple] = {}
+        self._exporter_pool_lock = threading.Lock()
+        
+        # Worker processes used by pipelines with source_config "use_document_processes"
+        # once a run has at least document_process_threshold documents
+        self.max_document_workers = os.cpu_count() or 1
+        self.document_process_threshold = 16
+        
+        # Thread pool for steps of one dependency level (threads start on demand)
+        self.max_step_workers = 8
+        self._step_executor: Optional[ThreadPoolExecutor] = None
     
     def create_pipeline(self, config: PipelineConfig) -> str:
         """
@@ -57,28 +142,17 @@ class PipelineManager:
             ValueError: If configuration is invalid
             SecurityError: If scripts fail security validation
         """
-        # Validate configuration
+        # Validate configuration (also sets step execution levels stored with it)
         validation_errors = self.validate_pipeline_config(config)
         if validation_errors:
             raise ValueError(f"Pipeline configuration validation failed: {validation_errors}")
         
-        # Validate all scripts in pipeline steps
-        for step in config.steps:
-            if step.type == StepType.USER_SCRIPT:
-                script_id = step.params.get("script_id")
-                if script_id:
-                    script_data = self.script_manager.load_script(script_id)
-                    if not script_data:
-                        raise ValueError(f"Script not found: {script_id}")
-                    
-                    # Validate script security
-                    from infrastructure.security.script_sandbox import ScriptSecurityValidator
-                    security_errors = ScriptSecurityValidator.validate_script_security(script_data["code"])
-                    if security_errors:
-                        raise SecurityError(f"Script security validation failed: {security_errors}")
+        # Validate security of all scripts in pipeline steps
+        self._collect_script_codes(config)
         
         # Save to database and get pipeline ID
         pipeline_id = self.config_service.save_pipeline_config(config)
+        self.invalidate_pipeline_config(pipeline_id)
         
         # Update config with the saved ID
         config.id = pipeline_id
@@ -104,18 +178,19 @@ class PipelineManager:
         Returns:
             bool: True if updated successfully
         """
-        # Validate new configuration
+        # Validate new configuration (also sets step execution levels stored with it)
         validation_errors = self.validate_pipeline_config(config)
         if validation_errors:
             raise ValueError(f"Pipeline configuration validation failed: {validation_errors}")
         
         # Check if pipeline is currently running
-        with self.run_lock:
-            if pipeline_id in self.active_runs:
+        with self._lock_for(pipeline_id):
+            if self._active_by_pipeline.get(pipeline_id):
                 raise RuntimeError(f"Cannot update pipeline {pipeline_id} - currently running")
         
         # Update in database
         success = self.config_service.update_pipeline_config(pipeline_id, config)
+        self.invalidate_pipeline_config(pipeline_id)
         
         if success:
             self.logging_service.log_message(
@@ -135,12 +210,13 @@ class PipelineManager:
             bool: True if deleted successfully
         """
         # Check if pipeline is currently running
-        with self.run_lock:
-            if pipeline_id in self.active_runs:
+        with self._lock_for(pipeline_id):
+            if self._active_by_pipeline.get(pipeline_id):
                 raise RuntimeError(f"Cannot delete pipeline {pipeline_id} - currently running")
         
         # Soft delete in database
         success = self.config_service.delete_pipeline_config(pipeline_id)
+        self.invalidate_pipeline_config(pipeline_id)
         
         if success:
             self.logging_service.log_message(
@@ -159,7 +235,76 @@ class PipelineManager:
         Returns:
             PipelineConfig: Configuration or None if not found
         """
-        return self.config_service.load_pipeline_config(pipeline_id)
+        config = self._get_cached_config(pipeline_id)
+        if config is None:
+            config = self.config_service.load_pipeline_config(pipeline_id)
+            if config is not None:
+                self._cache_loaded_config(config)
+        
+        return config
+    
+    def get_pipeline_configs(self, pipeline_ids: List[str]) -> Dict[str, PipelineConfig]:
+        """
+        Get several pipeline configurations, loading uncached ones with a single query
+        Args:
+            pipeline_ids: Pipeline identifiers
+        Returns:
+            Dict mapping pipeline_id to configuration (missing pipelines are absent)
+        """
+        configs = {}
+        missing = []
+        for pipeline_id in pipeline_ids:
+            config = self._get_cached_config(pipeline_id)
+            if config is None:
+                missing.append(pipeline_id)
+            else:
+                configs[pipeline_id] = config
+        
+        if missing:
+            for pipeline_id, config in self.config_service.load_pipeline_configs(missing).items():
+                self._cache_loaded_config(config)
+                configs[pipeline_id] = config
+        
+        return configs
+    
+    def invalidate_pipeline_config(self, pipeline_id: str):
+        """
+        Drop cached configuration (next read loads it from database)
+        Args:
+            pipeline_id: Pipeline identifier
+        """
+        self._config_cache.pop(pipeline_id, None)
+    
+    def _get_cached_config(self, pipeline_id: str) -> Optional[PipelineConfig]:
+        """
+        Get cached configuration if loaded within config_cache_ttl
+        """
+        entry = self._config_cache.get(pipeline_id)
+        if entry is None or time.monotonic() - entry[0] > self.config_cache_ttl:
+            return None
+        return entry[1]
+    
+    def _cache_loaded_config(self, config: PipelineConfig):
+        """
+        Cache configuration loaded from database
+        Args:
+            config: Loaded pipeline configuration
+        """
+        # Records saved before execution levels were stored get them once
+        if not self._has_valid_levels(config):
+            try:
+                config.execution_levels = self._topo_levels(config)
+            except ValueError:
+                pass  # Cyclic legacy config, execution reports the error
+            else:
+                try:
+                    self.config_service.update_execution_levels(config.id, config.execution_levels)
+                except Exception:
+                    # Levels are recomputed on a later load, the read itself succeeds
+                    logging.getLogger("AutoTextETL").warning(
+                        "Failed to store execution levels of pipeline %s", config.id, exc_info=True
+                    )
+        self._config_cache[config.id] = (time.monotonic(), config)
     
     def list_pipelines(self, active_only: bool = True) -> List[Dict[str, Any]]:
         """
@@ -179,6 +324,20 @@ class PipelineManager:
         Returns:
             List of validation errors (empty if valid)
         """
+        # Reuse structural result of identical configuration validated before,
+        # scripts and source paths can change in between and are always checked
+        cache_key = hashlib.sha1(json.dumps(
+            {"name": config.name, "steps": config.to_dict()["steps"]},
+            sort_keys=True, default=str
+        ).encode('utf-8')).hexdigest()
+        
+        cached = self._validation_cache.get(cache_key)
+        if cached is not None:
+            cached_errors, cached_levels = cached
+            if cached_levels is not None:
+                config.execution_levels = [list(level) for level in cached_levels]
+            return list(cached_errors) + self._validate_step_resources(config)
+        
         errors = []
         
         # Basic validation
@@ -188,44 +347,102 @@ class PipelineManager:
         if not config.steps:
             errors.append("Pipeline must have at least one step")
         
-        # Validate step connections
-        step_ids = {step.id for step in config.steps}
+        # Build step lookup once and share it across validation passes
+        id_to_step = {step.id: step for step in config.steps}
+        
+        errors.extend(self._validate_all(config, id_to_step))
+        
+        # Reject dependency cycles, acyclic configurations keep their execution levels
+        levels = None
+        try:
+            levels = self._topo_levels(config)
+            config.execution_levels = levels
+        except ValueError:
+            errors.append("Cycle detected in pipeline DAG")
+        
+        # Drop oldest entry when cache is full
+        if len(self._validation_cache) >= self.validation_cache_size:
+            self._validation_cache.pop(next(iter(self._validation_cache)), None)
+        self._validation_cache[cache_key] = (list(errors), [list(level) for level in levels] if levels is not None else None)
+        
+        errors.extend(self._validate_step_resources(config))
+        return errors
+    
+    def _validate_all(self, config: PipelineConfig, id_to_step: Dict[str, PipelineStepConfig]) -> List[str]:
+        """
+        Validate step connections and step-specific parameters
+        Args:
+            config: Pipeline configuration to validate
+            id_to_step: Mapping of step ID to step configuration
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        errors = []
+        errors_append = errors.append
         
         for i, step in enumerate(config.steps):
-            if not step.id:
-                errors.append(f"Step {i+1} has no ID")
+            step_id = step.id
+            if not step_id:
+                errors_append(f"Step {i+1} has no ID")
             
             # Check input step references
-            if step.input_step_id and step.input_step_id not in step_ids:
-                errors.append(f"Step {step.id} references non-existent input step: {step.input_step_id}")
+            input_step_id = step.input_step_id
+            if input_step_id and input_step_id not in id_to_step:
+                errors_append(f"Step {step_id} references non-existent input step: {input_step_id}")
             
             # Check dependency references
             for dep_id in step.depends_on:
-                if dep_id not in step_ids:
-                    errors.append(f"Step {step.id} has dependency on non-existent step: {dep_id}")
+                if dep_id not in id_to_step:
+                    errors_append(f"Step {step_id} has dependency on non-existent step: {dep_id}")
+            
+            # Validate step-specific parameters
+            errors.extend(self._validate_step_config(step, id_to_step))
+        
+        return errors
+    
+    def _validate_step_resources(self, config: PipelineConfig) -> List[str]:
+        """
+        Check that scripts and source paths referenced by steps exist
+        Args:
+            config: Pipeline configuration to validate
+        Returns:
+            List of validation errors (empty if valid)
+        """
+        errors = []
+        
+        # Load all referenced scripts with one query
+        script_map = self.script_manager.load_scripts([
+            step.params["script_id"] for step in config.steps
+            if step.type == StepType.USER_SCRIPT and step.params.get("script_id")
+        ])
         
-        # Validate step-specific parameters
         for step in config.steps:
-            step_errors = self._validate_step_config(step)
-            errors.extend(step_errors)
+            if step.type == StepType.USER_SCRIPT:
+                # Check if script exists
+                script_id = step.params.get("script_id")
+                if script_id and script_id not in script_map:
+                    errors.append(f"Script not found: {script_id}")
+            
+            elif step.type == StepType.DOCUMENT_LOADER:
+                source_path = step.params.get("source_path")
+                if source_path and not os.path.exists(source_path):
+                    errors.append(f"Source path does not exist: {source_path}")
         
         return errors
     
-    def _validate_step_config(self, step: PipelineStepConfig) -> List[str]:
+    def _validate_step_config(self, step: PipelineStepConfig, 
+                              id_to_step: Dict[str, PipelineStepConfig]) -> List[str]:
         """
         Validate individual step configuration
+        Args:
+            step: Step configuration
+            id_to_step: Mapping of step ID to step configuration of the pipeline
         """
         errors = []
         
         if step.type == StepType.USER_SCRIPT:
-            script_id = step.params.get("script_id")
-            if not script_id:
+            if not step.params.get("script_id"):
                 errors.append(f"Script step {step.id} requires 'script_id' parameter")
-            else:
-                # Check if script exists
-                script_data = self.script_manager.load_script(script_id)
-                if not script_data:
-                    errors.append(f"Script not found: {script_id}")
         
         elif step.type == StepType.DOCUMENT_LOADER:
             # Check for document paths
@@ -234,8 +451,6 @@ class PipelineManager:
             
             if not source_path and not document_paths:
                 errors.append(f"Document loader step {step.id} requires 'source_path' or 'document_paths' parameter")
-            elif source_path and not os.path.exists(source_path):
-                errors.append(f"Source path does not exist: {source_path}")
         
         elif step.type == StepType.DB_EXPORTER:
             table_name = step.params.get("table_name")
@@ -250,39 +465,28 @@ class PipelineManager:
         return errors
     
     def execute_pipeline(self, pipeline_id: str, document_paths: List[str], 
-                        run_metadata: Optional[Dict[str, Any]] = None) -> str:
+                        run_metadata: Optional[Dict[str, Any]] = None,
+                        fail_fast: bool = False) -> str:
         """
         Execute pipeline for list of documents
         Args:
             pipeline_id: Pipeline identifier
             document_paths: List of document file paths to process
             run_metadata: Additional metadata for the run
+            fail_fast: Stop checking document paths at the first invalid one
         Returns:
             str: Pipeline run ID
         Raises:
             ValueError: If pipeline or documents are invalid
-            RuntimeError: If pipeline is already running
+            RuntimeError: If pipeline already runs max_concurrent_runs times
         """
         # Load pipeline configuration
         config = self.get_pipeline_config(pipeline_id)
         if not config:
             raise ValueError(f"Pipeline not found: {pipeline_id}")
         
-        # Check if pipeline is already running
-        with self.run_lock:
-            if pipeline_id in self.active_runs:
-                raise RuntimeError(f"Pipeline {pipeline_id} is already running")
-        
         # Validate document paths
-        errors = []
-        valid_paths = []
-        for path in document_paths:
-            if not os.path.exists(path):
-                errors.append(f"Document path does not exist: {path}")
-            elif not os.path.isfile(path):
-                errors.append(f"Not a file: {path}")
-            else:
-                valid_paths.append(path)
+        valid_paths, errors = self._validate_document_paths(document_paths, fail_fast)
         
         if errors:
             raise ValueError(f"Invalid document paths: {errors}")
@@ -291,27 +495,41 @@ class PipelineManager:
             raise ValueError("No valid document paths provided")
         
         # Create pipeline run
-        run_id = f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
+        run_id = f"run_{time.time_ns():x}_{os.urandom(4).hex()}"
         run = PipelineRun(
             id=run_id,
             pipeline_id=pipeline_id,
+            pipeline_name=config.name,
             start_time=datetime.now(),
             status=PipelineStatus.RUNNING,
             document_paths=valid_paths,  
             metadata=run_metadata or {}
         )
         
-        # Track active run
-        with self.run_lock:
-            self.active_runs[pipeline_id] = run
+        # Track active run unless the pipeline reached its concurrency limit
+        with self._lock_for(pipeline_id):
+            pipeline_runs = self._active_by_pipeline.setdefault(pipeline_id, set())
+            if len(pipeline_runs) >= config.max_concurrent_runs:
+                raise RuntimeError(f"Pipeline {pipeline_id} is already running")
+            pipeline_runs.add(run_id)
+            self.active_runs[run_id] = run
         
         try:
+            # CPU-bound user scripts run in a process pool, other steps stay in-process
+            script_codes = self._collect_script_codes(config)
+            if script_codes:
+                self._script_pools[run_id] = [script_codes, None]
+            
             # Execute pipeline steps
             self._execute_pipeline_steps(config, valid_paths, run)
             
-            # Update run status to completed
-            run.end_time = datetime.now()
-            run.status = PipelineStatus.COMPLETED
+            # Write chunks still buffered by export steps
+            self._flush_export_buffers(run)
+            
+            # Update run status to completed (a cancelled run keeps its status)
+            if run.status != PipelineStatus.CANCELLED:
+                run.end_time = datetime.now()
+                run.status = PipelineStatus.COMPLETED
             
             # Log completion
             self.logging_service.log_pipeline_run(run)
@@ -323,12 +541,15 @@ class PipelineManager:
             run.end_time = datetime.now()
             run.status = PipelineStatus.FAILED
             run.error_count = 1
-            run.errors = [{
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "document_paths": valid_paths
-            }]
+            run.errors = []
+            run.errors_raw.clear()
+            run.record_error(PipelineError.from_exception(e, document_paths=valid_paths))
+            
+            # Chunks exported before the failure are still written
+            try:
+                self._flush_export_buffers(run)
+            except Exception:
+                pass  # Recorded in run errors
             
             # Log failure
             self.logging_service.log_pipeline_run(run)
@@ -339,10 +560,119 @@ class PipelineManager:
             raise
         
         finally:
+            # Release script workers
+            with self._script_pools_lock:
+                script_pool_entry = self._script_pools.pop(run_id, None)
+            if script_pool_entry is not None and script_pool_entry[1] is not None:
+                script_pool_entry[1].shutdown(wait=False, cancel_futures=True)
+            
             # Remove from active runs
-            with self.run_lock:
-                if pipeline_id in self.active_runs:
-                    del self.active_runs[pipeline_id]
+            with self._lock_for(pipeline_id):
+                self._untrack_run(run)
+    
+    def _validate_document_paths(self, document_paths: List[str], 
+                                 fail_fast: bool = False) -> tuple:
+        """
+        Check that all document paths point to regular files
+        Args:
+            document_paths: List of document file paths
+            fail_fast: Stop at the first invalid path
+        Returns:
+            Tuple of (valid paths, validation errors)
+        """
+        errors = []
+        valid_paths = []
+        
+        # For long lists read each directory once instead of stat-ing every path
+        listings: Optional[Dict[str, Optional[Dict[str, bool]]]] = (
+            {} if len(document_paths) > self.scandir_threshold else None
+        )
+        
+        for path in document_paths:
+            is_file = None
+            
+            if listings is not None:
+                directory, name = os.path.split(path)
+                if directory not in listings:
+                    listings[directory] = self._scan_directory(directory or ".")
+                listing = listings[directory]
+                if listing is not None:
+                    is_file = listing.get(name)
+            
+            if is_file is None:
+                try:
+                    # One stat call covers both existence and file type checks
+                    is_file = stat.S_ISREG(os.stat(path).st_mode)
+                except OSError:
+                    errors.append(f"Document path does not exist: {path}")
+            
+            if is_file is True:
+                valid_paths.append(path)
+            elif is_file is False:
+                errors.append(f"Not a file: {path}")
+            
+            if fail_fast and errors:
+                break
+        
+        return valid_paths, errors
+    
+    def _scan_directory(self, directory: str) -> Optional[Dict[str, bool]]:
+        """
+        List directory entries with a single scandir call
+        Args:
+            directory: Directory path
+        Returns:
+            Dict mapping entry name to whether it is a regular file, None if unreadable
+        """
+        try:
+            with os.scandir(directory) as entries:
+                return {entry.name: entry.is_file() for entry in entries}
+        except OSError:
+            return None
+    
+    def _ensure_script_security(self, script_data: Dict[str, Any]):
+        """
+        Validate script security unless a result is stored for its code and validator version
+        Args:
+            script_data: Script data returned by script_manager.load_script
+        Raises:
+            SecurityError: If script fails security validation
+        """
+        if self.script_manager.is_security_validated(script_data):
+            return
+        
+        security_errors = ScriptSecurityValidator.validate_script_security(script_data["code"])
+        self.script_manager.mark_security_validated(script_data["id"], security_errors)
+        
+        if security_errors:
+            raise SecurityError(f"Script security validation failed: {security_errors}")
+    
+    def _collect_script_codes(self, config: PipelineConfig) -> Dict[str, str]:
+        """
+        Load and validate code of all user scripts referenced by pipeline
+        Args:
+            config: Pipeline configuration
+        Returns:
+            Dict mapping script_id to script code (empty if no USER_SCRIPT steps)
+        Raises:
+            SecurityError: If a script fails security validation
+        """
+        script_codes = {}
+        script_ids = [
+            step.params["script_id"] for step in config.steps
+            if step.type == StepType.USER_SCRIPT and step.params.get("script_id")
+        ]
+        script_map = self.script_manager.load_scripts(script_ids)
+        
+        for script_id in dict.fromkeys(script_ids):
+            script_data = script_map.get(script_id)
+            if not script_data:
+                raise ValueError(f"Script not found: {script_id}")
+            
+            self._ensure_script_security(script_data)
+            script_codes[script_id] = script_data["code"]
+        
+        return script_codes
     
     def _execute_pipeline_steps(self, config: PipelineConfig, document_paths: List[str], run: PipelineRun):
         """
@@ -352,161 +682,353 @@ class PipelineManager:
             document_paths: List of document paths to process
             run: Pipeline run object for logging
         """
-        # Initialize step results storage
-        step_results = {}
+        # Large runs of opted-in pipelines are processed in worker processes to sidestep the GIL
+        if self._use_document_processes(config, document_paths):
+            workers = min(self.max_document_workers, len(document_paths))
+            self._execute_documents_in_pool(config, document_paths, run, workers)
+            return
+        
+        levels = self._resolve_step_levels(config)
         
         # Process each document
         for doc_path in document_paths:
-            try:
-                # Load document
-                loader = DocumentFactory.create_loader(doc_path)
-                document = loader.load({
-                    "path": doc_path,
-                    "style_config_path": config.source_config.get("style_config_path")
-                })
-                
-                # Execute each step in sequence for this document
-                for step_config in config.steps:
-                    step_start_time = time.time()
-                    
-                    try:
-                        # Get input for this step
-                        input_data = self._get_step_input(step_config, step_results, document)
-                        
-                        # Execute step
-                        output_data = self._execute_step(step_config, input_data, document, run)
-                        
-                        # Store results
-                        step_results[step_config.id] = {
-                            "output": output_data,
-                            "execution_time": time.time() - step_start_time
-                        }
-                        
-                        # Log step completion
-                        self.logging_service.log_message(
-                            level=LogLevel.INFO,
-                            message=f"Step completed: {step_config.name}",
-                            pipeline_id=run.pipeline_id,
-                            pipeline_run_id=run.id,
-                            extra_data={
-                                "step_id": step_config.id,
-                                "execution_time": step_results[step_config.id]["execution_time"],
-                                "output_count": len(output_data) if isinstance(output_data, list) else 1
-                            }
-                        )
-                        
-                        # If this is an output step (like DB exporter), collect results
-                        if step_config.type in [StepType.DB_EXPORTER, StepType.FILE_EXPORTER, StepType.JSON_EXPORTER]:
-                            if isinstance(output_data, list):
-                                # Process output data (this would be handled by the exporter)
-                                pass
-                            elif output_data is not None:
-                                # Process single output
-                                pass
-                    
-                    except Exception as e:
-                        # Log step failure
-                        error_msg = f"Step failed: {step_config.name} ({step_config.id}) - {str(e)}"
-                        self.logging_service.log_message(
-                            level=LogLevel.ERROR,
-                            message=error_msg,
-                            pipeline_id=run.pipeline_id,
-                            pipeline_run_id=run.id,
-                            extra_data={
-                                "step_id": step_config.id,
-                                "error_type": type(e).__name__,
-                                "execution_time": time.time() - step_start_time
-                            }
-                        )
-                        
-                        # Add to run errors
-                        run.errors.append({
-                            "timestamp": datetime.now().isoformat(),
-                            "step_id": step_config.id,
-                            "error_type": type(e).__name__,
-                            "error_message": str(e),
-                            "stage": f"step_{step_config.name}"
-                        })
-                        
-                        # If step is critical (not optional), stop pipeline
-                        if not step_config.params.get("optional", False):
-                            raise
-                
-                # Update run progress
-                run.processed_count += 1
-                run.success_count += 1
-                
-            except Exception as e:
-                # Document-level error
-                run.processed_count += 1
-                run.error_count += 1
-                run.errors.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "document_path": doc_path,
-                    "error_type": type(e).__name__,
-                    "error_message": str(e),
-                    "stage": "document_loading"
-                })
+            if run.status == PipelineStatus.CANCELLED:
+                break
+            self._process_document(config, levels, doc_path, run)
     
-    def _get_step_input(self, step_config: PipelineStepConfig, step_results: Dict[str, Any], 
-                       document: Document):
+    def _use_document_processes(self, config: PipelineConfig, document_paths: List[str]) -> bool:
         """
-        Get input data for step based on configuration
+        Check whether documents of run are processed in worker processes
+        Args:
+            config: Pipeline configuration
+            document_paths: List of document paths to process
+        Returns:
+            True if pipeline opted in and run is large enough to pay for worker start-up
         """
-        if step_config.input_step_id:
-            # Use output from previous step
-            prev_result = step_results.get(step_config.input_step_id)
-            if prev_result:
-                return prev_result["output"]
+        if not config.source_config.get("use_document_processes", False):
+            return False
         
-        # For initial steps, input comes from document
-        if step_config.type == StepType.DOCUMENT_LOADER:
-            return document
+        # User scripts already run in the run's script pool
+        if any(step.type == StepType.USER_SCRIPT for step in config.steps):
+            return False
         
-        # For other steps without explicit input, return document or empty
-        return document
+        return (self.max_document_workers > 1
+                and len(document_paths) >= max(2, self.document_process_threshold))
     
-    def _execute_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+    def _execute_documents_in_pool(self, config: PipelineConfig, document_paths: List[str], 
+                                   run: PipelineRun, workers: int):
         """
-        Execute individual pipeline step
+        Process documents in a process pool and merge results into run
+        Args:
+            config: Pipeline configuration
+            document_paths: List of document paths to process
+            run: Pipeline run object for logging
+            workers: Number of worker processes
         """
-        if step_config.type == StepType.DOCUMENT_LOADER:
-            return self._execute_document_loader_step(step_config, input_data, document, run)
+        chunksize = max(1, len(document_paths) // (workers * 4))
+        steps_by_id = {step.id: step for step in config.steps}
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=get_context("spawn"),
+            initializer=_init_document_worker,
+            initargs=(self.db.db_path, config, run.id)
+        ) as executor:
+            # Results arrive in document order, so exports are buffered as in a single process
+            results = executor.map(_process_single_document, document_paths, chunksize=chunksize)
+            for doc_path, (success_count, error_count, errors, exports) in zip(document_paths, results):
+                run.processed_count += 1
+                run.success_count += success_count
+                run.error_count += error_count
+                run.errors.extend(errors)
+                
+                try:
+                    for step_id, chunks in exports:
+                        step_config = steps_by_id[step_id]
+                        try:
+                            self._execute_step(step_config, chunks, None, run)
+                        except Exception as e:
+                            run.record_error(PipelineError.from_exception(e, stage=f"step_{step_config.name}", step_id=step_config.id))
+                            if not step_config.params.get("optional", False):
+                                raise
+                except Exception as e:
+                    # Failed export fails its document only, as in _process_document
+                    run.success_count -= success_count
+                    run.error_count += 1
+                    run.record_error(PipelineError.from_exception(e, stage="document_loading", document_path=doc_path))
+                
+                # Documents not yet started are dropped, running ones finish
+                if run.status == PipelineStatus.CANCELLED:
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    break
+    
+    def _resolve_step_levels(self, config: PipelineConfig) -> List[List[_PlannedStep]]:
+        """
+        Resolve precomputed dependency levels to executable steps
+        Args:
+            config: Pipeline configuration
+        Returns:
+            Levels of planned steps, handlers are picked by the kind of step input
+            (levels with in-place steps are split into single-step levels)
+        """
+        if not self._has_valid_levels(config):
+            config.execution_levels = self._topo_levels(config)
+        
+        # Step results are stored in a list, slot is the position of step in configuration
+        step_index = {step.id: i for i, step in enumerate(config.steps)}
+        output_kinds: Dict[str, Optional[str]] = {}
+        levels = []
+        
+        # Levels are in dependency order, so kind of every input step is already known
+        for level in config.execution_levels:
+            planned_level = []
+            for step_id in level:
+                step = config.steps[step_index[step_id]]
+                input_slot = step_index.get(step.input_step_id)
+                input_kind = _INPUT_DOCUMENT if input_slot is None else output_kinds[step.input_step_id]
+                
+                if step.type == StepType.DOCUMENT_LOADER:
+                    output_kinds[step_id] = _INPUT_DOCUMENT
+                elif step.type in _PROCESSORS:
+                    output_kinds[step_id] = _INPUT_CHUNK_LIST
+                elif step.type in _PASS_THROUGH_STEPS:
+                    output_kinds[step_id] = input_kind
+                else:
+                    output_kinds[step_id] = None
+                
+                planned_level.append((step_index[step_id], input_slot, step, self._step_handler(step.type, input_kind)))
+            
+            # Steps sharing input with an in-place step run one by one in declaration order
+            if len(planned_level) > 1 and any(planned[2].type in _IN_PLACE_STEPS for planned in planned_level):
+                levels.extend([planned] for planned in planned_level)
+            else:
+                levels.append(planned_level)
         
-        elif step_config.type == StepType.USER_SCRIPT:
-            return self._execute_script_step(step_config, input_data, document, run)
+        return levels
+    
+    def _step_handler(self, step_type: StepType, input_kind: Optional[str]) -> Callable:
+        """
+        Pick step handler for step type and kind of its input
+        Args:
+            step_type: Step type
+            input_kind: Kind of step input or None if only known at run time
+        Returns:
+            Unbound PipelineManager handler method
+        """
+        handler = self._STEP_DISPATCH.get(step_type)
+        if handler is not None:
+            return handler
+        
+        if input_kind == _INPUT_DOCUMENT:
+            return PipelineManager._execute_chunk_processor_whole
+        if input_kind == _INPUT_CHUNK_LIST:
+            return PipelineManager._execute_chunk_processor_items
+        return PipelineManager._execute_chunk_processor
+    
+    def _process_document(self, config: PipelineConfig, levels: List[List[_PlannedStep]], 
+                          doc_path: str, run: PipelineRun):
+        """
+        Load document and execute all steps for it
+        Args:
+            config: Pipeline configuration
+            levels: Steps grouped by dependency level (see _resolve_step_levels)
+            doc_path: Document path
+            run: Pipeline run object for logging and progress
+        """
+        # Initialize step results storage, one (output, execution time) slot per step
+        step_results: List[Optional[Tuple[Any, float]]] = [None] * len(config.steps)
         
-        elif step_config.type == StepType.LINE_SPLITTER:
-            return self._execute_line_splitter_step(step_config, input_data, document, run)
+        try:
+            # Load document
+            loader = DocumentFactory.create_loader(doc_path)
+            document = loader.load({
+                "path": doc_path,
+                "style_config_path": config.source_config.get("style_config_path")
+            })
+            
+            # Steps of one level do not depend on each other and run concurrently
+            for level in levels:
+                if len(level) == 1:
+                    self._run_step(level[0], step_results, document, run)
+                    continue
+                
+                executor = self._get_step_executor()
+                futures = [
+                    executor.submit(self._run_step, planned_step, step_results, document, run)
+                    for planned_step in level
+                ]
+                wait(futures)
+                
+                # Propagate failure of the first critical step
+                for future in futures:
+                    future.result()
+            
+            # Update run progress
+            run.processed_count += 1
+            run.success_count += 1
+            
+        except Exception as e:
+            # Document-level error
+            run.processed_count += 1
+            run.error_count += 1
+            run.record_error(PipelineError.from_exception(e, stage="document_loading", document_path=doc_path))
+    
+    def _run_step(self, planned_step: _PlannedStep, 
+                  step_results: List[Optional[Tuple[Any, float]]], document: Document, run: PipelineRun):
+        """
+        Execute single step for document and store its result
+        Args:
+            planned_step: (result slot, input result slot or None, step configuration, step handler)
+            step_results: Results of steps by slot, (output, execution time) or None if not executed
+            document: Loaded document
+            run: Pipeline run object for logging
+        Raises:
+            Exception: Step error if step is not optional
+        """
+        slot, input_slot, step_config, handler = planned_step
+        step_start_time = time.time()
         
-        elif step_config.type == StepType.DELIMITER_SPLITTER:
-            return self._execute_delimiter_splitter_step(step_config, input_data, document, run)
+        try:
+            # Execute step on output of input step, document otherwise
+            if input_slot is None:
+                output_data = handler(self, step_config, document, document, run)
+            elif step_results[input_slot] is not None:
+                output_data = handler(self, step_config, step_results[input_slot][0], document, run)
+            else:
+                # Input step failed as optional, its planned input kind does not apply
+                output_data = self._execute_step(step_config, document, document, run)
+            
+            # Store results (each step writes its own slot)
+            execution_time = time.time() - step_start_time
+            step_results[slot] = (output_data, execution_time)
+            
+            # Log step completion
+            self.logging_service.log_message(
+                LogLevel.INFO, "Step completed: %s", step_config.name,
+                pipeline_id=run.pipeline_id,
+                pipeline_run_id=run.id,
+                extra_data={
+                    "step_id": step_config.id,
+                    "execution_time": execution_time,
+                    "output_count": len(output_data) if isinstance(output_data, list) else 1
+                }
+            )
         
-        elif step_config.type == StepType.PARAGRAPH_SPLITTER:
-            return self._execute_paragraph_splitter_step(step_config, input_data, document, run)
+        except Exception as e:
+            # Log step failure
+            self.logging_service.log_message(
+                LogLevel.ERROR, "Step failed: %s (%s) - %s", step_config.name, step_config.id, e,
+                pipeline_id=run.pipeline_id,
+                pipeline_run_id=run.id,
+                extra_data={
+                    "step_id": step_config.id,
+                    "error_type": type(e).__name__,
+                    "execution_time": time.time() - step_start_time
+                }
+            )
+            
+            # Add to run errors
+            run.record_error(PipelineError.from_exception(e, stage=f"step_{step_config.name}", step_id=step_config.id))
+            
+            # If step is critical (not optional), stop pipeline
+            if not step_config.params.get("optional", False):
+                raise
+    
+    def _topo_levels(self, config: PipelineConfig) -> List[List[str]]:
+        """
+        Group steps into dependency levels using Kahn's algorithm
+        Args:
+            config: Pipeline configuration
+        Returns:
+            List of levels, each a list of step IDs in declaration order
+        Raises:
+            ValueError: If steps form a dependency cycle
+        """
+        order = {step.id: i for i, step in enumerate(config.steps)}
+        indegree = dict.fromkeys(order, 0)
+        children: Dict[str, List[str]] = {step_id: [] for step_id in order}
         
-        elif step_config.type == StepType.SENTENCE_SPLITTER:
-            return self._execute_sentence_splitter_step(step_config, input_data, document, run)
+        # Edges come from depends_on and implicit input_step_id references
+        for step in config.steps:
+            parents = list(step.depends_on)
+            if step.input_step_id:
+                parents.append(step.input_step_id)
+            
+            for parent_id in parents:
+                if parent_id in children:
+                    children[parent_id].append(step.id)
+                    indegree[step.id] += 1
+        
+        levels = []
+        current = [step_id for step_id, degree in indegree.items() if degree == 0]
+        visited = 0
+        
+        while current:
+            levels.append(current)
+            visited += len(current)
+            
+            next_level = []
+            for step_id in current:
+                for child_id in children[step_id]:
+                    indegree[child_id] -= 1
+                    if indegree[child_id] == 0:
+                        next_level.append(child_id)
+            
+            current = sorted(next_level, key=order.__getitem__)
         
-        elif step_config.type == StepType.REGEX_EXTRACTOR:
-            return self._execute_regex_extractor_step(step_config, input_data, document, run)
+        if visited < len(order):
+            raise ValueError("Pipeline steps contain a dependency cycle")
         
-        elif step_config.type == StepType.DB_EXPORTER:
-            return self._execute_db_exporter_step(step_config, input_data, document, run)
+        return levels
+    
+    def _has_valid_levels(self, config: PipelineConfig) -> bool:
+        """
+        Check that stored execution levels cover exactly the configured steps
+        """
+        level_ids = [step_id for level in config.execution_levels for step_id in level]
+        return len(level_ids) == len(config.steps) and set(level_ids) == {step.id for step in config.steps}
+    
+    def _get_step_executor(self) -> ThreadPoolExecutor:
+        """
+        Get shared thread pool for concurrent steps (created on first use)
+        """
+        with self._executor_lock:
+            if self._step_executor is None:
+                self._step_executor = ThreadPoolExecutor(
+                    max_workers=self.max_step_workers,
+                    thread_name_prefix="pipeline-step"
+                )
+            return self._step_executor
+    
+    def shutdown(self):
+        """
+        Release worker threads and database connections held by the manager
+        """
+        with self._executor_lock:
+            executor, self._step_executor = self._step_executor, None
         
-        elif step_config.type == StepType.FILE_EXPORTER:
-            return self._execute_file_exporter_step(step_config, input_data, document, run)
+        if executor is not None:
+            executor.shutdown(wait=True)
         
-        elif step_config.type == StepType.JSON_EXPORTER:
-            return self._execute_json_exporter_step(step_config, input_data, document, run)
+        self.task_dispatcher.shutdown()
         
-        elif step_config.type == StepType.METADATA_PROPAGATOR:
-            return self._execute_metadata_propagator_step(step_config, input_data, document, run)
+        # Close pooled target database connections
+        with self._exporter_pool_lock:
+            pooled_exporters = list(self._exporter_pool.values())
+            self._exporter_pool.clear()
         
-        else:
-            # Use generic processor for other step types
-            processor = self._get_step_processor(step_config.type)
-            return processor.process(input_data, step_config.params)
+        for exporter, _ in pooled_exporters:
+            try:
+                exporter.close()
+            except Exception:
+                pass
+    
+    def _execute_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+        """
+        Execute individual pipeline step
+        """
+        handler = self._STEP_DISPATCH.get(step_config.type, PipelineManager._execute_chunk_processor)
+        return handler(self, step_config, input_data, document, run)
     
     def _execute_document_loader_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
         """
@@ -536,223 +1058,198 @@ class PipelineManager:
             }
         }
         
+        # Run precompiled script in the run's script pool when available
+        script_pool = self._get_script_pool(run.id)
+        if script_pool is not None:
+            try:
+                return self.task_dispatcher.run_script(
+                    script_pool, script_id, context, timeout=self.script_manager.script_sandbox.timeout
+                )
+            except ScriptExecutionTimeout:
+                # Timed out pool is terminated, next script call of the run creates a new one
+                with self._script_pools_lock:
+                    entry = self._script_pools.get(run.id)
+                    if entry is not None and entry[1] is script_pool:
+                        entry[1] = None
+                raise
+        
         # Execute script in secure sandbox
         result = self.script_manager.validate_and_execute_script(script_id, context)
         return result
     
-    def _execute_line_splitter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
-        """
-        Execute line splitter step
-        """
-        from infrastructure.processors.line_splitter import LineSplitter
-        splitter = LineSplitter()
-        
-        if isinstance(input_data, Document):
-            # Process document pages
-            all_chunks = []
-            for page in input_data.pages:
-                chunks = splitter.process(page.raw_text, step_config.params)
-                # Propagate metadata
-                for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
-                all_chunks.extend(chunks)
-            return all_chunks
-        elif isinstance(input_data, list):
-            # Process list of chunks
-            all_chunks = []
-            for item in input_data:
-                if hasattr(item, 'text'):  # It's a chunk
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-                else:  # It's raw text
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-            return all_chunks
-        else:
-            # Process single item
-            return splitter.process(input_data, step_config.params)
-    
-    def _execute_delimiter_splitter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
-        """
-        Execute delimiter splitter step
-        """
-        from infrastructure.processors.delimiter_splitter import DelimiterSplitter
-        splitter = DelimiterSplitter()
-        
-        # Similar logic to line splitter
-        if isinstance(input_data, Document):
-            all_chunks = []
-            for page in input_data.pages:
-                chunks = splitter.process(page.raw_text, step_config.params)
-                for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
-                all_chunks.extend(chunks)
-            return all_chunks
-        elif isinstance(input_data, list):
-            all_chunks = []
-            for item in input_data:
-                if hasattr(item, 'text'):
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-                else:
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-            return all_chunks
-        else:
-            return splitter.process(input_data, step_config.params)
-    
-    def _execute_paragraph_splitter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
-        """
-        Execute paragraph splitter step
-        """
-        from infrastructure.processors.paragraph_splitter import ParagraphSplitter
-        splitter = ParagraphSplitter()
-        
-        if isinstance(input_data, Document):
-            all_chunks = []
-            for page in input_data.pages:
-                chunks = splitter.process(page.raw_text, step_config.params)
-                for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
-                all_chunks.extend(chunks)
-            return all_chunks
-        elif isinstance(input_data, list):
-            all_chunks = []
-            for item in input_data:
-                if hasattr(item, 'text'):
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-                else:
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-            return all_chunks
-        else:
-            return splitter.process(input_data, step_config.params)
-    
-    def _execute_sentence_splitter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
-        """
-        Execute sentence splitter step
-        """
-        from infrastructure.processors.sentence_splitter import SentenceSplitter
-        splitter = SentenceSplitter()
-        
-        if isinstance(input_data, Document):
-            all_chunks = []
-            for page in input_data.pages:
-                chunks = splitter.process(page.raw_text, step_config.params)
-                for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
-                all_chunks.extend(chunks)
-            return all_chunks
-        elif isinstance(input_data, list):
-            all_chunks = []
-            for item in input_data:
-                if hasattr(item, 'text'):
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-                else:
-                    chunks = splitter.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-            return all_chunks
-        else:
-            return splitter.process(input_data, step_config.params)
-    
-    def _execute_regex_extractor_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
-        """
-        Execute regex extractor step
-        """
-        from infrastructure.processors.regex_extractor import RegexExtractor
-        extractor = RegexExtractor()
-        
-        if isinstance(input_data, Document):
-            all_chunks = []
-            for page in input_data.pages:
-                chunks = extractor.process(page.raw_text, step_config.params)
-                for chunk in chunks:
-                    chunk.meta.document_id = document.id
-                    chunk.meta.page_num = page.number
-                all_chunks.extend(chunks)
-            return all_chunks
-        elif isinstance(input_data, list):
-            all_chunks = []
-            for item in input_data:
-                if hasattr(item, 'text'):
-                    chunks = extractor.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-                else:
-                    chunks = extractor.process(item, step_config.params)
-                    all_chunks.extend(chunks)
-            return all_chunks
-        else:
-            return extractor.process(input_data, step_config.params)
+    def _get_script_pool(self, run_id: str):
+        """
+        Get script pool of run, created on the first script call
+        Args:
+            run_id: Pipeline run identifier
+        Returns:
+            Script process pool or None if run has no preloaded scripts
+        """
+        with self._script_pools_lock:
+            entry = self._script_pools.get(run_id)
+            if entry is None:
+                return None
+            if entry[1] is None:
+                entry[1] = self.task_dispatcher.create_script_pool(entry[0])
+            return entry[1]
+    
+    def _execute_chunk_processor(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+        """
+        Execute splitter/extractor step with its shared processor instance
+        """
+        if isinstance(input_data, list):
+            return self._execute_chunk_processor_items(step_config, input_data, document, run)
+        return self._execute_chunk_processor_whole(step_config, input_data, document, run)
+    
+    def _execute_chunk_processor_whole(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+        """
+        Execute splitter/extractor step on a document or single item
+        """
+        processor = self._get_step_processor(step_config.type)
+        
+        # Processors walk the pages and build chunk metadata with document_id/page_num
+        return processor.process(input_data, step_config.params)
+    
+    def _execute_chunk_processor_items(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+        """
+        Execute splitter/extractor step on each item of a list of chunks or raw texts
+        """
+        processor = self._get_step_processor(step_config.type)
+        params = step_config.params
+        
+        all_chunks = []
+        for item in input_data:
+            all_chunks.extend(processor.process(item, params))
+        return all_chunks
     
     def _execute_db_exporter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
         """
         Execute database exporter step
         """
-        from infrastructure.exporters.target_db_exporter import TargetDbExporter
-        exporter = TargetDbExporter()
+        # Get database configuration
+        db_config = step_config.params.get("db_config", {})
+        exporter, exporter_lock = self._get_db_exporter(db_config)
         
         try:
-            # Get database configuration
-            db_config = step_config.params.get("db_config", {})
-            exporter.connect(db_config)
-            
-            # Export data
+            # Export data in batches over the pooled connection
             table_name = step_config.params.get("table_name", "chunks")
-            if isinstance(input_data, list):
-                exporter.batch_insert(input_data, table_name)
-            else:
-                exporter.batch_insert([input_data], table_name)
+            batch_size = step_config.params.get("batch_size", 1000)
+            rows = self._as_list(input_data)
             
-            # Close connection
-            exporter.close()
+            with exporter_lock:
+                for i in range(0, len(rows), batch_size):
+                    exporter.batch_insert(rows[i:i + batch_size], table_name)
             
         except Exception as e:
+            # Connection state is unknown after a failure, do not reuse it
+            self._discard_db_exporter(db_config)
+            
             run.error_count += 1
-            run.errors.append({
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "stage": "database_export"
-            })
+            run.record_error(PipelineError.from_exception(e, stage="database_export"))
             raise
         
         # Return original data (exporter doesn't transform)
         return input_data
     
+    def _get_db_exporter(self, db_config: Dict[str, Any]) -> tuple:
+        """
+        Get connected exporter for database configuration (created on first use)
+        Args:
+            db_config: Target database configuration
+        Returns:
+            Tuple of (exporter, lock serializing its use)
+        """
+        key = self._db_exporter_key(db_config)
+        
+        with self._exporter_pool_lock:
+            pooled = self._exporter_pool.get(key)
+            if pooled is None:
+                exporter = self._create_db_exporter(db_config.get("type", "sqlite"))
+                exporter.connect(db_config)
+                pooled = (exporter, threading.Lock())
+                self._exporter_pool[key] = pooled
+            return pooled
+    
+    def _discard_db_exporter(self, db_config: Dict[str, Any]):
+        """
+        Close and remove pooled exporter for database configuration
+        """
+        with self._exporter_pool_lock:
+            pooled = self._exporter_pool.pop(self._db_exporter_key(db_config), None)
+        
+        if pooled is not None:
+            try:
+                pooled[0].close()
+            except Exception:
+                pass
+    
+    def _db_exporter_key(self, db_config: Dict[str, Any]) -> str:
+        """
+        Build exporter pool key from database configuration
+        """
+        return json.dumps(db_config, sort_keys=True, default=str)
+    
+    def _create_db_exporter(self, db_type: str):
+        """
+        Create exporter for target database type
+        """
+        # Drivers are optional, import only the one in use
+        if db_type == "sqlite":
+            from infrastructure.exporters.sqlite_exporter import SqliteExporter
+            return SqliteExporter()
+        elif db_type == "postgresql":
+            from infrastructure.exporters.postgres_exporter import PostgresExporter
+            return PostgresExporter()
+        elif db_type == "mysql":
+            from infrastructure.exporters.mysql_exporter import MysqlExporter
+            return MysqlExporter()
+        elif db_type == "mongodb":
+            from infrastructure.exporters.mongodb_exporter import MongoDbExporter
+            return MongoDbExporter()
+        
+        raise ValueError(f"Unsupported target database type: {db_type}")
+    
+    @staticmethod
+    def _as_list(input_data) -> List[Any]:
+        """
+        Get step input as list (list itself, empty for None, otherwise single-item list)
+        """
+        if type(input_data) is list:
+            return input_data
+        return [] if input_data is None else [input_data]
+    
+    def _default_export_file_name(self, run: PipelineRun) -> str:
+        """
+        Build export file name tagged with run start time (used when step has no file_name)
+        """
+        # Same name for every document of run, so its chunks end up in one set of parts
+        return f"chunks_{run.start_time.strftime('%Y%m%d_%H%M%S')}.json"
+    
     def _execute_file_exporter_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
         """
         Execute file exporter step
         """
-        from infrastructure.exporters.file_exporter import FileExporter
-        exporter = FileExporter()
+        exporter = self._file_exporter
+        if exporter is None:
+            from infrastructure.exporters.file_exporter import FileExporter
+            exporter = self._file_exporter = FileExporter()
         
         try:
             # Get file configuration
             file_config = step_config.params.get("file_config", {})
             output_format = step_config.params.get("output_format", "json")
             output_path = step_config.params.get("output_path", "./output")
-            file_name = step_config.params.get("file_name", f"chunks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            file_name = step_config.params.get("file_name") or self._default_export_file_name(run)
             compress = step_config.params.get("compress", False)
             
-            if isinstance(input_data, list):
-                exporter.export_to_file(input_data, output_format, output_path, file_name, compress)
-            else:
-                exporter.export_to_file([input_data], output_format, output_path, file_name, compress)
+            def export(chunks, part_name):
+                exporter.export_to_file(chunks, output_format, output_path, part_name, compress)
+            
+            self._buffer_export(run, "file_export", output_path, file_name, export, self._as_list(input_data))
                 
         except Exception as e:
             run.error_count += 1
-            run.errors.append({
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "stage": "file_export"
-            })
+            run.record_error(PipelineError.from_exception(e, stage="file_export"))
             raise
         
         # Return original data (exporter doesn't transform)
@@ -762,132 +1259,234 @@ class PipelineManager:
         """
         Execute JSON exporter step
         """
-        from infrastructure.exporters.json_exporter import JsonExporter
-        exporter = JsonExporter()
+        exporter = self._json_exporter
+        if exporter is None:
+            from infrastructure.exporters.json_exporter import JsonExporter
+            exporter = self._json_exporter = JsonExporter()
         
         try:
             # Get JSON configuration
             output_path = step_config.params.get("output_path", "./output")
-            file_name = step_config.params.get("file_name", f"chunks_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+            file_name = step_config.params.get("file_name") or self._default_export_file_name(run)
             pretty_print = step_config.params.get("pretty_print", True)
             include_metadata = step_config.params.get("include_metadata", True)
+            buffer_size = step_config.params.get("buffer_size", exporter.DEFAULT_BUFFER_SIZE)
             
-            if isinstance(input_data, list):
-                exporter.export_to_json(input_data, output_path, file_name, pretty_print, include_metadata)
-            else:
-                exporter.export_to_json([input_data], output_path, file_name, pretty_print, include_metadata)
+            def export(chunks, part_name):
+                exporter.export_to_json(chunks, output_path, part_name, pretty_print, include_metadata, buffer_size)
+            
+            self._buffer_export(run, "json_export", output_path, file_name, export, self._as_list(input_data))
                 
         except Exception as e:
             run.error_count += 1
-            run.errors.append({
-                "timestamp": datetime.now().isoformat(),
-                "error_type": type(e).__name__,
-                "error_message": str(e),
-                "stage": "json_export"
-            })
+            run.record_error(PipelineError.from_exception(e, stage="json_export"))
             raise
         
         # Return original data (exporter doesn't transform)
         return input_data
     
+    def _buffer_export(self, run: PipelineRun, stage: str, output_path: str, file_name: str,
+                       export: Callable, chunks: List[Any]):
+        """
+        Add chunks to export buffer of run, writing a part once export_batch_size chunks are buffered
+        Args:
+            run: Pipeline run object
+            stage: Export stage name (file_export/json_export)
+            output_path: Output directory
+            file_name: Output file name
+            export: Callable writing (chunks, file name)
+            chunks: Chunks to export
+        """
+        key = (run.id, stage, output_path, file_name)
+        with self._export_buffers_lock:
+            buffer = self._export_buffers.get(key)
+            if buffer is None:
+                buffer = self._export_buffers[key] = [export, [], 0]
+            buffer[1].extend(chunks)
+            if len(buffer[1]) < self.export_batch_size:
+                return
+            batch, buffer[1] = buffer[1], []
+            part = buffer[2]
+            buffer[2] += 1
+        
+        export(batch, self._export_part_name(file_name, part))
+    
+    def _flush_export_buffers(self, run: PipelineRun):
+        """
+        Write chunks buffered by export steps of run
+        Args:
+            run: Pipeline run object
+        Raises:
+            Exception: First export error (all buffers are written before raising)
+        """
+        with self._export_buffers_lock:
+            keys = [key for key in self._export_buffers if key[0] == run.id]
+            buffers = [(key, self._export_buffers.pop(key)) for key in keys]
+        
+        first_error = None
+        for (_, stage, _, file_name), (export, chunks, part) in buffers:
+            # Nothing left after a threshold write, but a step without chunks still writes its file
+            if not chunks and part:
+                continue
+            try:
+                export(chunks, self._export_part_name(file_name, part))
+            except Exception as e:
+                run.error_count += 1
+                run.record_error(PipelineError.from_exception(e, stage=stage))
+                if first_error is None:
+                    first_error = e
+        
+        if first_error is not None:
+            raise first_error
+    
+    def _export_part_name(self, file_name: str, part: int) -> str:
+        """
+        Get file name of export part (file_name itself for the first part, file_N.ext afterwards)
+        """
+        if not part:
+            return file_name
+        stem, ext = os.path.splitext(file_name)
+        return f"{stem}_{part + 1}{ext}"
+    
+    def _collect_export_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
+        """
+        Keep chunks of a file/JSON export step for the parent process (document workers only)
+        """
+        self._collected_exports.append((step_config.id, self._as_list(input_data)))
+        return input_data
+    
     def _execute_metadata_propagator_step(self, step_config: PipelineStepConfig, input_data, document: Document, run: PipelineRun):
         """
         Execute metadata propagator step
         """
-        from infrastructure.processors.metadata_propagator import MetadataPropagator
         propagator = MetadataPropagator()
         
         # Propagate metadata from parent context to ensure all chunks have proper context
-        if isinstance(input_data, list):
-            return propagator.propagate_from_parent(input_data[0] if input_data else None, input_data)
-        elif input_data is not None:
-            return [propagator.propagate_from_parent(input_data, [input_data])]
-        else:
+        chunks = self._as_list(input_data)
+        if not chunks:
             return []  # Return empty if no input
+        return propagator.propagate_from_parent(chunks[0], chunks)
+    
+    # Step handlers, types not listed here go to _execute_chunk_processor
+    _STEP_DISPATCH = {
+        StepType.DOCUMENT_LOADER: _execute_document_loader_step,
+        StepType.USER_SCRIPT: _execute_script_step,
+        StepType.DB_EXPORTER: _execute_db_exporter_step,
+        StepType.FILE_EXPORTER: _execute_file_exporter_step,
+        StepType.JSON_EXPORTER: _execute_json_exporter_step,
+        StepType.METADATA_PROPAGATOR: _execute_metadata_propagator_step
+    }
     
     def _get_step_processor(self, step_type: StepType):
         """
-        Get appropriate processor for step type
+        Get shared processor for step type
         """
-        from domain.interfaces import IChunkProcessor
-        
-        processor_map = {
-            StepType.LINE_SPLITTER: "infrastructure.processors.LineSplitter",
-            StepType.DELIMITER_SPLITTER: "infrastructure.processors.DelimiterSplitter", 
-            StepType.PARAGRAPH_SPLITTER: "infrastructure.processors.ParagraphSplitter",
-            StepType.SENTENCE_SPLITTER: "infrastructure.processors.SentenceSplitter",
-            StepType.REGEX_EXTRACTOR: "infrastructure.processors.RegexExtractor",
-            StepType.METADATA_PROPAGATOR: "infrastructure.processors.MetadataPropagator"
-        }
-        
-        if step_type in processor_map:
-            module_path, class_name = processor_map[step_type].rsplit('.', 1)
-            module = __import__(module_path, fromlist=[class_name])
-            return getattr(module, class_name)()
+        processor = _PROCESSORS.get(step_type)
+        if processor is None:
+            raise ValueError(f"No processor found for step type: {step_type}")
         
-        raise ValueError(f"No processor found for step type: {step_type}")
+        return processor
     
     def get_pipeline_status(self, pipeline_id: str) -> Dict[str, Any]:
         """
         Get current status of pipeline (including active runs)
         """
-        # Check if pipeline is currently running
-        with self.run_lock:
-            if pipeline_id in self.active_runs:
-                run = self.active_runs[pipeline_id]
-                return {
-                    "status": "RUNNING",
-                    "current_run": run.to_dict(),
-                    "progress": self._calculate_progress(run)
-                }
+        # Check if pipeline is currently running (only collect runs under the lock)
+        with self._lock_for(pipeline_id):
+            runs = [self.active_runs[run_id] for run_id in self._active_by_pipeline.get(pipeline_id, ())]
+        
+        if runs:
+            return {
+                "status": "RUNNING",
+                "active_runs": [
+                    {
+                        "current_run": run.to_dict(),
+                        "progress": self._calculate_progress(run).to_dict()
+                    }
+                    for run in runs
+                ]
+            }
         
         # Get historical status from database
         return self.config_service.get_pipeline_statistics(pipeline_id)
     
-    def _calculate_progress(self, run: PipelineRun) -> Dict[str, Any]:
+    def _calculate_progress(self, run: PipelineRun) -> RunProgress:
         """
         Calculate execution progress
         """
-        return {
-            "processed": run.processed_count,
-            "successful": run.success_count,
-            "failed": run.error_count,
-            "total": len(run.document_paths),
-            "percentage": (run.processed_count / len(run.document_paths) * 100) if run.document_paths else 0,
-            "elapsed_time": (datetime.now() - run.start_time).total_seconds()
-        }
+        processed = run.processed_count
+        total = len(run.document_paths)
+        return RunProgress(
+            processed=processed,
+            successful=run.success_count,
+            failed=run.error_count,
+            total=total,
+            percentage=(processed / total * 100) if total else 0,
+            elapsed_time=time.monotonic() - run.start_monotonic
+        )
     
-    def cancel_running_pipeline(self, pipeline_id: str) -> bool:
+    def cancel_running_pipeline(self, pipeline_or_run_id: str) -> bool:
         """
         Cancel currently running pipeline
         Args:
-            pipeline_id: Pipeline identifier
+            pipeline_or_run_id: Run identifier, or pipeline identifier to cancel all its runs
         Returns:
             bool: True if cancelled successfully
         """
-        with self.run_lock:
-            if pipeline_id not in self.active_runs:
-                return False
+        # Resolve run ID to its pipeline, tracking is locked per pipeline
+        run = self.active_runs.get(pipeline_or_run_id)
+        pipeline_id = run.pipeline_id if run is not None else pipeline_or_run_id
+        
+        with self._lock_for(pipeline_id):
+            if run is not None:
+                run_ids = [run.id] if run.id in self.active_runs else []
+            else:
+                run_ids = list(self._active_by_pipeline.get(pipeline_id, ()))
             
-            run = self.active_runs[pipeline_id]
-            run.end_time = datetime.now()
-            run.status = PipelineStatus.CANCELLED
+            if not run_ids:
+                return False
             
+            # Mark runs cancelled and remove them from active runs
+            cancelled_runs = []
+            for run_id in run_ids:
+                run = self.active_runs[run_id]
+                run.end_time = datetime.now()
+                run.status = PipelineStatus.CANCELLED
+                self._untrack_run(run)
+                cancelled_runs.append(run)
+        
+        # Log outside the lock, database writes do not block other status calls
+        for run in cancelled_runs:
             # Log cancellation
             self.logging_service.log_pipeline_run(run)
             
-            # Remove from active runs
-            del self.active_runs[pipeline_id]
-            
             # Log cancellation event
             self.logging_service.log_message(
                 level=LogLevel.WARNING,
-                message=f"Pipeline cancelled: {pipeline_id}",
-                pipeline_id=pipeline_id,
+                message=f"Pipeline cancelled: {run.pipeline_id}",
+                pipeline_id=run.pipeline_id,
                 pipeline_run_id=run.id
             )
-            
-            return True
+        
+        return True
+    
+    def _untrack_run(self, run: PipelineRun):
+        """
+        Remove run from active run tracking (caller must hold the pipeline's shard lock)
+        """
+        self.active_runs.pop(run.id, None)
+        
+        pipeline_runs = self._active_by_pipeline.get(run.pipeline_id)
+        if pipeline_runs is not None:
+            pipeline_runs.discard(run.id)
+            if not pipeline_runs:
+                del self._active_by_pipeline[run.pipeline_id]
+    
+    def _lock_for(self, pipeline_id: str) -> threading.Lock:
+        """
+        Get shard lock guarding run tracking of pipeline
+        """
+        return self._shard_locks[hash(pipeline_id) & 15]
     
     def get_pipeline_history(self, pipeline_id: str, limit: int = 50) -> List[Dict[str, Any]]:
         """
@@ -904,21 +1503,24 @@ class PipelineManager:
         """
         Get all currently active pipeline runs
         Returns:
-            Dict mapping pipeline_id to run information
+            Dict mapping run_id to run information
         """
-        with self.run_lock:
-            return {
-                pid: {
-                    "run_id": run.id,
-                    "pipeline_name": self.config_service.get_pipeline_name(pid),
-                    "start_time": run.start_time.isoformat(),
-                    "processed_count": run.processed_count,
-                    "success_count": run.success_count,
-                    "error_count": run.error_count,
-                    "progress": self._calculate_progress(run)
-                }
-                for pid, run in self.active_runs.items()
+        # Dict copy is atomic, no lock needed for a snapshot
+        active_runs = self.active_runs.copy()
+        
+        return {
+            run_id: {
+                "run_id": run.id,
+                "pipeline_id": run.pipeline_id,
+                "pipeline_name": run.pipeline_name,
+                "start_time": run.start_time.isoformat(),
+                "processed_count": run.processed_count,
+                "success_count": run.success_count,
+                "error_count": run.error_count,
+                "progress": self._calculate_progress(run).to_dict()
             }
+            for run_id, run in active_runs.items()
+        }
     
     def get_default_pipeline_config(self) -> PipelineConfig:
         """
@@ -966,7 +1568,59 @@ class PipelineManager:
         Returns:
             PipelineConfig: Loaded configuration
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        
+        config_data = orjson.loads(data) if orjson is not None else json.loads(data)
         
-        return PipelineConfig.from_dict(config_data)
\ No newline at end of file
+        return PipelineConfig.from_dict(config_data)
+
+# Pipeline manager of a document worker process, set up by _init_document_worker
+_WORKER_MANAGER: Optional[PipelineManager] = None
+_WORKER_CONFIG: Optional[PipelineConfig] = None
+_WORKER_LEVELS: List[List[_PlannedStep]] = []
+_WORKER_RUN_ID: str = ""
+
+def _init_document_worker(db_path: str, config: PipelineConfig, run_id: str):
+    """
+    Document pool initializer - builds pipeline manager and step levels once per worker
+    Args:
+        db_path: Path of the unified database
+        config: Pipeline configuration
+        run_id: Pipeline run identifier
+    """
+    global _WORKER_MANAGER, _WORKER_CONFIG, _WORKER_LEVELS, _WORKER_RUN_ID
+    
+    _WORKER_MANAGER = PipelineManager(UnifiedDatabase(db_path))
+    _WORKER_CONFIG = config
+    _WORKER_RUN_ID = run_id
+    
+    # File/JSON exports are written by the parent, workers only collect their chunks
+    _WORKER_LEVELS = [
+        [
+            (slot, input_slot, step, PipelineManager._collect_export_step
+             if step.type in _BUFFERED_EXPORT_STEPS else handler)
+            for slot, input_slot, step, handler in level
+        ]
+        for level in _WORKER_MANAGER._resolve_step_levels(config)
+    ]
+
+def _process_single_document(doc_path: str) -> tuple:
+    """
+    Process one document inside a document worker process
+    Args:
+        doc_path: Document path
+    Returns:
+        Tuple of (success count, error count, errors, [(export step ID, chunks)]) to merge into the parent run
+    """
+    run = PipelineRun(
+        id=_WORKER_RUN_ID,
+        pipeline_id=_WORKER_CONFIG.id,
+        pipeline_name=_WORKER_CONFIG.name,
+        status=PipelineStatus.RUNNING,
+        document_paths=[doc_path]
+    )
+    exports = _WORKER_MANAGER._collected_exports = []
+    _WORKER_MANAGER._process_document(_WORKER_CONFIG, _WORKER_LEVELS, doc_path, run)
+    
+    return run.success_count, run.error_count, run.materialize_errors(), exports
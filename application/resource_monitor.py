@@ -5,9 +5,72 @@ Resource Monitor - System resource usage monitoring
 
 import psutil
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime
+from array import array
 import gc
+import threading
+
+# Numeric sample fields stored column-wise: (sample section, sample field, array typecode)
+_SAMPLE_COLUMNS = (
+    ("system", "cpu_percent", "d"),
+    ("system", "memory_total_gb", "d"),
+    ("system", "memory_available_gb", "d"),
+    ("system", "memory_used_gb", "d"),
+    ("system", "memory_percent", "d"),
+    ("system", "disk_total_gb", "d"),
+    ("system", "disk_used_gb", "d"),
+    ("system", "disk_percent", "d"),
+    ("system", "network_bytes_sent", "q"),
+    ("system", "network_bytes_recv", "q"),
+    ("process", "cpu_percent", "d"),
+    ("process", "memory_rss_mb", "d"),
+    ("process", "memory_vms_mb", "d"),
+    ("process", "num_threads", "q"),
+    ("process", "num_fds", "q")
+)
+
+# Metrics aggregated over monitoring history: (metric key, sample section, sample field)
+_TRACKED_METRICS = (
+    ("cpu_percent", "system", "cpu_percent"),
+    ("memory_percent", "system", "memory_percent"),
+    ("disk_percent", "system", "disk_percent"),
+    ("process_cpu", "process", "cpu_percent"),
+    ("process_memory_mb", "process", "memory_rss_mb")
+)
+
+# Number of earliest and most recent samples compared for trends
+_TREND_WINDOW = 5
+
+# Metrics with reported trends: (trend name, sample section, sample field)
+_TREND_METRICS = (
+    ("cpu", "system", "cpu_percent"),
+    ("memory", "system", "memory_percent"),
+    ("process_memory", "process", "memory_rss_mb")
+)
+
+# Trend names by code returned from _compute_trend
+_TREND_NAMES = ("decreasing", "stable", "increasing")
+
+def _compute_trend(values, count: int, window: int) -> int:
+    """
+    Compare the earliest and the most recent values of a metric
+    Args:
+        values: Metric values in sample order (array or list)
+        count: Number of values
+        window: Number of values compared at each end (at most count)
+    Returns:
+        int: 0 if decreasing, 1 if stable, 2 if increasing (10% change)
+    """
+    # Same window at both ends, so sums compare like averages
+    sum_earlier = sum(values[:window])
+    sum_recent = sum(values[count - window:count])
+    
+    if sum_recent > sum_earlier * 1.1:
+        return 2
+    elif sum_recent < sum_earlier * 0.9:
+        return 0
+    return 1
 
 class ResourceMonitor:
     """
@@ -15,36 +78,114 @@ class ResourceMonitor:
     """
     
     def __init__(self):
-        self.monitoring_history: List[Dict[str, Any]] = []
         self.is_monitoring = False
         self.monitoring_interval = 1.0  # seconds
+        
+        # Samples are appended by the sampler thread, readers snapshot them under the lock
+        self._history_lock = threading.Lock()
+        self._clear_history()
+        
+        # Background sampler and the latest sample it recorded
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_sampling: Optional[threading.Event] = None
+        self._latest_usage: Optional[Dict[str, Any]] = None
+        
+        # Samples taken while not monitoring are reused for usage_ttl seconds
+        self.usage_ttl = 0.25
+        self._usage_cache: Optional[Dict[str, Any]] = None
+        self._usage_cache_time = 0.0
+        self._usage_lock = threading.Lock()
+        
+        # Process handle and disk path reused by every sample
+        self._proc = psutil.Process()
+        self._proc_memory_info = self._proc.memory_info
+        self._disk_path = '/'
+        
+        # Prime CPU counters so non-blocking samples measure from here
+        psutil.cpu_percent(interval=None)
+        self._proc.cpu_percent()
     
     def start_monitoring(self):
         """
-        Start resource monitoring
+        Start resource monitoring (a background thread records a sample every monitoring_interval)
         """
-        self.is_monitoring = True
+        self.stop_monitoring()
         self.monitoring_start_time = time.time()
-        self.monitoring_history = []
+        self._clear_history()
+        
+        # First sample is recorded right away so readers never wait for the sampler
+        self._latest_usage = self._sample(record=True, interval=None)
+        self.is_monitoring = True
+        
+        self._stop_sampling = threading.Event()
+        self._sampler = threading.Thread(
+            target=self._sampler_loop,
+            args=(self._stop_sampling,),
+            name="resource-monitor",
+            daemon=True
+        )
+        self._sampler.start()
     
     def stop_monitoring(self):
         """
         Stop resource monitoring
         """
         self.is_monitoring = False
+        
+        sampler, self._sampler = self._sampler, None
+        if sampler is not None:
+            self._stop_sampling.set()
+            sampler.join()
+    
+    def _sampler_loop(self, stop: threading.Event):
+        """
+        Record a sample every monitoring_interval until stop is set
+        Args:
+            stop: Event set by stop_monitoring
+        """
+        # CPU percentages are measured since the previous sample, so sampling never blocks
+        while not stop.wait(self.monitoring_interval):
+            try:
+                self._latest_usage = self._sample(record=True, interval=None)
+            except psutil.Error:
+                continue  # Sample skipped, next interval retries
     
     def get_current_usage(self) -> Dict[str, Any]:
         """
-        Get current system resource usage
+        Get current system resource usage (latest background sample while monitoring,
+        otherwise a sample at most usage_ttl seconds old)
         """
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        if self.is_monitoring:
+            return self._latest_usage
+        
+        usage = self._usage_cache
+        if usage is not None and time.monotonic() - self._usage_cache_time < self.usage_ttl:
+            return usage
+        
+        # Concurrent callers wait for one refresh instead of sampling each
+        with self._usage_lock:
+            if self._usage_cache is None or time.monotonic() - self._usage_cache_time >= self.usage_ttl:
+                self._usage_cache = self._sample(record=False, interval=0.1)
+                self._usage_cache_time = time.monotonic()
+            return self._usage_cache
+    
+    def _sample(self, record: bool, interval: Optional[float]) -> Dict[str, Any]:
+        """
+        Read system and process resource usage
+        Args:
+            record: Store sample in monitoring history
+            interval: CPU measurement interval in seconds, None measures since previous call without blocking
+        Returns:
+            Dict with usage sample
+        """
+        cpu_percent = psutil.cpu_percent(interval=interval)
         memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
+        disk = psutil.disk_usage(self._disk_path)
         network = psutil.net_io_counters()
         
         # Get process-specific stats
-        process = psutil.Process()
-        proc_memory = process.memory_info()
+        process = self._proc
+        proc_memory = self._proc_memory_info()
         proc_cpu = process.cpu_percent()
         
         usage = {
@@ -70,11 +211,70 @@ class ResourceMonitor:
             }
         }
         
-        if self.is_monitoring:
-            self.monitoring_history.append(usage)
+        if record:
+            with self._history_lock:
+                self._append_sample(usage)
         
         return usage
     
+    @property
+    def monitoring_history(self) -> List[Dict[str, Any]]:
+        """
+        Monitoring samples rebuilt from column storage
+        """
+        with self._history_lock:
+            count = self._sample_count
+            timestamps = self._timestamps
+            columns = self._columns
+        
+        history = []
+        
+        # Columns only grow until cleared, so the first count values stay consistent
+        for i in range(count):
+            sample = {"timestamp": timestamps[i], "system": {}, "process": {}}
+            for section, field, _ in _SAMPLE_COLUMNS:
+                sample[section][field] = columns[section, field][i]
+            history.append(sample)
+        
+        return history
+    
+    def _clear_history(self):
+        """
+        Clear stored samples and their running aggregates
+        """
+        columns = {
+            (section, field): array(typecode)
+            for section, field, typecode in _SAMPLE_COLUMNS
+        }
+        
+        # New containers replace old ones, so snapshots taken by readers stay valid
+        with self._history_lock:
+            self._timestamps: List[str] = []
+            self._columns = columns
+            self._sample_count = 0
+            
+            self._sums = dict.fromkeys((key for key, _, _ in _TRACKED_METRICS), 0.0)
+            self._peaks: Dict[str, float] = {}
+    
+    def _append_sample(self, usage: Dict[str, Any]):
+        """
+        Store sample values column-wise and add them to running aggregates
+        """
+        self._timestamps.append(usage["timestamp"])
+        columns = self._columns
+        for section, field, _ in _SAMPLE_COLUMNS:
+            columns[section, field].append(usage[section][field])
+        self._sample_count += 1
+        
+        sums = self._sums
+        peaks = self._peaks
+        
+        for key, section, field in _TRACKED_METRICS:
+            value = usage[section][field]
+            sums[key] += value
+            if key not in peaks or value > peaks[key]:
+                peaks[key] = value
+    
     def get_average_usage(self, samples: List[Dict[str, Any]] = None) -> Dict[str, float]:
         """
         Get average resource usage from samples
@@ -84,7 +284,21 @@ class ResourceMonitor:
             Dict with average usage values
         """
         if samples is None:
-            samples = self.monitoring_history
+            # Running sums cover the whole monitoring history
+            with self._history_lock:
+                count = self._sample_count
+                sums = dict(self._sums)
+            
+            if not count:
+                return {}
+            
+            return {
+                "avg_cpu_percent": sums["cpu_percent"] / count,
+                "avg_memory_percent": sums["memory_percent"] / count,
+                "avg_disk_percent": sums["disk_percent"] / count,
+                "avg_process_cpu": sums["process_cpu"] / count,
+                "avg_process_memory_mb": sums["process_memory_mb"] / count
+            }
         
         if not samples:
             return {}
@@ -108,7 +322,21 @@ class ResourceMonitor:
         Get peak resource usage from samples
         """
         if samples is None:
-            samples = self.monitoring_history
+            # Running maxima cover the whole monitoring history
+            with self._history_lock:
+                count = self._sample_count
+                peaks = dict(self._peaks)
+            
+            if not count:
+                return {}
+            
+            return {
+                "peak_cpu_percent": peaks["cpu_percent"],
+                "peak_memory_percent": peaks["memory_percent"],
+                "peak_disk_percent": peaks["disk_percent"],
+                "peak_process_cpu": peaks["process_cpu"],
+                "peak_process_memory_mb": peaks["process_memory_mb"]
+            }
         
         if not samples:
             return {}
@@ -132,62 +360,39 @@ class ResourceMonitor:
         Get resource usage trend (increasing, decreasing, stable)
         """
         if samples is None:
-            samples = self.monitoring_history
+            with self._history_lock:
+                count = self._sample_count
+                columns = [self._columns[section, field] for _, section, field in _TREND_METRICS]
+        else:
+            count = len(samples)
+            columns = [[sample[section][field] for sample in samples] for _, section, field in _TREND_METRICS]
         
-        if len(samples) < 2:
+        if count < 2:
             return {"status": "insufficient_data"}
         
-        # Calculate trends for key metrics
-        cpu_values = [sample["system"]["cpu_percent"] for sample in samples]
-        mem_values = [sample["system"]["memory_percent"] for sample in samples]
-        proc_mem_values = [sample["process"]["memory_rss_mb"] for sample in samples]
-        
-        trends = {}
-        
-        # CPU trend
-        if len(cpu_values) >= 2:
-            avg_recent = sum(cpu_values[-min(5, len(cpu_values)):]) / min(5, len(cpu_values))
-            avg_earlier = sum(cpu_values[:min(5, len(cpu_values))]) / min(5, len(cpu_values))
-            trends["cpu"] = self._determine_trend(avg_earlier, avg_recent)
-        
-        # Memory trend
-        if len(mem_values) >= 2:
-            avg_recent = sum(mem_values[-min(5, len(mem_values)):]) / min(5, len(mem_values))
-            avg_earlier = sum(mem_values[:min(5, len(mem_values))]) / min(5, len(mem_values))
-            trends["memory"] = self._determine_trend(avg_earlier, avg_recent)
-        
-        # Process memory trend
-        if len(proc_mem_values) >= 2:
-            avg_recent = sum(proc_mem_values[-min(5, len(proc_mem_values)):]) / min(5, len(proc_mem_values))
-            avg_earlier = sum(proc_mem_values[:min(5, len(proc_mem_values))]) / min(5, len(proc_mem_values))
-            trends["process_memory"] = self._determine_trend(avg_earlier, avg_recent)
-        
-        return trends
-    
-    def _determine_trend(self, earlier_avg: float, recent_avg: float) -> str:
-        """
-        Determine trend based on comparison of averages
-        """
-        if recent_avg > earlier_avg * 1.1:  # 10% increase
-            return "increasing"
-        elif recent_avg < earlier_avg * 0.9:  # 10% decrease
-            return "decreasing"
-        else:
-            return "stable"
+        # All metrics have count values, so the window is shared
+        window = _TREND_WINDOW if count >= _TREND_WINDOW else count
+        return {
+            name: _TREND_NAMES[_compute_trend(column, count, window)]
+            for (name, _, _), column in zip(_TREND_METRICS, columns)
+        }
     
     def get_resource_alerts(self, cpu_threshold: int = 90, 
                           memory_threshold: int = 85,
-                          disk_threshold: int = 95) -> List[Dict[str, Any]]:
+                          disk_threshold: int = 95,
+                          current: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Get resource alerts based on thresholds
         Args:
             cpu_threshold: CPU usage threshold (%)
             memory_threshold: Memory usage threshold (%)
             disk_threshold: Disk usage threshold (%)
+            current: Usage sample to check (current usage is read if None)
         Returns:
             List of alert conditions
         """
-        current = self.get_current_usage()
+        if current is None:
+            current = self.get_current_usage()
         alerts = []
         
         if current["system"]["cpu_percent"] > cpu_threshold:
@@ -219,11 +424,57 @@ class ResourceMonitor:
         
         return alerts
     
-    def get_resource_recommendations(self) -> List[str]:
+    def get_historical_alerts(self, cpu_threshold: int = 90,
+                              memory_threshold: int = 85,
+                              disk_threshold: int = 95) -> List[Dict[str, Any]]:
+        """
+        Get threshold crossings over the whole monitoring history
+        Args:
+            cpu_threshold: CPU usage threshold (%)
+            memory_threshold: Memory usage threshold (%)
+            disk_threshold: Disk usage threshold (%)
+        Returns:
+            List of alert conditions with sample index and timestamp, ordered by sample
+        """
+        checks = (
+            ("HIGH_CPU", "cpu_percent", cpu_threshold, 10),
+            ("HIGH_MEMORY", "memory_percent", memory_threshold, 10),
+            ("HIGH_DISK", "disk_percent", disk_threshold, 5)
+        )
+        with self._history_lock:
+            count = self._sample_count
+            timestamps = self._timestamps
+            columns = self._columns
+        
+        alerts = []
+        
+        # Scan each metric column once, dicts are built only for crossing samples
+        for alert_type, metric, threshold, critical_margin in checks:
+            column = columns["system", metric]
+            for index, value in enumerate(column[:count]):
+                if value <= threshold:
+                    continue
+                alerts.append({
+                    "type": alert_type,
+                    "metric": metric,
+                    "current_value": value,
+                    "threshold": threshold,
+                    "severity": "WARNING" if value < threshold + critical_margin else "CRITICAL",
+                    "sample_index": index,
+                    "timestamp": timestamps[index]
+                })
+        
+        alerts.sort(key=lambda alert: alert["sample_index"])
+        return alerts
+    
+    def get_resource_recommendations(self, current: Optional[Dict[str, Any]] = None) -> List[str]:
         """
         Get recommendations based on current resource usage
+        Args:
+            current: Usage sample to check (current usage is read if None)
         """
-        current = self.get_current_usage()
+        if current is None:
+            current = self.get_current_usage()
         recommendations = []
         
         if current["system"]["memory_percent"] > 85:
@@ -247,14 +498,18 @@ class ResourceMonitor:
         """
         Get comprehensive monitoring summary
         """
-        if not self.monitoring_history:
+        if not self._sample_count:
             return {"status": "no_data", "message": "Monitoring not started or no data collected"}
         
-        current = self.get_current_usage()
+        # One sample shared by all parts (latest background sample while monitoring)
+        if self.is_monitoring:
+            current = self._latest_usage
+        else:
+            current = self._sample(record=False, interval=None)
         average = self.get_average_usage()
         peak = self.get_peak_usage()
         trend = self.get_resource_trend()
-        alerts = self.get_resource_alerts()
+        alerts = self.get_resource_alerts(current=current)
         
         return {
             "current_usage": current,
@@ -262,8 +517,8 @@ class ResourceMonitor:
             "peak_usage": peak,
             "trends": trend,
             "alerts": alerts,
-            "recommendations": self.get_resource_recommendations(),
-            "samples_collected": len(self.monitoring_history),
+            "recommendations": self.get_resource_recommendations(current=current),
+            "samples_collected": self._sample_count,
             "monitoring_duration": time.time() - getattr(self, 'monitoring_start_time', time.time()),
             "status": "monitoring_active" if self.is_monitoring else "monitoring_inactive"
         }
@@ -272,21 +527,24 @@ class ResourceMonitor:
         """
         Reset monitoring history
         """
-        self.monitoring_history = []
+        self._clear_history()
         if self.is_monitoring:
             self.monitoring_start_time = time.time()
     
-    def get_memory_usage_breakdown(self) -> Dict[str, Any]:
+    def get_memory_usage_breakdown(self, deep: bool = False) -> Dict[str, Any]:
         """
         Get detailed memory usage breakdown
+        Args:
+            deep: Count all GC-tracked objects (walks the whole heap, slow in large processes);
+                  otherwise objects_count is the sum of GC generation counters
         """
         
         memory_info = psutil.virtual_memory()
         swap_info = psutil.swap_memory()
         
         # Get detailed process memory info
-        process = psutil.Process()
-        proc_memory = process.memory_info()
+        process = self._proc
+        proc_memory = self._proc_memory_info()
         proc_memory_full = process.memory_full_info()
         
         return {
@@ -310,7 +568,7 @@ class ResourceMonitor:
                 "swap_memory_mb": proc_memory_full.swap / (1024**2) if hasattr(proc_memory_full, 'swap') else 0
             },
             "garbage_collector": {
-                "objects_count": len(gc.get_objects()),
+                "objects_count": len(gc.get_objects()) if deep else sum(gc.get_count()),
                 "garbage_count": len(gc.garbage),
                 "generation_counts": list(gc.get_count()),
                 "generation_thresholds": list(gc.get_threshold())
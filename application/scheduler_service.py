@@ -9,14 +9,63 @@ from typing import Dict, Any, List, Optional
 from domain.pipeline import PipelineConfig
 from infrastructure.database.unified_db import UnifiedDatabase
 from infrastructure.database.config_service import ConfigService
+from infrastructure.database.scheduler_store import SQLiteJobStore, SchedulerLeaderLock
 from application.pipeline_manager import PipelineManager
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR, EVENT_JOB_MISSED
+from apscheduler.jobstores.base import JobLookupError
 from infrastructure.database.logging_service import LoggingService, LogLevel
 import logging
 from datetime import datetime
+from collections import deque
+from functools import lru_cache
+import threading
+import socket
+import time
 import json
+import uuid
+import os
+
+@lru_cache(maxsize=1024)
+def _parse_cron(cron_expression: str) -> CronTrigger:
+    """
+    Parse crontab expression (cached, triggers keep no per-job state)
+    Args:
+        cron_expression: Cron schedule expression
+    Returns:
+        CronTrigger: Trigger for the expression
+    Raises:
+        ValueError: If cron expression is invalid
+    """
+    return CronTrigger.from_crontab(cron_expression)
+
+# Pipeline runs never overlap, missed runs within 5 minutes are run once
+_JOB_DEFAULTS = {"max_instances": 1, "coalesce": True, "misfire_grace_time": 300}
+
+# Log level of scheduler events
+_EVENT_LEVELS = {"EXECUTED": LogLevel.INFO, "MISSED": LogLevel.WARNING, "ERROR": LogLevel.ERROR}
+
+# Scheduler service holding leadership, per database path (runs the stored jobs)
+_LEADER_SERVICES: Dict[str, 'SchedulerService'] = {}
+
+def _run_scheduled_pipeline(db_path: str, pipeline_id: str, document_paths: List[str], 
+                            run_metadata: Optional[Dict[str, Any]], cron_expression: Optional[str] = None):
+    """
+    Scheduled job function (stored by reference, so jobs survive restarts)
+    Args:
+        db_path: Path of the unified database the job is stored in
+        pipeline_id: Pipeline identifier
+        document_paths: List of document paths to process
+        run_metadata: Additional metadata for scheduled runs
+        cron_expression: Crontab expression the job was scheduled with (reported by get_scheduled_pipelines)
+    """
+    service = _LEADER_SERVICES.get(db_path)
+    if service is None:
+        logging.getLogger("AutoTextETL").warning("No scheduler leader for %s, job of pipeline %s skipped",
+                                                 db_path, pipeline_id)
+        return
+    service._run_pipeline_job(pipeline_id, document_paths, run_metadata)
 
 class SchedulerService:
     """
@@ -28,51 +77,168 @@ class SchedulerService:
         self.config_service = ConfigService(db)
         self.pipeline_manager = PipelineManager(db)
         
-        # Initialize background scheduler
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.start()
+        # Shared by scheduler calls and listener threads (database writes are serialized by db.lock)
+        self.logging_service = LoggingService(db)
+        
+        # Scheduler events are queued by listeners and stored in batches by a flush thread
+        self._log_queue = deque(maxlen=100_000)  # Oldest events are dropped when full
+        self.log_flush_interval = 0.2  # seconds
+        self.log_batch_size = 500
+        self._stop_log_flush = threading.Event()
+        self._log_flush_thread = threading.Thread(
+            target=self._drain_log_queue,
+            name="scheduler-log-flush",
+            daemon=True
+        )
+        self._log_flush_thread.start()
         
-        # Job tracking
-        self.job_registry: Dict[str, str] = {}  # pipeline_id -> job_id
+        # Jobs are kept in the database, every instance stores jobs but only the leader runs them
+        self.scheduler = BackgroundScheduler(
+            jobstores={"default": SQLiteJobStore(db)},
+            job_defaults=_JOB_DEFAULTS
+        )
+        self.scheduler.start(paused=True)
         
         # Set up logging for scheduler events
         self._setup_event_logging()
+        
+        # Leader election - the lease is renewed every leader_poll_interval, standby instances take over when it expires
+        self.leader_lock = SchedulerLeaderLock(
+            db,
+            holder=f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}",
+            lease_seconds=30.0
+        )
+        self.leader_poll_interval = 10.0  # seconds
+        self.is_leader = False
+        self._paused_by_user = False
+        self._stop_leader_election = threading.Event()
+        self._update_leadership()
+        self._leader_thread = threading.Thread(
+            target=self._leader_election_loop,
+            name="scheduler-leader-election",
+            daemon=True
+        )
+        self._leader_thread.start()
     
-    def _setup_event_logging(self):
+    @property
+    def job_registry(self) -> Dict[str, str]:
         """
-        Set up event listeners for scheduler monitoring
+        Map pipeline IDs to IDs of their stored jobs
         """
-        def job_executed(event):
-            self._log_job_event("EXECUTED", event.job_id, event.exception)
-        
-        def job_error(event):
-            self._log_job_event("ERROR", event.job_id, event.exception)
-        
-        def job_missed(event):
-            self._log_job_event("MISSED", event.job_id, "Job missed execution time")
+        return {job.args[1]: job.id for job in self._pipeline_jobs()}
+    
+    def _pipeline_jobs(self, pipeline_id: Optional[str] = None) -> list:
+        """
+        Get pipeline jobs from the job store (shared by all instances using the database)
+        Args:
+            pipeline_id: Only jobs of this pipeline, all pipeline jobs if None
+        Returns:
+            List of APScheduler jobs, args[1] is the pipeline ID
+        """
+        return [
+            job for job in self.scheduler.get_jobs()
+            if job.func is _run_scheduled_pipeline and (pipeline_id is None or job.args[1] == pipeline_id)
+        ]
+    
+    def _leader_election_loop(self):
+        """
+        Renew or acquire scheduler leadership every leader_poll_interval until shutdown
+        """
+        while not self._stop_leader_election.wait(self.leader_poll_interval):
+            self._update_leadership()
+    
+    def _update_leadership(self):
+        """
+        Try to acquire or renew leadership, resume or pause job execution on change
+        """
+        try:
+            acquired = self.leader_lock.try_acquire()
+        except Exception:
+            # Lease cannot be confirmed, stop running jobs until it can
+            logging.getLogger("AutoTextETL").exception("Failed to renew scheduler leadership")
+            acquired = False
         
-        self.scheduler.add_listener(job_executed, EVENT_JOB_EXECUTED)
-        self.scheduler.add_listener(job_error, EVENT_JOB_ERROR)
-        self.scheduler.add_listener(job_missed, EVENT_JOB_MISSED)
+        if acquired and not self.is_leader:
+            self.is_leader = True
+            _LEADER_SERVICES[self.db.db_path] = self
+            if not self._paused_by_user:
+                self.scheduler.resume()
+            self.logging_service.log_message(
+                level=LogLevel.INFO,
+                message="Scheduler leadership acquired - running scheduled jobs",
+                extra_data={"holder": self.leader_lock.holder}
+            )
+        elif not acquired and self.is_leader:
+            self.is_leader = False
+            self.scheduler.pause()
+            if _LEADER_SERVICES.get(self.db.db_path) is self:
+                del _LEADER_SERVICES[self.db.db_path]
+            self.logging_service.log_message(
+                level=LogLevel.WARNING,
+                message="Scheduler leadership lost - scheduled jobs suspended",
+                extra_data={"holder": self.leader_lock.holder}
+            )
+        elif acquired:
+            # Jobs added by other instances are picked up on wakeup
+            self.scheduler.wakeup()
+    
+    def _setup_event_logging(self):
+        """
+        Set up event listener for scheduler monitoring
+        """
+        self.scheduler.add_listener(self._on_job_event, EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED)
+    
+    def _on_job_event(self, event):
+        """
+        Queue executed, failed and missed job events (stored by the log flush thread)
+        """
+        code = event.code
+        if code == EVENT_JOB_EXECUTED:
+            self._log_queue.append(("EXECUTED", event.job_id, time.time(), event.exception))
+        elif code == EVENT_JOB_ERROR:
+            self._log_queue.append(("ERROR", event.job_id, time.time(), event.exception))
+        else:
+            self._log_queue.append(("MISSED", event.job_id, time.time(), "Job missed execution time"))
     
-    def _log_job_event(self, event_type: str, job_id: str, exception: Optional[Exception]):
+    def _drain_log_queue(self):
         """
-        Log scheduler events
+        Store queued scheduler events every log_flush_interval until shutdown
         """
-        log_data = {
-            "event_type": event_type,
-            "job_id": job_id,
-            "timestamp": datetime.now().isoformat(),
-            "exception": str(exception) if exception else None
-        }
+        while not self._stop_log_flush.wait(self.log_flush_interval):
+            self._flush_log_queue()
         
-        # Log to database
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
-            level=LogLevel.INFO if event_type == "EXECUTED" else LogLevel.ERROR,
-            message=f"Scheduler event: {event_type}",
-            extra_data=log_data
-        )
+        # Events queued before shutdown
+        self._flush_log_queue()
+    
+    def _flush_log_queue(self):
+        """
+        Store queued scheduler events in batches of log_batch_size
+        """
+        queue = self._log_queue
+        while queue:
+            records = []
+            while queue and len(records) < self.log_batch_size:
+                event_type, job_id, logged_at, exception = queue.popleft()
+                records.append((
+                    _EVENT_LEVELS.get(event_type, LogLevel.ERROR),
+                    f"Scheduler event: {event_type}",
+                    None,
+                    None,
+                    None,
+                    {
+                        "event_type": event_type,
+                        "job_id": job_id,
+                        "timestamp": datetime.fromtimestamp(logged_at).isoformat(),
+                        "exception": str(exception) if exception else None
+                    },
+                    logged_at
+                ))
+            
+            try:
+                self.logging_service.log_messages_bulk(records)
+            except Exception:
+                # Flush thread must survive database errors, the batch is lost
+                logging.getLogger("AutoTextETL").exception("Failed to store %d scheduler events", len(records))
     
     def schedule_pipeline(self, pipeline_id: str, cron_expression: str, 
                          document_paths: List[str], run_metadata: Optional[Dict[str, Any]] = None) -> str:
@@ -95,28 +261,30 @@ class SchedulerService:
         
         # Validate cron expression
         try:
-            CronTrigger.from_crontab(cron_expression)
+            trigger = _parse_cron(cron_expression)
         except ValueError as e:
             raise ValueError(f"Invalid cron expression: {cron_expression}. Error: {e}")
         
-        # Create job function
-        job_func = self._create_pipeline_job(pipeline_id, document_paths, run_metadata)
-        
-        # Schedule job
+        # Schedule job (stored in the database and run by the leader instance),
+        # one job per pipeline replaces the previous schedule
         job = self.scheduler.add_job(
-            func=job_func,
-            trigger=CronTrigger.from_crontab(cron_expression),
-            id=f"pipeline_{pipeline_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+            func=_run_scheduled_pipeline,
+            args=[self.db.db_path, pipeline_id, list(document_paths), run_metadata],
+            kwargs={"cron_expression": cron_expression},
+            trigger=trigger,
+            id=f"pipeline_{pipeline_id}",
             name=f"Pipeline {pipeline_id} - {config.name}",
-            replace_existing=True
+            replace_existing=True,
+            **_JOB_DEFAULTS
         )
         
-        # Register job in registry
-        self.job_registry[pipeline_id] = job.id
+        # Jobs stored under timestamped IDs by earlier versions
+        for old_job in self._pipeline_jobs(pipeline_id):
+            if old_job.id != job.id:
+                self._remove_job(old_job.id)
         
         # Log scheduling
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
+        self.logging_service.log_message(
             level=LogLevel.INFO,
             message=f"Pipeline scheduled: {pipeline_id} with cron {cron_expression}",
             pipeline_id=pipeline_id,
@@ -129,47 +297,42 @@ class SchedulerService:
         
         return job.id
     
-    def _create_pipeline_job(self, pipeline_id: str, document_paths: List[str], 
-                           run_metadata :Optional[Dict[str, Any]]) -> callable:
+    def _run_pipeline_job(self, pipeline_id: str, document_paths: List[str], 
+                          run_metadata: Optional[Dict[str, Any]]):
         """
-        Create job function for pipeline execution
+        Execute scheduled pipeline run
         """
-        def job_function():
-            try:
-                # Execute pipeline
-                run_id = self.pipeline_manager.execute_pipeline(
-                    pipeline_id, 
-                    document_paths, 
-                    run_metadata
-                )
-                
-                # Log successful execution
-                logging_service = LoggingService(self.db)
-                logging_service.log_message(
-                    level=LogLevel.INFO,
-                    message=f"Scheduled pipeline executed successfully: {pipeline_id}",
-                    pipeline_id=pipeline_id,
-                    extra_data={
-                        "run_id": run_id,
-                        "document_count": len(document_paths)
-                    }
-                )
-                
-            except Exception as e:
-                # Log execution error
-                logging_service = LoggingService(self.db)
-                logging_service.log_message(
-                    level=LogLevel.ERROR,
-                    message=f"Scheduled pipeline execution failed: {pipeline_id}",
-                    pipeline_id=pipeline_id,
-                    extra_data={
-                        "error_type": type(e).__name__,
-                        "error_message": str(e),
-                        "document_count": len(document_paths)
-                    }
-                )
-        
-        return job_function
+        try:
+            # Execute pipeline
+            run_id = self.pipeline_manager.execute_pipeline(
+                pipeline_id, 
+                document_paths, 
+                run_metadata
+            )
+            
+            # Log successful execution
+            self.logging_service.log_message(
+                level=LogLevel.INFO,
+                message=f"Scheduled pipeline executed successfully: {pipeline_id}",
+                pipeline_id=pipeline_id,
+                extra_data={
+                    "run_id": run_id,
+                    "document_count": len(document_paths)
+                }
+            )
+            
+        except Exception as e:
+            # Log execution error
+            self.logging_service.log_message(
+                level=LogLevel.ERROR,
+                message=f"Scheduled pipeline execution failed: {pipeline_id}",
+                pipeline_id=pipeline_id,
+                extra_data={
+                    "error_type": type(e).__name__,
+                    "error_message": str(e),
+                    "document_count": len(document_paths)
+                }
+            )
     
     def cancel_scheduled_pipeline(self, pipeline_id: str) -> bool:
         """
@@ -179,28 +342,35 @@ class SchedulerService:
         Returns:
             bool: True if cancelled successfully
         """
-        if pipeline_id not in self.job_registry:
+        job_ids = [job.id for job in self._pipeline_jobs(pipeline_id)]
+        if not job_ids:
             return False
         
-        job_id = self.job_registry[pipeline_id]
-        
         try:
-            self.scheduler.remove_job(job_id)
-            del self.job_registry[pipeline_id]
+            for job_id in job_ids:
+                self._remove_job(job_id)
             
             # Log cancellation
-            logging_service = LoggingService(self.db)
-            logging_service.log_message(
+            self.logging_service.log_message(
                 level=LogLevel.INFO,
                 message=f"Pipeline schedule cancelled: {pipeline_id}",
                 pipeline_id=pipeline_id,
-                extra_data={"job_id": job_id}
+                extra_data={"job_ids": job_ids}
             )
             
             return True
         except Exception:
             return False
     
+    def _remove_job(self, job_id: str):
+        """
+        Remove stored job, ignoring jobs already removed by another instance
+        """
+        try:
+            self.scheduler.remove_job(job_id)
+        except JobLookupError:
+            pass
+    
     def reschedule_pipeline(self, pipeline_id: str, new_cron_expression: str) -> bool:
         """
         Reschedule existing pipeline with new cron expression
@@ -210,33 +380,30 @@ class SchedulerService:
         Returns:
             bool: True if rescheduled successfully
         """
-        if pipeline_id not in self.job_registry:
-            return False
-        
         # Get current job info
-        job_id = self.job_registry[pipeline_id]
-        job = self.scheduler.get_job(job_id)
-        
-        if not job:
+        jobs = self._pipeline_jobs(pipeline_id)
+        if not jobs:
             return False
         
         # Validate new cron expression
         try:
-            CronTrigger.from_crontab(new_cron_expression)
+            trigger = _parse_cron(new_cron_expression)
         except ValueError as e:
             raise ValueError(f"Invalid cron expression: {new_cron_expression}. Error: {e}")
         
         # Reschedule job
-        self.scheduler.reschedule_job(job_id, trigger=CronTrigger.from_crontab(new_cron_expression))
+        old_cron = jobs[0].kwargs.get("cron_expression") or str(jobs[0].trigger)
+        for job in jobs:
+            self.scheduler.modify_job(job.id, kwargs={"cron_expression": new_cron_expression})
+            self.scheduler.reschedule_job(job.id, trigger=trigger)
         
         # Log rescheduling
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
+        self.logging_service.log_message(
             level=LogLevel.INFO,
             message=f"Pipeline rescheduled: {pipeline_id}",
             pipeline_id=pipeline_id,
             extra_data={
-                "old_cron": job.trigger.cron,
+                "old_cron": old_cron,
                 "new_cron": new_cron_expression
             }
         )
@@ -249,27 +416,24 @@ class SchedulerService:
         Returns:
             List of scheduled pipeline information
         """
-        scheduled = []
+        # Stored pipeline jobs with their pipeline IDs, including jobs added by other instances
+        jobs = [(job, job.args[1]) for job in self._pipeline_jobs()]
+        
+        # Pipeline names come from one bulk configuration lookup
+        configs = self.pipeline_manager.get_pipeline_configs([pipeline_id for _, pipeline_id in jobs])
         
-        for job in self.scheduler.get_jobs():
-            # Extract pipeline ID from job ID (assuming format: pipeline_{id}_timestamp)
-            if job.id.startswith("pipeline_"):
-                parts = job.id.split('_')
-                if len(parts) >= 3:
-                    pipeline_id = "_".join(parts[1:-2])  # Extract pipeline ID
-                    
-                    # Get pipeline config to get name
-                    config = self.pipeline_manager.get_pipeline_config(pipeline_id)
-                    pipeline_name = config.name if config else "Unknown"
-                    
-                    scheduled.append({
-                        "pipeline_id": pipeline_id,
-                        "pipeline_name": pipeline_name,
-                        "job_id": job.id,
-                        "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
-                        "cron_expression": str(job.trigger),
-                        "misfire_grace_time": job.misfire_grace_time
-                    })
+        scheduled = []
+        for job, pipeline_id in jobs:
+            config = configs.get(pipeline_id)
+            scheduled.append({
+                "pipeline_id": pipeline_id,
+                "pipeline_name": config.name if config else "Unknown",
+                "job_id": job.id,
+                "next_run_time": job.next_run_time.isoformat() if job.next_run_time else None,
+                # Jobs stored without their expression fall back to the trigger description
+                "cron_expression": job.kwargs.get("cron_expression") or str(job.trigger),
+                "misfire_grace_time": job.misfire_grace_time
+            })
         
         return scheduled
     
@@ -281,23 +445,18 @@ class SchedulerService:
         Returns:
             datetime: Next run time or None if not scheduled
         """
-        if pipeline_id not in self.job_registry:
-            return None
-        
-        job_id = self.job_registry[pipeline_id]
-        job = self.scheduler.get_job(job_id)
-        
-        return job.next_run_time if job else None
+        run_times = [job.next_run_time for job in self._pipeline_jobs(pipeline_id) if job.next_run_time]
+        return min(run_times) if run_times else None
     
     def pause_scheduler(self):
         """
         Pause all scheduled jobs
         """
+        self._paused_by_user = True
         self.scheduler.pause()
         
         # Log pause
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
+        self.logging_service.log_message(
             level=LogLevel.WARNING,
             message="Scheduler paused - all jobs suspended"
         )
@@ -306,11 +465,14 @@ class SchedulerService:
         """
         Resume all scheduled jobs
         """
-        self.scheduler.resume()
+        self._paused_by_user = False
+        
+        # Standby instances stay paused until they acquire leadership
+        if self.is_leader:
+            self.scheduler.resume()
         
         # Log resume
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
+        self.logging_service.log_message(
             level=LogLevel.INFO,
             message="Scheduler resumed - all jobs active"
         )
@@ -319,11 +481,24 @@ class SchedulerService:
         """
         Shutdown scheduler service
         """
+        self._stop_leader_election.set()
+        self._leader_thread.join()
+        
         self.scheduler.shutdown(wait=True)
         
+        # Hand leadership over to a standby instance
+        if self.is_leader:
+            self.is_leader = False
+            if _LEADER_SERVICES.get(self.db.db_path) is self:
+                del _LEADER_SERVICES[self.db.db_path]
+            self.leader_lock.release()
+        
+        # Store remaining scheduler events
+        self._stop_log_flush.set()
+        self._log_flush_thread.join()
+        
         # Log shutdown
-        logging_service = LoggingService(self.db)
-        logging_service.log_message(
+        self.logging_service.log_message(
             level=LogLevel.INFO,
             message="Scheduler service shut down"
         )
@@ -337,7 +512,7 @@ class SchedulerService:
             bool: True if valid
         """
         try:
-            CronTrigger.from_crontab(cron_expr)
+            _parse_cron(cron_expr)
             return True
         except ValueError:
             return False
\ No newline at end of file
@@ -5,9 +5,9 @@ Task Dispatcher - Parallel document processing coordination
 
 import sys
 from pathlib import Path
-from typing import Dict, Any, List, Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, Future
-from multiprocessing import cpu_count
+from typing import Dict, Any, List, Optional, Callable, Tuple
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
+from multiprocessing import cpu_count, get_context
 import threading
 from domain.document import Document
 from domain.pipeline import PipelineConfig, PipelineRun
@@ -15,14 +15,127 @@ from infrastructure.loaders.document_factory import DocumentFactory
 from application.resource_monitor import ResourceMonitor
 from application.error_recovery import ErrorRecoveryService
 from datetime import datetime
-import queue
 import time
+import os
+from collections import deque
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+# Compiled user scripts, populated once per worker process by _preload_scripts
+_PRELOADED_SCRIPTS: Dict[str, Any] = {}
+_SCRIPT_BUILTINS: Optional[dict] = None
+
+def _preload_scripts(script_codes: Dict[str, str]):
+    """
+    Script pool initializer - compiles validated user scripts once per worker
+    Args:
+        script_codes: Mapping of script_id to already validated script code
+    """
+    global _SCRIPT_BUILTINS
+    from infrastructure.security.script_sandbox import ScriptSandbox
+    
+    _SCRIPT_BUILTINS = ScriptSandbox().secure_builtins
+    for script_id, code in script_codes.items():
+        _PRELOADED_SCRIPTS[script_id] = compile(code, f"<script {script_id}>", "exec")
+
+def _execute_preloaded_script(script_id: str, context: Dict[str, Any]) -> Any:
+    """
+    Execute preloaded script code object inside a script pool worker
+    Args:
+        script_id: Script identifier passed to _preload_scripts
+        context: Execution context (must be picklable)
+    Returns:
+        Any: Script result, same shape as ScriptSandbox.execute_script
+    """
+    from infrastructure.security.script_sandbox import execute_sandboxed_code
+    
+    code = _PRELOADED_SCRIPTS.get(script_id)
+    if code is None:
+        raise KeyError(f"Script not preloaded in worker: {script_id}")
+    
+    return execute_sandboxed_code(code, context, _SCRIPT_BUILTINS)
+
+# Dispatcher, document executor and configuration of a document worker process, set up by _init_document_worker
+_WORKER_DISPATCHER: Optional['TaskDispatcher'] = None
+_WORKER_EXECUTOR: Any = None
+_WORKER_CONFIG: Optional[PipelineConfig] = None
+
+def _limit_worker_process(worker_counter, memory_limit_bytes: Optional[int]):
+    """
+    Pin worker process to one CPU and cap its address space (skipped where unsupported)
+    Args:
+        worker_counter: Shared multiprocessing.Value assigning worker indexes, None to skip pinning
+        memory_limit_bytes: Address space limit of the worker, None for no limit
+    """
+    if worker_counter is not None and hasattr(os, "sched_setaffinity"):
+        with worker_counter.get_lock():
+            worker_idx = worker_counter.value
+            worker_counter.value += 1
+        
+        # Workers are spread over the CPUs this process may run on
+        cpus = sorted(os.sched_getaffinity(0))
+        try:
+            os.sched_setaffinity(0, {cpus[worker_idx % len(cpus)]})
+        except OSError:
+            pass
+    
+    if memory_limit_bytes and resource is not None:
+        # A runaway document raises MemoryError in its worker instead of exhausting system memory
+        _, hard_limit = resource.getrlimit(resource.RLIMIT_AS)
+        if hard_limit != resource.RLIM_INFINITY:
+            memory_limit_bytes = min(memory_limit_bytes, hard_limit)
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, hard_limit))
+        except (ValueError, OSError):
+            pass
+
+def _init_document_worker(db_path: str, pipeline_config: PipelineConfig, max_memory_percentage: int,
+                          worker_counter=None, memory_limit_bytes: Optional[int] = None):
+    """
+    Document pool initializer - builds dispatcher and document executor once per worker
+    Args:
+        db_path: Path of the unified database
+        pipeline_config: Pipeline configuration
+        max_memory_percentage: Memory limit of the parent dispatcher
+        worker_counter: Shared counter for CPU pinning (None to skip pinning)
+        memory_limit_bytes: Address space limit of the worker (None for no limit)
+    """
+    global _WORKER_DISPATCHER, _WORKER_EXECUTOR, _WORKER_CONFIG
+    _limit_worker_process(worker_counter, memory_limit_bytes)
+    
+    from infrastructure.database.unified_db import UnifiedDatabase
+    from application.document_executor import DocumentExecutor
+    
+    db = UnifiedDatabase(db_path)
+    _WORKER_DISPATCHER = TaskDispatcher(db)
+    _WORKER_DISPATCHER.max_memory_percentage = max_memory_percentage
+    _WORKER_EXECUTOR = DocumentExecutor(db)
+    _WORKER_CONFIG = pipeline_config
+
+def _process_document_in_worker(document_path: str) -> Dict[str, Any]:
+    """
+    Process one document inside a document worker process
+    Args:
+        document_path: Document path
+    Returns:
+        Dict with result of TaskDispatcher._process_single_document
+    """
+    return _WORKER_DISPATCHER._process_single_document(_WORKER_EXECUTOR, _WORKER_CONFIG, document_path)
 
 class TaskDispatcher:
     """
     Dispatches document processing tasks with parallel execution
     """
     
+    # Adaptive processing thresholds, memory ones are relative to max_memory_percentage
+    REDUCE_MEMORY_MARGIN = 10  # Reduce workers above max_memory_percentage - 10
+    INCREASE_MEMORY_MARGIN = 30  # Increase workers below max_memory_percentage - 30
+    REDUCE_CPU_PERCENT = 80
+    INCREASE_CPU_PERCENT = 60
+    
     def __init__(self, db):
         self.db = db
         self.resource_monitor = ResourceMonitor()
@@ -32,93 +145,265 @@ class TaskDispatcher:
         self.max_workers = min(cpu_count(), 8)  # Cap at 8 workers
         self.max_memory_percentage = 80  # Use max 80% of available memory
         self.timeout_seconds = 300  # 5 minutes per document
+        self.max_tasks_per_child = 50  # Document worker processes are replaced after this many documents
+        self.pin_worker_cpus = True  # Pin each document worker process to one CPU (Linux)
+        self.limit_worker_memory = True  # Cap worker address space at its share of max_memory_percentage
+        
+        # Submitted document futures by id(future), removed by their done callback
+        self.active_tasks: Dict[int, Future] = {}
         
-        # Task queues and tracking
-        self.active_tasks: Dict[str, Future] = {}
-        self.task_queue = queue.Queue()
-        self.dispatcher_lock = threading.Lock()
+        # Long-lived thread pool of thread-based batches (threads start on demand)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._thread_pool_lock = threading.Lock()
+        
+        # Resource watchdog sets the throttle flag read by workers (started on first check)
+        self.resource_check_interval = 0.5  # Seconds between watchdog resource checks
+        self._throttle = False
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop_watchdog = threading.Event()
+        self._watchdog_lock = threading.Lock()
+        
+        # Adaptive worker adjustments as (time.time(), action, from, to)
+        self._adjustments = deque(maxlen=1000)
     
     def process_documents_parallel(self, pipeline_config: PipelineConfig, 
                                  document_paths: List[str], 
-                                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+                                 max_workers: Optional[int] = None,
+                                 use_processes: bool = True,
+                                 skip_processed: bool = False) -> Dict[str, Any]:
         """
-        Process documents in parallel using thread pool
+        Process documents in parallel using process pool (or thread pool)
         Args:
             pipeline_config: Pipeline configuration
-            document_paths: List of document paths to process
+            document_paths: List of document paths to process (duplicates are processed once)
             max_workers: Maximum number of parallel workers (defaults to CPU count)
+            use_processes: Process documents in worker processes, threads are used
+                           if False or only one worker is needed
+            skip_processed: Skip documents already processed successfully by this pipeline
+                            and not modified since (re-run after partial failure)
         Returns:
-            Dict with processing results and statistics
+            Dict with processing results and statistics, skipped documents in "skipped"
         """
-        max_workers = max_workers or min(self.max_workers, len(document_paths))
+        document_paths = list(dict.fromkeys(document_paths))
+        
+        skipped = []
+        if skip_processed and document_paths:
+            processed = self.error_recovery.get_processed_documents(pipeline_config.id, document_paths)
+            if processed:
+                skipped = [path for path in document_paths if path in processed]
+                document_paths = [path for path in document_paths if path not in processed]
+        
+        max_workers = max_workers or max(1, min(self.max_workers, len(document_paths)))
         
         # Monitor resource usage
         initial_resources = self.resource_monitor.get_current_usage()
         
-        results = {
-            "processed_count": 0,
-            "success_count": 0,
-            "error_count": 0,
-            "errors": [],
-            "processing_times": {},
-            "memory_usage_peak": 0,
-            "cpu_usage_avg": 0
-        }
+        # Outcomes are collected as tuples, the results dict is built once at the end
+        success_times: List[Tuple[str, float]] = []
+        errors: List[Tuple[str, str, Optional[str], float]] = []  # (path, error, error_type, time.time())
         
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit tasks
-            future_to_path = {}
-            for doc_path in document_paths:
-                # Import DocumentExecutor inside the loop to avoid circular import
-                from application.document_executor import DocumentExecutor
-                executor_instance = DocumentExecutor(self.db)
+        executor = self._create_document_pool(pipeline_config, max_workers, use_processes)
+        in_processes = isinstance(executor, ProcessPoolExecutor)
+        pending = set()
+        try:
+            if not in_processes:
+                # One document executor serves all threads (it keeps no per-document state)
+                executor_instance = self._create_document_executor()
                 
-                future = executor.submit(
-                    self._process_single_document,
-                    executor_instance,
-                    pipeline_config,
-                    doc_path
-                )
-                future_to_path[future] = doc_path
+                # Shared pool threads run at most max_workers documents of this batch at once
+                max_workers = min(max_workers, self.max_workers)
+                gate = threading.BoundedSemaphore(max_workers)
             
-            # Collect results
-            for future in as_completed(future_to_path, timeout=self.timeout_seconds):
-                doc_path = future_to_path[future]
-                
-                try:
-                    result = future.result(timeout=60)  # 1 minute timeout per result
-                    if result["success"]:
-                        results["success_count"] += 1
-                        results["processing_times"][doc_path] = result["processing_time"]
+            # timeout_seconds applies per document, workers go through the batch in rounds
+            rounds = -(-len(document_paths) // max_workers)
+            deadline = time.monotonic() + self.timeout_seconds * rounds
+            
+            # Documents are submitted as others complete, at most max_in_flight are queued or running
+            max_in_flight = max_workers * 2
+            remaining_paths = iter(document_paths)
+            future_to_path = {}
+            while True:
+                for doc_path in remaining_paths:
+                    if in_processes:
+                        # Worker processes hold their own document executor and configuration
+                        future = executor.submit(_process_document_in_worker, doc_path)
                     else:
-                        results["error_count"] += 1
-                        results["errors"].append({
-                            "document_path": doc_path,
-                            "error": result["error"],
-                            "timestamp": datetime.now().isoformat()
-                        })
+                        future = executor.submit(
+                            self._process_gated_document,
+                            gate,
+                            executor_instance,
+                            pipeline_config,
+                            doc_path
+                        )
+                    future_to_path[future] = doc_path
+                    self._track_task(future)
+                    pending.add(future)
+                    if len(pending) >= max_in_flight:
+                        break
+                
+                if not pending:
+                    break  # All documents done
                 
-                except Exception as e:
-                    results["error_count"] += 1
-                    results["errors"].append({
-                        "document_path": doc_path,
-                        "error": str(e),
-                        "error_type": type(e).__name__,
-                        "timestamp": datetime.now().isoformat()
-                    })
+                # Collect results as they complete until the deadline passes
+                done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()),
+                                     return_when=FIRST_COMPLETED)
+                if not done:
+                    break  # Deadline reached
                 
-                results["processed_count"] += 1
+                for future in done:
+                    doc_path = future_to_path.pop(future)
+                    
+                    try:
+                        result = future.result()
+                        if result["success"]:
+                            success_times.append((doc_path, result["processing_time"]))
+                        else:
+                            errors.append((doc_path, result.get("error", "Document processing failed"),
+                                           None, time.time()))
+                    
+                    except Exception as e:
+                        errors.append((doc_path, str(e), type(e).__name__, time.time()))
+            
+            # Documents left at the deadline are cancelled (or never submitted) and reported as timed out
+            timeout_message = f"Document processing timed out after {self.timeout_seconds} seconds"
+            for future in pending:
+                future.cancel()
+                errors.append((future_to_path[future], timeout_message, "TimeoutError", time.time()))
+            for doc_path in remaining_paths:
+                errors.append((doc_path, timeout_message, "TimeoutError", time.time()))
+        
+        finally:
+            # Process workers stuck in a timed out document are not waited for, the thread pool stays up
+            if in_processes:
+                executor.shutdown(wait=not pending, cancel_futures=True)
+        
+        results = self._build_results(success_times, errors)
+        results["skipped"] = skipped
         
         # Calculate final resource usage
         final_resources = self.resource_monitor.get_current_usage()
         results["memory_usage_peak"] = max(
-            initial_resources["memory_percent"], 
-            final_resources["memory_percent"]
+            initial_resources["system"]["memory_percent"], 
+            final_resources["system"]["memory_percent"]
         )
-        results["cpu_usage_avg"] = (initial_resources["cpu_percent"] + final_resources["cpu_percent"]) / 2
+        results["cpu_usage_avg"] = (initial_resources["system"]["cpu_percent"] + final_resources["system"]["cpu_percent"]) / 2
         
         return results
     
+    def _track_task(self, future: Future):
+        """
+        Track future in active_tasks until it is done or cancelled
+        """
+        task_id = id(future)
+        self.active_tasks[task_id] = future
+        
+        # Runs immediately if the future is already done
+        future.add_done_callback(lambda f: self.active_tasks.pop(task_id, None))
+    
+    @staticmethod
+    def _build_results(success_times: List[Tuple[str, float]], 
+                       errors: List[Tuple[str, str, Optional[str], float]]) -> Dict[str, Any]:
+        """
+        Build batch results from collected document outcomes
+        Args:
+            success_times: (document_path, processing_time) of successful documents
+            errors: (document_path, error, error_type or None, time.time()) of failed documents
+        Returns:
+            Dict with processing results
+        """
+        error_dicts = []
+        for doc_path, error, error_type, failed_at in errors:
+            error_dict = {"document_path": doc_path, "error": error}
+            if error_type is not None:
+                error_dict["error_type"] = error_type
+            error_dict["timestamp"] = datetime.fromtimestamp(failed_at).isoformat()
+            error_dicts.append(error_dict)
+        
+        return {
+            "processed_count": len(success_times) + len(errors),
+            "success_count": len(success_times),
+            "error_count": len(errors),
+            "errors": error_dicts,
+            "processing_times": dict(success_times)
+        }
+    
+    def _create_document_pool(self, pipeline_config: PipelineConfig, max_workers: int, 
+                              use_processes: bool):
+        """
+        Create executor for parallel document processing
+        Args:
+            pipeline_config: Pipeline configuration (sent once to every worker process)
+            max_workers: Maximum number of parallel workers
+            use_processes: Use worker processes (CPU-bound parsing and chunking avoid the GIL)
+        Returns:
+            ProcessPoolExecutor or the shared ThreadPoolExecutor
+        """
+        if not use_processes or max_workers < 2:
+            return self._get_thread_pool()
+        
+        # Spawn avoids forking a process that already runs scheduler/UI threads
+        context = get_context("spawn")
+        worker_counter = context.Value("i", 0) if self.pin_worker_cpus else None
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=context,
+            initializer=_init_document_worker,
+            initargs=(self.db.db_path, pipeline_config, self.max_memory_percentage,
+                      worker_counter, self._worker_memory_limit(max_workers)),
+            max_tasks_per_child=self.max_tasks_per_child
+        )
+    
+    def _worker_memory_limit(self, max_workers: int) -> Optional[int]:
+        """
+        Get address space limit of one document worker process
+        Args:
+            max_workers: Number of worker processes sharing the memory limit
+        Returns:
+            int: Limit in bytes or None if disabled
+        """
+        if not self.limit_worker_memory:
+            return None
+        
+        total_bytes = self.resource_monitor.get_current_usage()["system"]["memory_total_gb"] * 1024**3
+        return int(total_bytes * self.max_memory_percentage / 100 / max_workers)
+    
+    def _get_thread_pool(self) -> ThreadPoolExecutor:
+        """
+        Get shared thread pool for thread-based batches (created on first use)
+        """
+        with self._thread_pool_lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="document-worker"
+                )
+            return self._thread_pool
+    
+    def shutdown(self):
+        """
+        Release worker threads held by the dispatcher
+        """
+        with self._thread_pool_lock:
+            pool, self._thread_pool = self._thread_pool, None
+        
+        if pool is not None:
+            pool.shutdown(wait=True)
+        
+        with self._watchdog_lock:
+            watchdog, self._watchdog = self._watchdog, None
+            self._stop_watchdog.set()
+        
+        if watchdog is not None:
+            watchdog.join()
+    
+    def _create_document_executor(self):
+        """
+        Create document executor shared by the documents of a batch
+        """
+        # Import DocumentExecutor here to avoid circular import
+        from application.document_executor import DocumentExecutor
+        return DocumentExecutor(self.db)
+    
     def process_documents_sequentially(self, pipeline_config: PipelineConfig, 
                                      document_paths: List[str]) -> Dict[str, Any]:
         """
@@ -129,49 +414,27 @@ class TaskDispatcher:
         Returns:
             Dict with processing results
         """
-        results = {
-            "processed_count": 0,
-            "success_count": 0,
-            "error_count": 0,
-            "errors": [],
-            "processing_times": {}
-        }
+        # Outcomes are collected as tuples, timestamps are formatted once by _build_results
+        success_times: List[Tuple[str, float]] = []
+        errors: List[Tuple[str, str, Optional[str], float]] = []
+        
+        executor = self._create_document_executor()
         
         for doc_path in document_paths:
             try:
                 start_time = time.time()
                 
-                # Import DocumentExecutor inside the loop to avoid circular import
-                from application.document_executor import DocumentExecutor
-                executor = DocumentExecutor(self.db)
-                
                 success = executor.execute_document(pipeline_config, doc_path)
                 
-                processing_time = time.time() - start_time
-                
                 if success:
-                    results["success_count"] += 1
-                    results["processing_times"][doc_path] = processing_time
+                    success_times.append((doc_path, time.time() - start_time))
                 else:
-                    results["error_count"] += 1
-                    results["errors"].append({
-                        "document_path": doc_path,
-                        "error": "Document processing failed",
-                        "timestamp": datetime.now().isoformat()
-                    })
+                    errors.append((doc_path, "Document processing failed", None, time.time()))
             
             except Exception as e:
-                results["error_count"] += 1
-                results["errors"].append({
-                    "document_path": doc_path,
-                    "error": str(e),
-                    "error_type": type(e).__name__,
-                    "timestamp": datetime.now().isoformat()
-                })
-            
-            results["processed_count"] += 1
+                errors.append((doc_path, str(e), type(e).__name__, time.time()))
         
-        return results
+        return self._build_results(success_times, errors)
     
     def _process_single_document(self, executor, pipeline_config: PipelineConfig, 
                                document_path: str) -> Dict[str, Any]:
@@ -205,21 +468,62 @@ class TaskDispatcher:
                 "document_path": document_path
             }
     
+    def _process_gated_document(self, gate: threading.BoundedSemaphore, executor,
+                                pipeline_config: PipelineConfig, document_path: str) -> Dict[str, Any]:
+        """
+        Process single document while holding a slot of the batch concurrency gate
+        """
+        with gate:
+            return self._process_single_document(executor, pipeline_config, document_path)
+    
     def _check_resource_availability(self) -> bool:
         """
         Check if system has sufficient resources for processing
+        (reads the flag kept up to date by the resource watchdog)
+        """
+        if self._watchdog is None:
+            self._start_watchdog()
+        return not self._throttle
+    
+    def _start_watchdog(self):
+        """
+        Start resource watchdog thread (once per dispatcher)
+        """
+        with self._watchdog_lock:
+            if self._watchdog is not None:
+                return
+            
+            # First documents are checked against a fresh sample
+            self._update_throttle()
+            self._stop_watchdog.clear()
+            self._watchdog = threading.Thread(
+                target=self._resource_watchdog,
+                name="resource-watchdog",
+                daemon=True
+            )
+            self._watchdog.start()
+    
+    def _resource_watchdog(self):
+        """
+        Watchdog loop - refreshes throttle flag until dispatcher shutdown
+        """
+        while not self._stop_watchdog.wait(self.resource_check_interval):
+            try:
+                self._update_throttle()
+            except Exception:
+                pass  # Keep last flag if resources cannot be read
+    
+    def _update_throttle(self):
+        """
+        Set throttle flag from current system resource usage
         """
         resources = self.resource_monitor.get_current_usage()
         
-        # Check memory usage
-        if resources["memory_percent"] > self.max_memory_percentage:
-            return False
-        
-        # Check CPU load (optional threshold)
-        if resources["cpu_percent"] > 90:  # If CPU is very high
-            return False  # Wait for CPU to cool down
-        
-        return True
+        # Memory over limit or very high CPU load (wait for CPU to cool down)
+        self._throttle = (
+            resources["system"]["memory_percent"] > self.max_memory_percentage
+            or resources["system"]["cpu_percent"] > 90
+        )
     
     def adaptive_processing(self, pipeline_config: PipelineConfig, 
                           document_paths: List[str]) -> Dict[str, Any]:
@@ -243,32 +547,32 @@ class TaskDispatcher:
         # Process in batches, adjusting workers based on resource usage
         batch_size = max(1, len(document_paths) // 4)  # Process in 4 batches
         current_workers = initial_workers
+        reduce_memory = self.max_memory_percentage - self.REDUCE_MEMORY_MARGIN
+        increase_memory = self.max_memory_percentage - self.INCREASE_MEMORY_MARGIN
+        run_adjustments = []
         
         for i in range(0, len(document_paths), batch_size):
             batch_paths = document_paths[i:i + batch_size]
             
             # Adjust workers based on current resource usage
             resources = self.resource_monitor.get_current_usage()
-            if resources["memory_percent"] > 70 or resources["cpu_percent"] > 80:
+            memory_percent = resources["system"]["memory_percent"]
+            cpu_percent = resources["system"]["cpu_percent"]
+            prev_workers = current_workers
+            if memory_percent > reduce_memory or cpu_percent > self.REDUCE_CPU_PERCENT:
                 current_workers = max(1, current_workers - 1)  # Reduce workers
-                results["adaptive_adjustments"].append({
-                    "timestamp": datetime.now().isoformat(),
-                    "action": "reduce_workers",
-                    "from": current_workers + 1,
-                    "to": current_workers
-                })
-            elif resources["memory_percent"] < 50 and resources["cpu_percent"] < 60:
+                action = "reduce_workers"
+            elif memory_percent < increase_memory and cpu_percent < self.INCREASE_CPU_PERCENT:
                 current_workers = min(self.max_workers, current_workers + 1)  # Increase workers
-                results["adaptive_adjustments"].append({
-                    "timestamp": datetime.now().isoformat(),
-                    "action": "increase_workers",
-                    "from": current_workers - 1,
-                    "to": current_workers
-                })
+                action = "increase_workers"
+            
+            # Only actual changes are recorded
+            if current_workers != prev_workers:
+                run_adjustments.append((time.time(), action, prev_workers, current_workers))
             
-            # Process batch with current worker count
+            # Process batch with current worker count, all batches share the long-lived thread pool
             batch_results = self.process_documents_parallel(
-                pipeline_config, batch_paths, max_workers=current_workers
+                pipeline_config, batch_paths, max_workers=current_workers, use_processes=False
             )
             
             # Aggregate results
@@ -278,8 +582,30 @@ class TaskDispatcher:
             results["errors"].extend(batch_results["errors"])
             results["processing_times"].update(batch_results["processing_times"])
         
+        self._adjustments.extend(run_adjustments)
+        results["adaptive_adjustments"] = self._format_adjustments(run_adjustments)
         return results
     
+    def get_adjustments(self) -> List[Dict[str, Any]]:
+        """
+        Get recent adaptive worker adjustments of this dispatcher
+        Returns:
+            List of adjustment records (oldest first)
+        """
+        return self._format_adjustments(list(self._adjustments))
+    
+    @staticmethod
+    def _format_adjustments(adjustments: List[Tuple[float, str, int, int]]) -> List[Dict[str, Any]]:
+        """
+        Convert (time.time(), action, from, to) adjustments to records
+        """
+        return [{
+            "timestamp": datetime.fromtimestamp(adjusted_at).isoformat(),
+            "action": action,
+            "from": prev_workers,
+            "to": workers
+        } for adjusted_at, action, prev_workers, workers in adjustments]
+    
     def process_with_priority(self, pipeline_config: PipelineConfig,
                             priority_documents: List[str],
                             normal_documents: List[str]) -> Dict[str, Any]:
@@ -328,14 +654,18 @@ class TaskDispatcher:
         """
         Get status of currently active tasks
         """
-        with self.dispatcher_lock:
-            active_tasks = {}
-            for task_id, future in self.active_tasks.items():
-                active_tasks[task_id] = {
-                    "done": future.done(),
-                    "cancelled": future.cancelled(),
-                    "running": not future.done() and not future.cancelled()
-                }
+        # Copying the dict is atomic, done callbacks may remove tasks meanwhile
+        snapshot = list(self.active_tasks.items())
+        
+        active_tasks = {}
+        for task_id, future in snapshot:
+            done = future.done()
+            cancelled = future.cancelled()
+            active_tasks[task_id] = {
+                "done": done,
+                "cancelled": cancelled,
+                "running": not done and not cancelled
+            }
         
         return {
             "active_task_count": len(active_tasks),
@@ -348,15 +678,76 @@ class TaskDispatcher:
         """
         Cancel all currently active tasks
         """
-        with self.dispatcher_lock:
-            cancelled_count = 0
-            for task_id, future in list(self.active_tasks.items()):
-                if not future.done():
-                    future.cancel()
-                    del self.active_tasks[task_id]
-                    cancelled_count += 1
+        # Cancelled futures leave active_tasks through their done callback,
+        # running ones cannot be cancelled and stay tracked
+        return sum(1 for future in list(self.active_tasks.values()) if future.cancel())
+    
+    def create_script_pool(self, script_codes: Dict[str, str], 
+                           max_workers: Optional[int] = None) -> ProcessPoolExecutor:
+        """
+        Create process pool with user scripts precompiled in every worker
+        Args:
+            script_codes: Mapping of script_id to validated script code
+            max_workers: Maximum number of worker processes (defaults to max_workers)
+        Returns:
+            ProcessPoolExecutor: Pool to pass to run_script
+        """
+        # Spawn avoids forking a process that already runs scheduler/UI threads
+        return ProcessPoolExecutor(
+            max_workers=max_workers or self.max_workers,
+            mp_context=get_context("spawn"),
+            initializer=_preload_scripts,
+            initargs=(script_codes,)
+        )
+    
+    def run_script(self, script_pool: ProcessPoolExecutor, script_id: str, 
+                   context: Dict[str, Any], timeout: Optional[int] = None) -> Any:
+        """
+        Execute preloaded user script in script pool
+        Args:
+            script_pool: Pool created by create_script_pool
+            script_id: Script identifier
+            context: Execution context (must be picklable)
+            timeout: Timeout in seconds (defaults to timeout_seconds)
+        Returns:
+            Any: Script execution result
+        Raises:
+            ScriptExecutionTimeout: If script times out (script_pool is terminated)
+            ScriptExecutionError: If script execution fails
+        """
+        from concurrent.futures import TimeoutError as FutureTimeoutError
+        from infrastructure.security.script_sandbox import ScriptExecutionError, ScriptExecutionTimeout
         
-        return cancelled_count
+        timeout = timeout or self.timeout_seconds
+        try:
+            future = script_pool.submit(_execute_preloaded_script, script_id, context)
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.terminate_script_pool(script_pool)
+            raise ScriptExecutionTimeout(
+                f"Script execution timed out after {timeout} seconds",
+                timeout_seconds=timeout
+            )
+        except Exception as e:
+            raise ScriptExecutionError(f"Script execution failed: {str(e)}")
+    
+    def terminate_script_pool(self, script_pool: ProcessPoolExecutor):
+        """
+        Stop script pool together with scripts still running in its workers
+        Args:
+            script_pool: Pool created by create_script_pool (unusable afterwards)
+        """
+        # Running futures cannot be cancelled, so their worker processes are terminated
+        processes = list((getattr(script_pool, "_processes", None) or {}).values())
+        script_pool.shutdown(wait=False, cancel_futures=True)
+        
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(timeout=2)
+            if process.is_alive():
+                process.kill()
     
     def set_max_workers(self, max_workers: int):
         """
@@ -366,6 +757,12 @@ class TaskDispatcher:
             raise ValueError("Max workers must be at least 1")
         
         self.max_workers = max_workers
+        
+        # Next thread-based batch creates a pool of the new size
+        with self._thread_pool_lock:
+            pool, self._thread_pool = self._thread_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
     
     def set_memory_limit_percentage(self, percentage: int):
         """
@@ -374,7 +771,7 @@ class TaskDispatcher:
         if not 1 <= percentage <= 100:
             raise ValueError("Memory limit percentage must be between 1 and 100")
         
-        self.max_memory_percentage = percentage
+        self.max_memory_percentage = percentage  # Adaptive memory thresholds follow this limit
     
     def set_timeout_seconds(self, seconds: int):
         """
@@ -9,6 +9,7 @@ from .enums import LogLevel
 # Document structure
 from .document import (
     DocumentFormat,
+    Block,
     Section,
     Page,
     Document
@@ -27,7 +28,9 @@ from .pipeline import (
     StepType,
     PipelineStepConfig,
     PipelineConfig,
-    PipelineRun
+    PipelineRun,
+    PipelineError,
+    RunProgress
 )
 
 # Script context
@@ -54,13 +57,13 @@ __all__ = [
     'LogLevel',
     
     # Document
-    'DocumentFormat', 'Section', 'Page', 'Document',
+    'DocumentFormat', 'Block', 'Section', 'Page', 'Document',
     
     # Chunk
     'ChunkType', 'Metadata', 'Chunk',
     
     # Pipeline
-    'PipelineStatus', 'StepType', 'PipelineStepConfig', 'PipelineConfig', 'PipelineRun',
+    'PipelineStatus', 'StepType', 'PipelineStepConfig', 'PipelineConfig', 'PipelineRun', 'PipelineError', 'RunProgress',
     
     # Script
     'UserScriptContext',
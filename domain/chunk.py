@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any, TYPE_CHECKING
 from uuid import uuid4
 from enum import Enum
 from datetime import datetime
+import sys
 
 # For avoiding circular imports when using type annotations
 if TYPE_CHECKING:
@@ -16,7 +17,14 @@ class ChunkType(Enum):
     CUSTOM = "custom"       # Custom fragment (after splitter)
     DOCUMENT = "document"   # Entire document
 
-@dataclass
+# ChunkType members by value (string chunk types are converted for every chunk created)
+_CHUNK_TYPE_BY_VALUE = {chunk_type.value: chunk_type for chunk_type in ChunkType}
+
+def _intern(value):
+    """Intern exact str values, other values (None, numbers from loose input) are returned as is"""
+    return sys.intern(value) if type(value) is str else value
+
+@dataclass(slots=True)
 class Metadata:
     """
     Contextual information about text chunk
@@ -56,13 +64,83 @@ class Metadata:
         
         # Convert string to ChunkType if string value is passed
         if isinstance(self.chunk_type, str):
-            try:
-                self.chunk_type = ChunkType(self.chunk_type)
-            except ValueError:
+            chunk_type = _CHUNK_TYPE_BY_VALUE.get(self.chunk_type)
+            if chunk_type is None:
                 raise ValueError(f"Invalid chunk_type value: {self.chunk_type}. "
-                               f"Valid values: {[t.value for t in ChunkType]}")
+                               f"Valid values: {list(_CHUNK_TYPE_BY_VALUE)}")
+            self.chunk_type = chunk_type
+        
+        # Share repeated values between chunks (interned strings are freed when no longer referenced)
+        self.document_id = _intern(self.document_id)
+        self.section_id = _intern(self.section_id)
+        self.section_title = _intern(self.section_title)
+        self.source_type = _intern(self.source_type)
+        self.pipeline_run_id = _intern(self.pipeline_run_id)
+    
+    @classmethod
+    def unchecked(cls, document_id: str, section_id: str, section_title: str, section_level: int,
+                  page_num: Optional[int] = None, line_num: Optional[int] = None,
+                  chunk_type: ChunkType = ChunkType.CUSTOM, pipeline_run_id: Optional[str] = None,
+                  source_type: str = "unknown") -> 'Metadata':
+        """Create metadata without validation (values copied from validated metadata, chunk_type as ChunkType)"""
+        meta = cls.__new__(cls)
+        meta.document_id = document_id
+        meta.section_id = section_id
+        meta.section_title = section_title
+        meta.section_level = section_level
+        meta.page_num = page_num
+        meta.line_num = line_num
+        meta.chunk_type = chunk_type
+        meta.pipeline_run_id = pipeline_run_id
+        meta.source_type = source_type
+        return meta
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize metadata to dictionary"""
+        return {
+            "document_id": self.document_id,
+            "page_num": self.page_num,
+            "section_id": self.section_id,
+            "section_title": self.section_title,
+            "section_level": self.section_level,
+            "line_num": self.line_num,
+            "chunk_type": self.chunk_type._value_,  # Plain attribute, .value is a descriptor call
+            "pipeline_run_id": self.pipeline_run_id,
+            "source_type": self.source_type
+        }
+
+class _SharedMetadata(Metadata):
+    """Read-only metadata shared by several chunks (Chunk.ensure_owned_meta swaps in a modifiable copy)"""
+    __slots__ = ()
+    
+    def __init__(self, **values):
+        template = Metadata(**values)  # Validated like regular metadata
+        for name in Metadata.__slots__:
+            object.__setattr__(self, name, getattr(template, name))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError("Shared placeholder metadata is read-only, use Chunk.ensure_owned_meta() to modify it")
+    
+    def __delattr__(self, name):
+        raise AttributeError("Shared placeholder metadata is read-only, use Chunk.ensure_owned_meta() to modify it")
+    
+    def __reduce__(self):
+        """Unpickle as the placeholder of the loading process"""
+        return "_DEFAULT_META"
+    
+    def copy(self) -> Metadata:
+        """Create modifiable copy"""
+        return Metadata.unchecked(**{name: getattr(self, name) for name in Metadata.__slots__})
 
-@dataclass
+# Placeholder metadata shared by chunks created without meta (copied before first mutation)
+_DEFAULT_META = _SharedMetadata(
+    document_id="temp_doc",
+    section_id="temp_section",
+    section_title="Temporary",
+    section_level=1
+)
+
+@dataclass(slots=True)
 class Chunk:
     """
     Logical text fragment with full context
@@ -72,29 +150,38 @@ class Chunk:
         meta: Metadata - Contextual information
         parent_id: Parent fragment ID (if exists)
         children: Child fragments (result of splitting)
-        extraction_results: Data extraction results
+        extraction_results: Data extraction results (None until something is extracted)
     """
-    id: str = field(default_factory=lambda: str(uuid4()))
+    id: str = field(default_factory=lambda: uuid4().hex)
     text: str = ""
-    meta: Metadata = field(default_factory=lambda: Metadata(
-        document_id="temp_doc",
-        section_id="temp_section",
-        section_title="Temporary",
-        section_level=1
-    ))
+    meta: Metadata = None  # Shared placeholder if not given, see ensure_owned_meta()
     parent_id: Optional[str] = None
     children: List['Chunk'] = field(default_factory=list)
-    extraction_results: Dict[str, Any] = field(default_factory=dict)
+    extraction_results: Optional[Dict[str, Any]] = None  # Allocated on first result only
     
     def __post_init__(self):
         """Additional validation after initialization"""
-        if isinstance(self.meta, dict):
+        if self.meta is None:
+            self.meta = _DEFAULT_META
+        elif isinstance(self.meta, dict):
             # If meta is passed as dict, convert to Metadata object
             try:
                 self.meta = Metadata(**self.meta)
             except TypeError as e:
                 raise ValueError(f"Error creating Metadata from dict: {e}")
     
+    def ensure_owned_meta(self) -> Metadata:
+        """Return metadata safe to modify in place (shared placeholder is copied first)"""
+        if self.meta is _DEFAULT_META:
+            self.meta = _DEFAULT_META.copy()
+        return self.meta
+    
+    def add_extraction_result(self, key: str, value: Any):
+        """Store extraction result, allocating results dictionary on first write"""
+        if self.extraction_results is None:
+            self.extraction_results = {}
+        self.extraction_results[key] = value
+    
     def add_child(self, child: 'Chunk'):
         """Add child fragment"""
         if child.parent_id and child.parent_id != self.id:
@@ -102,63 +189,68 @@ class Chunk:
         child.parent_id = self.id
         self.children.append(child)
     
+    def set_children(self, children: List['Chunk']):
+        """Replace child fragments with given list (list is taken over, not copied)"""
+        self_id = self.id
+        for child in children:
+            if child.parent_id and child.parent_id != self_id:
+                raise ValueError(f"Parent ID mismatch: expected {self_id}, got {child.parent_id}")
+        for child in children:
+            child.parent_id = self_id
+        self.children = children
+    
     def has_children(self) -> bool:
         """Check if there are child fragments"""
         return len(self.children) > 0
     
     def get_all_descendants(self) -> List['Chunk']:
-        """Return all descendants (recursively)"""
-        result = self.children.copy()
-        for child in self.children:
-            result.extend(child.get_all_descendants())
+        """Return all descendants (children first, then descendants of each child)"""
+        result = []
+        stack = [self]
+        # Bound methods looked up once for wide trees
+        extend_result = result.extend
+        push = stack.extend
+        pop = stack.pop
+        while stack:
+            children = pop().children
+            if children:
+                extend_result(children)
+                push(reversed(children))
         return result
     
     def to_dict(self) -> Dict[str, Any]:
-        """Serialize fragment to dictionary"""
-        # For display purposes in serialization, truncate text to 50 chars + ...
-        truncated_text = self.text
-        if len(self.text) > 50:
-            truncated_text = self.text[:50] + "..."
-        
+        """Serialize fragment to dictionary (full text, display code truncates it)"""
         return {
             "id": self.id,
-            "text": truncated_text,  # Truncated for display
-            "original_text": self.text,  # Store original for deserialization
-            "metadata": {
-                "document_id": self.meta.document_id,
-                "page_num": self.meta.page_num,
-                "section_id": self.meta.section_id,
-                "section_title": self.meta.section_title,
-                "section_level": self.meta.section_level,
-                "line_num": self.meta.line_num,
-                "chunk_type": self.meta.chunk_type.value,
-                "pipeline_run_id": self.meta.pipeline_run_id,
-                "source_type": self.meta.source_type
-            },
+            "text": self.text,
+            "metadata": self.meta.to_dict(),
             "parent_id": self.parent_id,
             "children_count": len(self.children),
-            "extraction_count": len(self.extraction_results),  # Add the field expected by test
-            "extraction_results": self.extraction_results  # Include extraction results
+            "extraction_count": len(self.extraction_results) if self.extraction_results else 0,  # Add the field expected by test
+            "extraction_results": self.extraction_results or {}  # Include extraction results
         }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any], parent_id: Optional[str] = None) -> 'Chunk':
-        """Create fragment from dictionary"""
-        # Process metadata
-        metadata_data = data.get("metadata", {})
-        if not metadata_data:
-            # Try to find metadata in other places
-            metadata_data = {
-                "document_id": data.get("document_id", "unknown_doc"),
-                "section_id": data.get("section_id", "unknown_section"),
-                "section_title": data.get("section_title", "Unknown"),
-                "section_level": data.get("section_level", 1),
-                "page_num": data.get("page_num"),
-                "line_num": data.get("line_num"),
-                "chunk_type": data.get("chunk_type", "custom"),
-                "pipeline_run_id": data.get("pipeline_run_id"),
-                "source_type": data.get("source_type", "unknown")
-            }
+        """Create fragment with its child fragments from dictionary (no recursion, deep trees are safe)"""
+        root = cls._from_dict_node(data, parent_id)
+        
+        stack = [(root, data)]
+        while stack:
+            chunk, chunk_data = stack.pop()
+            children_data = chunk_data.get("children")
+            if children_data:
+                # parent_id is set on construction, add_child check not needed
+                chunk.children = children = [cls._from_dict_node(child_data, chunk.id) for child_data in children_data]
+                stack.extend(zip(children, children_data))
+        
+        return root
+    
+    @classmethod
+    def _from_dict_node(cls, data: Dict[str, Any], parent_id: Optional[str]) -> 'Chunk':
+        """Create single fragment from dictionary (children are not restored)"""
+        # Process metadata (flat dictionaries keep metadata fields at top level)
+        metadata_data = data.get("metadata") or data
         
         # Create Metadata object
         metadata = Metadata(
@@ -168,41 +260,28 @@ class Chunk:
             section_level=int(metadata_data.get("section_level", 1)),
             page_num=int(metadata_data["page_num"]) if metadata_data.get("page_num") is not None else None,
             line_num=int(metadata_data["line_num"]) if metadata_data.get("line_num") is not None else None,
-            chunk_type=ChunkType(metadata_data.get("chunk_type", "custom")),
+            chunk_type=metadata_data.get("chunk_type", "custom"),  # Converted by Metadata
             pipeline_run_id=metadata_data.get("pipeline_run_id"),
             source_type=metadata_data.get("source_type", "unknown")
         )
         
-        # Use original text if available, otherwise use the (possibly truncated) text field
-        original_text = data.get("original_text", data.get("text", ""))
+        # Dictionaries of earlier versions hold the full text in original_text (text was truncated)
+        text = data.get("original_text", data.get("text", ""))
         
         # Create fragment
-        chunk = cls(
-            id=data.get("id", str(uuid4())),
-            text=original_text,  # Use original text
+        return cls(
+            id=data["id"] if "id" in data else uuid4().hex,  # No uuid generated for stored ids
+            text=text,
             meta=metadata,
             parent_id=parent_id or data.get("parent_id"),
-            extraction_results=data.get("extraction_results", {})  # Include extraction results
+            extraction_results=data.get("extraction_results") or None  # Include extraction results
         )
-        
-        # Recursively create child fragments
-        children_data = data.get("children", [])
-        for child_data in children_data:
-            child = cls.from_dict(child_data, parent_id=chunk.id)
-            chunk.add_child(child)
-        
-        return chunk
     
     def __str__(self) -> str:
         """Human-readable representation of fragment"""
-        # Truncate section title to exactly 20 characters if longer
-        truncated_section = self.meta.section_title
-        if len(self.meta.section_title) > 20:
-            truncated_section = self.meta.section_title[:20]
-        
-        return (f"Chunk(id={self.id[:8]}, type={self.meta.chunk_type.value}, "
-                f"page={self.meta.page_num or 'N/A'}, section={truncated_section})")
+        meta = self.meta
+        # Section title truncated to 20 characters (slicing a shorter string returns it without copying)
+        return (f"Chunk(id={self.id[:8]}, type={meta.chunk_type._value_}, "
+                f"page={meta.page_num or 'N/A'}, section={meta.section_title[:20]})")
     
-    def __repr__(self) -> str:
-        """Detailed representation for debugging"""
-        return self.__str__()
\ No newline at end of file
+    __repr__ = __str__  # Detailed representation for debugging, same text without an extra call
\ No newline at end of file
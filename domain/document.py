@@ -1,6 +1,10 @@
 ﻿from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+import bisect
+import itertools
+import os
+import time
 import uuid
 from enum import Enum
 
@@ -9,6 +13,34 @@ from .chunk import Chunk, Metadata, ChunkType
 from .pipeline import PipelineConfig, PipelineRun, PipelineStatus, StepType  
 from .enums import LogLevel  
 
+# Section and page ID counters, IDs are prefixed with a random token of the process
+# so they stay unique across worker processes and restarts (IDs are exported with chunk metadata)
+_section_counter = itertools.count(1)
+_page_counter = itertools.count(1)
+_id_token = uuid.uuid4().hex[:8]
+
+def _renew_id_token():
+    """Give forked child process its own ID token (counters continue from the parent)"""
+    global _id_token
+    _id_token = uuid.uuid4().hex[:8]
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_renew_id_token)
+
+# Creation timestamp shared by documents created within the same interval: (monotonic, datetime, ISO string)
+_TIMESTAMP_INTERVAL = 0.1
+_timestamp_cache = (float("-inf"), None, "")
+
+def _now_cached() -> tuple:
+    """Return (datetime, ISO string) of current time, refreshed at most every _TIMESTAMP_INTERVAL seconds"""
+    global _timestamp_cache
+    cached = _timestamp_cache
+    now = time.monotonic()
+    if now - cached[0] >= _TIMESTAMP_INTERVAL:
+        timestamp = datetime.now()
+        cached = _timestamp_cache = (now, timestamp, timestamp.isoformat())
+    return cached[1], cached[2]
+
 class DocumentFormat(Enum):
     """Supported document formats"""
     PDF = "pdf"
@@ -17,14 +49,27 @@ class DocumentFormat(Enum):
     HTML = "html"
     UNKNOWN = "unknown"
 
-@dataclass
+@dataclass(slots=True)
+class Block:
+    """
+    Structured content block of a page (paragraph or styled text)
+    """
+    text: str
+    type: str = "paragraph"
+    style: str = ""
+    line_number: Optional[int] = None
+    font_size: Optional[float] = None
+    font_flags: Optional[int] = None
+    all_spans: Optional[List[Dict[str, Any]]] = None  # Text spans forming the block (multiline headers)
+
+@dataclass(slots=True)
 class Section:
     """
     Document section with hierarchical structure
     """
     title: str
     level: int
-    id: str = field(default_factory=lambda: f"sec_{str(uuid.uuid4())[:8]}")
+    id: str = field(default_factory=lambda: f"sec_{_id_token}{next(_section_counter):08x}")
     start_page: int = 1
     end_page: int = 1
     parent_id: Optional[str] = None
@@ -38,16 +83,16 @@ class Section:
         if self.start_page > self.end_page:
             raise ValueError("Start page cannot be greater than end page")
 
-@dataclass
+@dataclass(slots=True)
 class Page:
     """
     Document page with content and blocks
     """
     number: int
     raw_text: str = ""
-    id: str = field(default_factory=lambda: f"page_{str(uuid.uuid4())[:8]}")
+    id: str = field(default_factory=lambda: f"page_{_id_token}{next(_page_counter):08x}")
     sections: List[Section] = field(default_factory=list)
-    blocks: List[Dict[str, Any]] = field(default_factory=list)  # Structured content blocks
+    blocks: List[Block] = field(default_factory=list)  # Structured content blocks
     meta: Dict[str, Any] = field(default_factory=dict)
     
     def __post_init__(self):
@@ -58,38 +103,64 @@ class Document:
     """
     Main document entity with pages and sections
     """
+    __slots__ = (
+        "id", "path", "format", "title", "author", "created_at", "_created_at_cached",
+        "pages", "sections", "meta", "_page_numbers", "_sections_by_id", "_sections_by_parent",
+        "_section_intervals", "_max_section_span", "_page_previews"
+    )
+    
     def __init__(self, path: str, format: DocumentFormat = DocumentFormat.UNKNOWN):
-        self.id = str(uuid.uuid4())
+        self.id = uuid.uuid4().hex
         self.path = path
         self.format = format
         self.title = ""
         self.author = ""
-        self.created_at = datetime.now()
+        self._created_at_cached = _now_cached()  # (datetime, ISO string), to_dict reuses the string
+        self.created_at = self._created_at_cached[0]
         self.pages: List[Page] = []
         self.sections: List[Section] = []
         self.meta: Dict[str, Any] = {}
+        
+        # Indexes maintained by add_page/add_section (pages and sections are only added through them)
+        self._page_numbers: set = set()
+        self._sections_by_id: Dict[str, Section] = {}
+        self._sections_by_parent: Dict[Optional[str], List[Section]] = {}
+        # (start_page, insertion order, section) sorted by start page, page range is fixed once added
+        self._section_intervals: List[Tuple[int, int, Section]] = []
+        self._max_section_span = 0
+        self._page_previews: Optional[List[str]] = None  # Raw text previews of to_dict, reset by add_page
     
     def add_page(self, page: Page):
-        """Add page to document"""
-        if any(p.number == page.number for p in self.pages):
+        """Add page to document (pages stay sorted by number)"""
+        if page.number in self._page_numbers:
             raise ValueError(f"Page with number {page.number} already exists")
-        self.pages.append(page)
-        self.pages.sort(key=lambda p: p.number)
+        self._page_numbers.add(page.number)
+        bisect.insort(self.pages, page, key=lambda p: p.number)
+        self._page_previews = None
     
     def add_section(self, section: Section):
         """Add section to document"""
-        if any(s.id == section.id for s in self.sections):
+        if section.id in self._sections_by_id:
             raise ValueError(f"Section with ID {section.id} already exists")
+        self._sections_by_id[section.id] = section
+        self._sections_by_parent.setdefault(section.parent_id, []).append(section)
+        bisect.insort(self._section_intervals, (section.start_page, len(self.sections), section))
+        self._max_section_span = max(self._max_section_span, section.end_page - section.start_page)
         self.sections.append(section)
     
     def get_section_by_id(self, section_id: str) -> Optional[Section]:
         """Get section by ID"""
-        return next((s for s in self.sections if s.id == section_id), None)
+        return self._sections_by_id.get(section_id)
     
     def get_sections_for_page(self, page_num: int) -> List[Section]:
-        """Get all sections on specified page"""
-        return [s for s in self.sections 
-                if s.start_page <= page_num <= s.end_page]
+        """Get all sections on specified page (in order of addition)"""
+        # Only sections starting within the longest section span before the page can cover it
+        intervals = self._section_intervals
+        lo = bisect.bisect_left(intervals, (page_num - self._max_section_span,))
+        hi = bisect.bisect_right(intervals, (page_num, float("inf")))
+        candidates = [interval for interval in intervals[lo:hi] if interval[2].end_page >= page_num]
+        candidates.sort(key=lambda interval: interval[1])
+        return [interval[2] for interval in candidates]
     
     def get_parent_section(self, section_id: str) -> Optional[Section]:
         """Get parent section"""
@@ -99,31 +170,43 @@ class Document:
         return self.get_section_by_id(section.parent_id)
     
     def get_all_child_sections(self, section_id: str) -> List[Section]:
-        """Get all child sections (recursively)"""
-        children = [s for s in self.sections if s.parent_id == section_id]
-        result = children.copy()
-        for child in children:
-            result.extend(self.get_all_child_sections(child.id))
+        """Get all child sections (children first, then child sections of each child)"""
+        result = []
+        stack = [section_id]
+        while stack:
+            children = self._sections_by_parent.get(stack.pop(), [])
+            result.extend(children)
+            stack.extend(child.id for child in reversed(children))
         return result
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary representation"""
+        """Convert to dictionary representation (raw text previews are reused until next add_page)"""
+        if self._page_previews is None:
+            self._page_previews = [
+                p.raw_text[:100] + "..." if len(p.raw_text) > 100 else p.raw_text
+                for p in self.pages
+            ]
+        
+        created_at, created_at_iso = self._created_at_cached
+        if created_at is not self.created_at:  # Reassigned after creation
+            created_at_iso = self.created_at.isoformat()
+        
         return {
             "id": self.id,
             "path": self.path,
             "format": self.format.value,
             "title": self.title,
             "author": self.author,
-            "created_at": self.created_at.isoformat(),
+            "created_at": created_at_iso,
             "page_count": len(self.pages),
             "section_count": len(self.sections),
             "pages": [
                 {
                     "number": p.number,
-                    "raw_text_preview": p.raw_text[:100] + "..." if len(p.raw_text) > 100 else p.raw_text,
+                    "raw_text_preview": preview,
                     "section_count": len(p.sections),
                     "block_count": len(p.blocks)
                 }
-                for p in self.pages
+                for p, preview in zip(self.pages, self._page_previews)
             ]
         }
\ No newline at end of file
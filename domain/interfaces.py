@@ -263,7 +263,7 @@ class ILogger(ABC):
         pass
     
     @abstractmethod
-    def log_message(self, level: LogLevel, message: str, 
+    def log_message(self, level: LogLevel, message: str, *args,
                    pipeline_id: Optional[str] = None,
                    pipeline_run_id: Optional[str] = None,
                    document_path: Optional[str] = None,
@@ -272,7 +272,8 @@ class ILogger(ABC):
         Log general message
         Args:
             level: Log level
-            message: Log message
+            message: Log message, %-format string when args are given
+            args: Format arguments
             pipeline_id: Associated pipeline ID
             pipeline_run_id: Associated run ID
             document_path: Associated document path
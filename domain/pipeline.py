@@ -1,7 +1,10 @@
-﻿from dataclasses import dataclass, field
+﻿from dataclasses import dataclass, field, asdict
 from typing import List, Dict, Any, Optional
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import lru_cache
+import re
+import time
 import uuid
 
 class PipelineStatus(Enum):
@@ -27,8 +30,49 @@ class StepType(Enum):
     FILE_EXPORTER = "file_exporter"
     JSON_EXPORTER = "json_exporter"
     METADATA_PROPAGATOR = "metadata_propagator"
+    
+    @classmethod
+    def from_value(cls, value: str) -> 'StepType':
+        """Get step type by value (dict lookup, same ValueError as StepType(value))"""
+        step_type = _STEP_TYPE_BY_VALUE.get(value)
+        if step_type is None:
+            raise ValueError(f"{value!r} is not a valid {cls.__name__}")
+        return step_type
+
+# StepType members by value (step types are converted for every step of every loaded configuration)
+_STEP_TYPE_BY_VALUE = {step_type.value: step_type for step_type in StepType}
+
+# Cron field item: "*", value or range, optionally with step ("*/2", "1-5", "10/15")
+_CRON_ITEM_RE = re.compile(r"(?:\*|(\d+)(?:-(\d+))?)(?:/(\d+))?")
+
+# Allowed values of minute, hour, day of month, month and day of week (0 and 7 = Sunday) fields
+_CRON_RANGES = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+
+@lru_cache(maxsize=512)
+def _is_valid_cron_expr(cron_expr: str) -> bool:
+    """Validate 5-field cron expression (lists of values, ranges and steps), schedules repeat so results are cached"""
+    parts = cron_expr.split()
+    if len(parts) != len(_CRON_RANGES):
+        return False
+    
+    for part, (min_val, max_val) in zip(parts, _CRON_RANGES):
+        for item in part.split(","):
+            match = _CRON_ITEM_RE.fullmatch(item)
+            if not match:
+                return False
+            
+            start, end, step = match.groups()
+            if step is not None and int(step) == 0:
+                return False
+            if start is not None:
+                start = int(start)
+                end = int(end) if end is not None else start
+                if not min_val <= start <= end <= max_val:
+                    return False
+    
+    return True
 
-@dataclass
+@dataclass(slots=True)
 class PipelineStepConfig:
     """
     Pipeline step configuration
@@ -46,7 +90,7 @@ class PipelineStepConfig:
         if self.input_step_id and self.depends_on:
             raise ValueError("Cannot specify both input_step_id and depends_on")
 
-@dataclass
+@dataclass(slots=True)
 class PipelineConfig:
     """
     ETL pipeline configuration
@@ -61,6 +105,8 @@ class PipelineConfig:
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     version: int = 1
+    max_concurrent_runs: int = 1  # Simultaneous runs allowed for this pipeline
+    execution_levels: List[List[str]] = field(default_factory=list)  # Step IDs grouped by dependency level
     
     def validate(self):
         """Validate configuration"""
@@ -73,73 +119,13 @@ class PipelineConfig:
         # Validate cron schedule
         if self.schedule and not self._is_valid_cron(self.schedule):
             raise ValueError(f"Invalid cron schedule format: {self.schedule}")
+        
+        if self.max_concurrent_runs < 1:
+            raise ValueError("max_concurrent_runs must be at least 1")
     
     def _is_valid_cron(self, cron_expr: str) -> bool:
         """Validate cron expression (simplified version)"""
-        parts = cron_expr.strip().split()
-        if len(parts) != 5:
-            return False
-        
-        # Validate minutes (0-59)
-        if not self._is_valid_cron_part(parts[0], 0, 59):
-            return False
-        
-        # Validate hours (0-23)
-        if not self._is_valid_cron_part(parts[1], 0, 23):
-            return False
-        
-        # Validate day of month (1-31)
-        if not self._is_valid_cron_part(parts[2], 1, 31):
-            return False
-        
-        # Validate month (1-12)
-        if not self._is_valid_cron_part(parts[3], 1, 12):
-            return False
-        
-        # Validate day of week (0-7, where 0 and 7 = Sunday)
-        if not self._is_valid_cron_part(parts[4], 0, 7):
-            return False
-        
-        return True
-    
-    def _is_valid_cron_part(self, part: str, min_val: int, max_val: int) -> bool:
-        """Validate cron expression part"""
-        if part == "*":
-            return True
-        
-        # Validate ranges (e.g., 1-5)
-        if "-" in part:
-            try:
-                start, end = map(int, part.split("-"))
-                return min_val <= start <= end <= max_val
-            except ValueError:
-                return False
-        
-        # Validate lists (e.g., 1,3,5)
-        if "," in part:
-            try:
-                values = [int(v) for v in part.split(",")]
-                return all(min_val <= v <= max_val for v in values)
-            except ValueError:
-                return False
-        
-        # Validate steps (e.g., */2)
-        if "/" in part:
-            base, step = part.split("/")
-            if base != "*" and not self._is_valid_cron_part(base, min_val, max_val):
-                return False
-            try:
-                step_val = int(step)
-                return step_val > 0
-            except ValueError:
-                return False
-        
-        # Validate single value
-        try:
-            val = int(part)
-            return min_val <= val <= max_val
-        except ValueError:
-            return False
+        return _is_valid_cron_expr(cron_expr)
     
     def to_dict(self) -> Dict[str, Any]:
         """Serialize configuration to dictionary"""
@@ -160,7 +146,9 @@ class PipelineConfig:
             "target_config": self.target_config,
             "created_at": self.created_at.isoformat(),
             "updated_at": self.updated_at.isoformat(),
-            "version": self.version
+            "version": self.version,
+            "max_concurrent_runs": self.max_concurrent_runs,
+            "execution_levels": self.execution_levels
         }
     
     @classmethod
@@ -172,7 +160,9 @@ class PipelineConfig:
             schedule=data.get("schedule", ""),
             source_config=data.get("source_config", {}),
             target_config=data.get("target_config", {}),
-            version=data.get("version", 1)
+            version=data.get("version", 1),
+            max_concurrent_runs=data.get("max_concurrent_runs", 1),
+            execution_levels=data.get("execution_levels", [])
         )
         
         # Restore ID if exists
@@ -182,7 +172,7 @@ class PipelineConfig:
         # Restore steps
         for step_data in data.get("steps", []):
             step = PipelineStepConfig(
-                type=StepType(step_data["type"]),
+                type=StepType.from_value(step_data["type"]),
                 id=step_data.get("id", f"step_{str(uuid.uuid4())[:8]}"),
                 name=step_data.get("name", ""),
                 params=step_data.get("params", {}),
@@ -193,13 +183,45 @@ class PipelineConfig:
         
         return config
 
-@dataclass
+@dataclass(slots=True)
+class PipelineError:
+    """
+    Error recorded during pipeline run (timestamp is added when materialized)
+    """
+    error_type: str
+    error_message: str
+    stage: Optional[str] = None
+    step_id: Optional[str] = None
+    document_path: Optional[str] = None
+    document_paths: Optional[List[str]] = None
+    recorded_at: float = field(default_factory=time.monotonic)  # time.monotonic() when recorded
+    
+    @classmethod
+    def from_exception(cls, error: Exception, **fields) -> 'PipelineError':
+        """Create error record from exception"""
+        return cls(type(error).__name__, str(error), **fields)
+    
+    def to_dict(self, timestamp: str) -> Dict[str, Any]:
+        """Serialize error to dictionary (unset fields are omitted)"""
+        data = {"timestamp": timestamp, "error_type": self.error_type, "error_message": self.error_message}
+        if self.stage is not None:
+            data["stage"] = self.stage
+        if self.step_id is not None:
+            data["step_id"] = self.step_id
+        if self.document_path is not None:
+            data["document_path"] = self.document_path
+        if self.document_paths is not None:
+            data["document_paths"] = self.document_paths
+        return data
+
+@dataclass(slots=True)
 class PipelineRun:
     """
     Pipeline execution instance
     """
     id: str = field(default_factory=lambda: f"run_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{str(uuid.uuid4())[:8]}")
     pipeline_id: str = ""
+    pipeline_name: str = ""  # Name of pipeline configuration at run start
     start_time: datetime = field(default_factory=datetime.now)
     end_time: Optional[datetime] = None
     status: PipelineStatus = PipelineStatus.PENDING
@@ -209,6 +231,8 @@ class PipelineRun:
     error_count: int = 0
     errors: List[Dict[str, Any]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
+    errors_raw: List[PipelineError] = field(default_factory=list)  # Recorded errors not yet timestamped
+    start_monotonic: float = field(default_factory=time.monotonic)
     
     def complete(self, status: Optional[PipelineStatus] = None):
         """Complete pipeline execution"""
@@ -227,6 +251,19 @@ class PipelineRun:
             "traceback": traceback
         })
     
+    def record_error(self, error: PipelineError):
+        """Record error, timestamp is formatted on materialize_errors()"""
+        self.errors_raw.append(error)
+    
+    def materialize_errors(self) -> List[Dict[str, Any]]:
+        """Move recorded errors into errors list with ISO timestamps"""
+        if self.errors_raw:
+            for error in self.errors_raw:
+                timestamp = self.start_time + timedelta(seconds=error.recorded_at - self.start_monotonic)
+                self.errors.append(error.to_dict(timestamp.isoformat()))
+            self.errors_raw.clear()
+        return self.errors
+    
     def to_dict(self) -> Dict[str, Any]:
         """Serialize run to dictionary"""
         return {
@@ -239,6 +276,21 @@ class PipelineRun:
             "processed_count": self.processed_count,
             "success_count": self.success_count,
             "error_count": self.error_count,
-            "error_count": len(self.errors),  
-            "metadata": self.meta
-        }
\ No newline at end of file
+            "metadata": self.metadata
+        }
+
+@dataclass(slots=True)
+class RunProgress:
+    """
+    Execution progress snapshot of a pipeline run
+    """
+    processed: int
+    successful: int
+    failed: int
+    total: int
+    percentage: float
+    elapsed_time: float
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize progress to dictionary"""
+        return asdict(self)
@@ -4,7 +4,7 @@ from uuid import uuid4
 from datetime import datetime  
 from .chunk import Chunk, Metadata, ChunkType
 
-@dataclass
+@dataclass(slots=True)
 class UserScriptContext:
     """
     Context for user script execution
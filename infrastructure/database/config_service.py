@@ -24,6 +24,20 @@ class ConfigService:
     Service for managing pipeline configurations and settings
     """
     
+    _SAVE_PIPELINE_QUERY = """
+        INSERT OR REPLACE INTO pipelines 
+        (id, name, description, config_json, schedule, source_config, target_config, version, created_at, updated_at, is_active)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+    """
+    
+    _SAVE_DB_CONNECTION_QUERY = """
+        INSERT OR REPLACE INTO db_connections 
+        (id, name, type, config_json, created_at, updated_at, is_active)
+        VALUES (?, ?, ?, ?, ?, ?, 1)
+    """
+    
+    STATISTICS_RUN_WINDOW = 100  # Most recent runs included in pipeline statistics
+    
     def __init__(self, db: UnifiedDatabase):
         self.db = db
     
@@ -35,15 +49,29 @@ class ConfigService:
         Returns:
             str: Pipeline ID
         """
-        pipeline_id = config.id or f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
-        
-        query = """
-            INSERT OR REPLACE INTO pipelines 
-            (id, name, description, config_json, schedule, source_config, target_config, version, created_at, updated_at, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 1)
+        params = self._pipeline_params(config)
+        self.db.execute_update(self._SAVE_PIPELINE_QUERY, params)
+        return params[0]
+    
+    def save_pipeline_configs(self, configs: List[PipelineConfig]) -> List[str]:
         """
-        
-        params = (
+        Save multiple pipeline configurations in one transaction
+        Args:
+            configs: Pipeline configurations to save
+        Returns:
+            List[str]: Pipeline IDs in order of configs
+        """
+        params_list = [self._pipeline_params(config) for config in configs]
+        if params_list:
+            self.db.execute_many(self._SAVE_PIPELINE_QUERY, params_list)
+        return [params[0] for params in params_list]
+    
+    def _pipeline_params(self, config: PipelineConfig) -> tuple:
+        """
+        Build row parameters of _SAVE_PIPELINE_QUERY (pipeline ID first)
+        """
+        pipeline_id = config.id or f"pipeline_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
+        return (
             pipeline_id,
             config.name,
             config.description,
@@ -55,9 +83,6 @@ class ConfigService:
             config.created_at.isoformat() if hasattr(config, 'created_at') else datetime.now().isoformat(),
             config.updated_at.isoformat() if hasattr(config, 'updated_at') else datetime.now().isoformat()
         )
-        
-        self.db.execute_update(query, params)
-        return pipeline_id
     
     def load_pipeline_config(self, pipeline_id: str) -> Optional[PipelineConfig]:
         """
@@ -73,8 +98,39 @@ class ConfigService:
         if not results:
             return None
         
-        row = results[0]
+        return self._row_to_config(results[0])
+    
+    def load_pipeline_configs(self, pipeline_ids: List[str]) -> Dict[str, PipelineConfig]:
+        """
+        Load several pipeline configurations with a single query
+        Args:
+            pipeline_ids: Pipeline identifiers
+        Returns:
+            Dict mapping pipeline_id to configuration (missing or unreadable ones are absent)
+        """
+        unique_ids = list(dict.fromkeys(pipeline_ids))
+        if not unique_ids:
+            return {}
+        
+        placeholders = ",".join("?" * len(unique_ids))
+        query = f"SELECT * FROM pipelines WHERE id IN ({placeholders}) AND is_active = 1"
+        results = self.db.execute_query(query, tuple(unique_ids))
         
+        configs = {}
+        for row in results:
+            config = self._row_to_config(row)
+            if config is not None:
+                configs[row["id"]] = config
+        return configs
+    
+    def _row_to_config(self, row: Dict[str, Any]) -> Optional[PipelineConfig]:
+        """
+        Build pipeline configuration from row of pipelines table
+        Args:
+            row: Row of pipelines table
+        Returns:
+            PipelineConfig: Configuration or None if row cannot be parsed
+        """
         try:
             # Parse configuration from JSON
             config_data = json.loads(row["config_json"])
@@ -83,7 +139,7 @@ class ConfigService:
             steps = []
             for step_data in config_data.get("steps", []):
                 step = PipelineStepConfig(
-                    type=StepType(step_data["type"]),
+                    type=StepType.from_value(step_data["type"]),
                     id=step_data.get("id", f"step_{secrets.token_hex(4)}"),
                     name=step_data.get("name", ""),
                     params=step_data.get("params", {}),
@@ -100,7 +156,9 @@ class ConfigService:
                 schedule=row.get("schedule", ""),
                 source_config=json.loads(row["source_config"]) if row.get("source_config") else {},
                 target_config=json.loads(row["target_config"]) if row.get("target_config") else {},
-                version=row.get("version", 1)
+                version=row.get("version", 1),
+                max_concurrent_runs=config_data.get("max_concurrent_runs", 1),
+                execution_levels=config_data.get("execution_levels", [])
             )
             
             return config
@@ -138,6 +196,25 @@ class ConfigService:
         rows_affected = self.db.execute_update(query, params)
         return rows_affected > 0
     
+    def update_execution_levels(self, pipeline_id: str, execution_levels: List[List[str]]) -> bool:
+        """
+        Store execution levels of pipeline configuration without marking it as edited
+        Args:
+            pipeline_id: Pipeline identifier
+            execution_levels: Step IDs grouped by dependency level
+        Returns:
+            bool: True if updated successfully
+        """
+        # Levels are derived from the steps, other fields, version and updated_at stay unchanged
+        query = """
+            UPDATE pipelines 
+            SET config_json=json_set(config_json, '$.execution_levels', json(?))
+            WHERE id=? AND is_active=1
+        """
+        
+        rows_affected = self.db.execute_update(query, (json.dumps(execution_levels), pipeline_id))
+        return rows_affected > 0
+    
     def delete_pipeline_config(self, pipeline_id: str) -> bool:
         """
         Delete pipeline configuration (soft delete)
@@ -184,28 +261,36 @@ class ConfigService:
         
         row = results[0]
         
-        # Get run history for this pipeline
+        # Aggregate the last runs in SQL instead of loading them (duration is NULL for unfinished runs)
+        stats_query = """
+            SELECT LOWER(status) AS status, COUNT(*) AS run_count,
+                   COUNT(duration) AS finished_count, SUM(duration) AS total_duration
+            FROM (
+                SELECT status, (julianday(end_time) - julianday(start_time)) * 86400 AS duration
+                FROM pipeline_runs
+                WHERE pipeline_id = ?
+                ORDER BY start_time DESC
+                LIMIT ?
+            )
+            GROUP BY LOWER(status)
+        """
+        status_rows = self.db.execute_query(stats_query, (pipeline_id, self.STATISTICS_RUN_WINDOW))
+        finished_count = sum(status_row["finished_count"] for status_row in status_rows)
+        total_duration = sum(status_row["total_duration"] or 0.0 for status_row in status_rows)
+        
+        # Get last runs for this pipeline
         from .logging_service import LoggingService
         logging_service = LoggingService(self.db)
-        run_history = logging_service.get_run_history(pipeline_id, limit=100)
+        recent_runs = logging_service.get_run_history(pipeline_id, limit=10)
         
         return {
             "pipeline_info": row,
-            "run_count": len(run_history),
-            "recent_runs": run_history[:10],  # Last 10 runs
-            "status_distribution": self._calculate_status_distribution(run_history)
+            "run_count": sum(status_row["run_count"] for status_row in status_rows),
+            "recent_runs": recent_runs,  # Last 10 runs
+            "status_distribution": {status_row["status"]: status_row["run_count"] for status_row in status_rows},
+            "average_duration": total_duration / finished_count if finished_count else None  # Seconds
         }
     
-    def _calculate_status_distribution(self, run_history: List[Dict[str, Any]]) -> Dict[str, int]:
-        """
-        Calculate distribution of run statuses
-        """
-        status_counts = {}
-        for run in run_history:
-            status = run.get("status", "UNKNOWN").lower()
-            status_counts[status] = status_counts.get(status, 0) + 1
-        return status_counts
-    
     def get_pipeline_name(self, pipeline_id: str) -> str:
         """
         Get pipeline name by ID
@@ -227,28 +312,43 @@ class ConfigService:
         Returns:
             bool: True if saved successfully
         """
-        connection_id = config.get("id", f"conn_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}")
-        
-        query = """
-            INSERT OR REPLACE INTO db_connections 
-            (id, name, type, config_json, created_at, updated_at, is_active)
-            VALUES (?, ?, ?, ?, ?, ?, 1)
+        try:
+            self.db.execute_update(self._SAVE_DB_CONNECTION_QUERY, self._db_connection_params(config))
+            return True
+        except Exception:
+            return False
+    
+    def save_db_connection_configs(self, configs: List[Dict[str, Any]]) -> bool:
+        """
+        Save multiple database connection configurations in one transaction
+        Args:
+            configs: Connection configurations
+        Returns:
+            bool: True if all were saved (nothing is saved on failure)
+        """
+        try:
+            params_list = [self._db_connection_params(config) for config in configs]
+            if params_list:
+                self.db.execute_many(self._SAVE_DB_CONNECTION_QUERY, params_list)
+            return True
+        except Exception:
+            return False
+    
+    def _db_connection_params(self, config: Dict[str, Any]) -> tuple:
+        """
+        Build row parameters of _SAVE_DB_CONNECTION_QUERY
         """
+        connection_id = config.get("id", f"conn_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}")
+        now = datetime.now().isoformat()
         
-        params = (
+        return (
             connection_id,
             config["name"],
             config["type"],
             json.dumps(config.get("config", {}), ensure_ascii=False),
-            datetime.now().isoformat(),
-            datetime.now().isoformat()
+            now,
+            now
         )
-        
-        try:
-            self.db.execute_update(query, params)
-            return True
-        except Exception:
-            return False
     
     def load_db_connection_config(self, connection_id: str) -> Optional[Dict[str, Any]]:
         """
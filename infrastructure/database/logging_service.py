@@ -10,6 +10,7 @@ import json
 from datetime import datetime, timedelta
 import threading
 import sqlite3
+import time
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent.parent
@@ -20,6 +21,15 @@ from domain.enums import LogLevel
 from domain.chunk import Chunk
 from .unified_db import UnifiedDatabase
 
+# Severity order of log levels
+_LEVEL_ORDER = {
+    LogLevel.DEBUG: 10,
+    LogLevel.INFO: 20,
+    LogLevel.WARNING: 30,
+    LogLevel.ERROR: 40,
+    LogLevel.CRITICAL: 50
+}
+
 class LoggingService:
     """
     Service for logging pipeline execution and monitoring
@@ -29,6 +39,7 @@ class LoggingService:
         self.db = db
         self._initialized = True  # Prevent recursion
         self._is_logging = threading.Lock()  # Prevent concurrent logging issues
+        self.level = LogLevel.DEBUG  # Messages below this level are not stored
     
     def log_pipeline_run(self, run: PipelineRun):
         """
@@ -51,26 +62,34 @@ class LoggingService:
             run.processed_count,
             run.success_count,
             run.error_count,
-            json.dumps(run.errors, ensure_ascii=False),
+            json.dumps(run.materialize_errors(), ensure_ascii=False),
             json.dumps(run.metadata, ensure_ascii=False)
         )
         
         # Execute without triggering additional logging to prevent recursion
         self.db.execute_update(query, params)
     
-    def log_message(self, level: LogLevel, message: str, pipeline_id: Optional[str] = None, 
+    def log_message(self, level: LogLevel, message: str, *args, pipeline_id: Optional[str] = None, 
                    pipeline_run_id: Optional[str] = None, document_path: Optional[str] = None,
                    extra_data: Optional[Dict[str, Any]] = None):
         """
         Log general message
         Args:
             level: Log level (LogLevel enum)
-            message: Log message
+            message: Log message, %-format string when args are given
+            args: Format arguments, applied only if message is stored
             pipeline_id: Associated pipeline ID
             pipeline_run_id: Associated run ID
             document_path: Associated document path
             extra_data Additional context data
         """
+        # Skip messages below configured level before formatting them
+        if _LEVEL_ORDER[level] < _LEVEL_ORDER[self.level]:
+            return
+        
+        if args:
+            message = message % args
+        
         query = """
             INSERT INTO logs (level, message, pipeline_id, pipeline_run_id, document_path, extra_data_json, logged_at)
             VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
@@ -88,6 +107,41 @@ class LoggingService:
         # Execute without triggering additional logging to prevent recursion
         self.db.execute_update(query, params)
     
+    def log_messages_bulk(self, records: List[tuple]) -> int:
+        """
+        Log several messages in one transaction
+        Args:
+            records: Tuples of (level, message, pipeline_id, pipeline_run_id, document_path,
+                     extra_data, logged_at) where logged_at is a time.time() value
+        Returns:
+            int: Number of stored messages
+        """
+        min_level = _LEVEL_ORDER[self.level]
+        params_list = [
+            (
+                level.value,
+                message,
+                pipeline_id,
+                pipeline_run_id,
+                document_path,
+                json.dumps(extra_data or {}, ensure_ascii=False),
+                time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(logged_at))  # CURRENT_TIMESTAMP format (UTC)
+            )
+            for level, message, pipeline_id, pipeline_run_id, document_path, extra_data, logged_at in records
+            if _LEVEL_ORDER[level] >= min_level
+        ]
+        
+        if not params_list:
+            return 0
+        
+        query = """
+            INSERT INTO logs (level, message, pipeline_id, pipeline_run_id, document_path, extra_data_json, logged_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """
+        
+        self.db.execute_many(query, params_list)
+        return len(params_list)
+    
     def get_run_history(self, pipeline_id: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Get execution history for pipeline
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Scheduler Store - Persistent APScheduler jobs and scheduler leadership
+"""
+
+import sys
+from pathlib import Path
+from typing import List, Optional
+from datetime import datetime
+import pickle
+import sqlite3
+import time
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(project_root))
+
+from apscheduler.jobstores.base import BaseJobStore, JobLookupError, ConflictingIdError
+from apscheduler.job import Job
+from apscheduler.util import datetime_to_utc_timestamp, utc_timestamp_to_datetime
+from .unified_db import UnifiedDatabase
+
+class SQLiteJobStore(BaseJobStore):
+    """
+    APScheduler job store keeping jobs in the scheduler_jobs table of the unified database
+    """
+    
+    def __init__(self, db: UnifiedDatabase, pickle_protocol: int = pickle.HIGHEST_PROTOCOL):
+        super().__init__()
+        self.db = db
+        self.pickle_protocol = pickle_protocol
+    
+    def lookup_job(self, job_id: str) -> Optional[Job]:
+        """
+        Get job by ID (None if not stored)
+        """
+        rows = self.db.execute_query("SELECT job_state FROM scheduler_jobs WHERE id = ?", (job_id,))
+        return self._reconstitute_job(rows[0]["job_state"]) if rows else None
+    
+    def get_due_jobs(self, now: datetime) -> List[Job]:
+        """
+        Get jobs due at or before now, ordered by next run time
+        """
+        return self._get_jobs("WHERE next_run_time <= ?", (datetime_to_utc_timestamp(now),))
+    
+    def get_next_run_time(self) -> Optional[datetime]:
+        """
+        Get earliest next run time of active jobs
+        """
+        rows = self.db.execute_query(
+            "SELECT next_run_time FROM scheduler_jobs WHERE next_run_time IS NOT NULL "
+            "ORDER BY next_run_time LIMIT 1"
+        )
+        return utc_timestamp_to_datetime(rows[0]["next_run_time"]) if rows else None
+    
+    def get_all_jobs(self) -> List[Job]:
+        """
+        Get all jobs, paused jobs last
+        """
+        jobs = self._get_jobs()
+        self._fix_paused_jobs_sorting(jobs)
+        return jobs
+    
+    def add_job(self, job: Job):
+        """
+        Store new job
+        """
+        try:
+            self.db.execute_update(
+                "INSERT INTO scheduler_jobs (id, next_run_time, job_state) VALUES (?, ?, ?)",
+                (job.id, datetime_to_utc_timestamp(job.next_run_time), self._job_state(job))
+            )
+        except sqlite3.IntegrityError:
+            raise ConflictingIdError(job.id)
+    
+    def update_job(self, job: Job):
+        """
+        Replace stored state of job
+        """
+        updated = self.db.execute_update(
+            "UPDATE scheduler_jobs SET next_run_time = ?, job_state = ? WHERE id = ?",
+            (datetime_to_utc_timestamp(job.next_run_time), self._job_state(job), job.id)
+        )
+        if updated == 0:
+            raise JobLookupError(job.id)
+    
+    def remove_job(self, job_id: str):
+        """
+        Remove job by ID
+        """
+        if self.db.execute_update("DELETE FROM scheduler_jobs WHERE id = ?", (job_id,)) == 0:
+            raise JobLookupError(job_id)
+    
+    def remove_all_jobs(self):
+        """
+        Remove all stored jobs
+        """
+        self.db.execute_update("DELETE FROM scheduler_jobs")
+    
+    def _job_state(self, job: Job) -> bytes:
+        """
+        Serialize job state (job function must be importable by reference)
+        """
+        return pickle.dumps(job.__getstate__(), self.pickle_protocol)
+    
+    def _reconstitute_job(self, job_state: bytes) -> Job:
+        """
+        Restore job bound to this store and its scheduler
+        """
+        state = pickle.loads(job_state)
+        state["jobstore"] = self
+        job = Job.__new__(Job)
+        job.__setstate__(state)
+        job._scheduler = self._scheduler
+        job._jobstore_alias = self._alias
+        return job
+    
+    def _get_jobs(self, where: str = "", params: tuple = ()) -> List[Job]:
+        """
+        Load jobs ordered by next run time, jobs that cannot be restored are removed
+        """
+        rows = self.db.execute_query(
+            f"SELECT id, job_state FROM scheduler_jobs {where} ORDER BY next_run_time", params
+        )
+        
+        jobs = []
+        failed_job_ids = []
+        for row in rows:
+            try:
+                jobs.append(self._reconstitute_job(row["job_state"]))
+            except BaseException:
+                self._logger.exception('Unable to restore job "%s" -- removing it', row["id"])
+                failed_job_ids.append(row["id"])
+        
+        if failed_job_ids:
+            placeholders = ", ".join("?" * len(failed_job_ids))
+            self.db.execute_update(f"DELETE FROM scheduler_jobs WHERE id IN ({placeholders})", tuple(failed_job_ids))
+        
+        return jobs
+    
+    def __repr__(self):
+        return f"<{self.__class__.__name__} (db_path={self.db.db_path})>"
+
+class SchedulerLeaderLock:
+    """
+    Lease in the scheduler_leader table - only its holder runs scheduled jobs
+    """
+    
+    def __init__(self, db: UnifiedDatabase, holder: str, lease_seconds: float = 30.0):
+        self.db = db
+        self.holder = holder
+        self.lease_seconds = lease_seconds
+    
+    def try_acquire(self) -> bool:
+        """
+        Acquire or renew the lease
+        Returns:
+            bool: True if this holder owns the lease (free, expired or already held)
+        """
+        now = time.time()
+        acquired = self.db.execute_update(
+            """
+            INSERT INTO scheduler_leader (id, holder, expires_at) VALUES (1, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+            WHERE scheduler_leader.holder = excluded.holder OR scheduler_leader.expires_at < ?
+            """,
+            (self.holder, now + self.lease_seconds, now)
+        )
+        return acquired > 0
+    
+    def release(self):
+        """
+        Release the lease if held, so a standby instance can take over immediately
+        """
+        self.db.execute_update("DELETE FROM scheduler_leader WHERE id = 1 AND holder = ?", (self.holder,))
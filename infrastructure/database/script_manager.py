@@ -15,6 +15,7 @@ from infrastructure.security.script_sandbox import ScriptSandbox, ScriptSecurity
 import secrets
 from datetime import datetime
 import hashlib
+import json
 
 class ScriptManager:
     """
@@ -53,11 +54,12 @@ class ScriptManager:
         # Generate unique script ID
         script_id = f"script_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{secrets.token_hex(4)}"
         
-        # Insert into database
+        # Insert into database together with the validation result
         query = """
             INSERT INTO user_scripts 
-            (id, name, code_encrypted, checksum, pipeline_id, version, created_at, updated_at)
-            VALUES (?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
+            (id, name, code_encrypted, checksum, pipeline_id, version, created_at, updated_at,
+             security_validated_at, validator_version, validation_errors_json)
+            VALUES (?, ?, ?, ?, ?, 1, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, ?, ?)
         """
         
         params = (
@@ -65,7 +67,9 @@ class ScriptManager:
             name,
             encrypted_code,
             checksum,
-            pipeline_id
+            pipeline_id,
+            ScriptSecurityValidator.VERSION,
+            json.dumps(security_errors)
         )
         
         self.db.execute_update(query, params)
@@ -87,7 +91,39 @@ class ScriptManager:
         if not results:
             return None
         
-        row = results[0]
+        return self._row_to_script(results[0])
+    
+    def load_scripts(self, script_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load and decrypt several scripts with a single query
+        Args:
+            script_ids: Script identifiers
+        Returns:
+            Dict mapping script_id to script data (missing scripts are absent)
+        Raises:
+            SecurityError: If decryption fails or integrity check fails
+        """
+        unique_ids = list(dict.fromkeys(script_ids))
+        if not unique_ids:
+            return {}
+        
+        placeholders = ",".join("?" * len(unique_ids))
+        query = f"SELECT * FROM user_scripts WHERE id IN ({placeholders}) AND is_active = 1"
+        results = self.db.execute_query(query, tuple(unique_ids))
+        
+        return {row['id']: self._row_to_script(row) for row in results}
+    
+    def _row_to_script(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Decrypt and verify script row
+        Args:
+            row: Row of user_scripts table
+        Returns:
+            Dict with script data
+        Raises:
+            SecurityError: If decryption fails or integrity check fails
+        """
+        script_id = row['id']
         
         try:
             # Decrypt the script code
@@ -109,7 +145,10 @@ class ScriptManager:
                 "pipeline_id": row['pipeline_id'],
                 "created_at": row['created_at'],
                 "updated_at": row['updated_at'],
-                "version": row['version']
+                "version": row['version'],
+                "security_validated_at": row.get('security_validated_at'),
+                "validator_version": row.get('validator_version'),
+                "validation_errors": json.loads(row['validation_errors_json']) if row.get('validation_errors_json') else None
             }
         except Exception as e:
             # Decryption failed - possibly tampered with
@@ -222,11 +261,47 @@ class ScriptManager:
         
         query = """
             UPDATE user_scripts 
-            SET name = ?, code_encrypted = ?, checksum = ?, updated_at = CURRENT_TIMESTAMP
+            SET name = ?, code_encrypted = ?, checksum = ?, updated_at = CURRENT_TIMESTAMP,
+                security_validated_at = CURRENT_TIMESTAMP, validator_version = ?, validation_errors_json = ?
+            WHERE id = ?
+        """
+        
+        params = (name, encrypted_code, checksum, ScriptSecurityValidator.VERSION, 
+                  json.dumps(security_errors), script_id)
+        rows_affected = self.db.execute_update(query, params)
+        return rows_affected > 0
+    
+    def is_security_validated(self, script_data: Dict[str, Any]) -> bool:
+        """
+        Check if loaded script has a stored, still valid security validation
+        Args:
+            script_data: Script data returned by load_script
+        Returns:
+            bool: True if script passed validation with the current validator version
+        """
+        # Checksum of the stored code is already verified by load_script
+        return (
+            script_data.get("security_validated_at") is not None
+            and script_data.get("validator_version") == ScriptSecurityValidator.VERSION
+            and script_data.get("validation_errors") == []
+        )
+    
+    def mark_security_validated(self, script_id: str, security_errors: List[str]) -> bool:
+        """
+        Store result of a live security validation
+        Args:
+            script_id: Script identifier
+            security_errors: Validation errors (empty if script is safe)
+        Returns:
+            bool: True if stored successfully
+        """
+        query = """
+            UPDATE user_scripts 
+            SET security_validated_at = CURRENT_TIMESTAMP, validator_version = ?, validation_errors_json = ?
             WHERE id = ?
         """
         
-        params = (name, encrypted_code, checksum, script_id)
+        params = (ScriptSecurityValidator.VERSION, json.dumps(security_errors), script_id)
         rows_affected = self.db.execute_update(query, params)
         return rows_affected > 0
     
@@ -36,6 +36,9 @@ class UnifiedDatabase:
         with self._get_connection() as conn:
             cursor = conn.cursor()
             
+            # Write-ahead log: commits append to the log instead of rewriting pages (persistent setting)
+            cursor.execute("PRAGMA journal_mode=WAL")
+            
             # Pipelines table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS pipelines (
@@ -65,10 +68,20 @@ class UnifiedDatabase:
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     version INTEGER DEFAULT 1,
                     is_active BOOLEAN DEFAULT 1,
+                    security_validated_at TIMESTAMP,
+                    validator_version INTEGER,
+                    validation_errors_json TEXT,
                     FOREIGN KEY (pipeline_id) REFERENCES pipelines (id)
                 )
             """)
             
+            # Security validation columns for databases created before they existed
+            self._ensure_columns(cursor, "user_scripts", {
+                "security_validated_at": "TIMESTAMP",
+                "validator_version": "INTEGER",
+                "validation_errors_json": "TEXT"
+            })
+            
             # Pipeline runs table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS pipeline_runs (
@@ -130,6 +143,24 @@ class UnifiedDatabase:
                     user_id TEXT
                 )
             """)
+            
+            # Persistent scheduler jobs (pickled APScheduler job state)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scheduler_jobs (
+                    id TEXT PRIMARY KEY,
+                    next_run_time REAL,
+                    job_state BLOB NOT NULL
+                )
+            """)
+            
+            # Lease of the scheduler instance allowed to run jobs (single row)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS scheduler_leader (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    holder TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS logs (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -155,12 +186,30 @@ class UnifiedDatabase:
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipelines_name ON pipelines(name)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_runs_status ON pipeline_runs(status)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_runs_time ON pipeline_runs(start_time)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipelines_active_created ON pipelines(is_active, created_at DESC)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_pipeline_runs_pipeline_start ON pipeline_runs(pipeline_id, start_time DESC)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_run_id ON chunks(pipeline_run_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks(document_id)")
             cursor.execute("CREATE INDEX IF NOT EXISTS idx_scripts_pipeline ON user_scripts(pipeline_id)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_scheduler_jobs_next_run ON scheduler_jobs(next_run_time)")
             
             conn.commit()
     
+    def _ensure_columns(self, cursor: sqlite3.Cursor, table_name: str, columns: Dict[str, str]):
+        """
+        Add missing columns to existing table
+        Args:
+            cursor: Open database cursor
+            table_name: Table to migrate
+            columns: Mapping of column name to SQL type
+        """
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        existing = {row[1] for row in cursor.fetchall()}
+        
+        for column_name, column_type in columns.items():
+            if column_name not in existing:
+                cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
+    
     def initialize_schema(self):
         """
         Public method to initialize database schema
@@ -178,7 +227,9 @@ class UnifiedDatabase:
         """
         Get database connection (thread-safe)
         """
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")  # Safe with WAL, no fsync on every commit
+        return conn
     
     def execute_query(self, query: str, params: tuple = ()) -> List[Dict[str, Any]]:
         """
@@ -201,6 +252,17 @@ class UnifiedDatabase:
                 conn.commit()
                 return cursor.rowcount
     
+    def execute_many(self, query: str, params_seq) -> int:
+        """
+        Execute INSERT/UPDATE/DELETE for each parameter tuple in one transaction and return affected rows
+        """
+        with self.lock:
+            with self._get_connection() as conn:
+                cursor = conn.cursor()
+                cursor.executemany(query, params_seq)
+                conn.commit()
+                return cursor.rowcount
+    
     def backup_database(self, backup_path: str) -> bool:
         """
         Backup database to another file
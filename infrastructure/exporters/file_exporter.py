@@ -64,8 +64,8 @@ class FileExporter(IDbExporter):
             chunk_dict = {
                 "id": chunk.id,
                 "text": chunk.text,
-                "meta": chunk.meta.__dict__,
-                "extraction_results": chunk.extraction_results,
+                "meta": chunk.meta.to_dict(),
+                "extraction_results": chunk.extraction_results or {},
                 "exported_at": datetime.now().isoformat()
             }
             chunk_data.append(chunk_dict)
@@ -90,7 +90,7 @@ class FileExporter(IDbExporter):
                     chunk.meta.section_id,
                     chunk.meta.section_title,
                     chunk.meta.section_level,
-                    chunk.meta.chunk_type.value if hasattr(chunk.meta.chunk_type, 'value') else str(chunk.meta.chunk_type),
+                    chunk.meta.chunk_type._value_,
                     datetime.now().isoformat()
                 ])
     
@@ -105,7 +105,7 @@ class FileExporter(IDbExporter):
                 f.write(f"Page: {chunk.meta.page_num}\n")
                 f.write(f"Section: {chunk.meta.section_title} (Level {chunk.meta.section_level})\n")
                 f.write(f"Text:\n{chunk.text}\n")
-                f.write(f"Extraction Results: {chunk.extraction_results}\n")
+                f.write(f"Extraction Results: {chunk.extraction_results or {}}\n")
                 f.write("---\n\n")
     
     def export_run_metadata(self, run: PipelineRun):
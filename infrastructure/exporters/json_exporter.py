@@ -5,14 +5,37 @@ JSON Exporter - Export chunks to JSON files
 
 import json
 import os
+from dataclasses import asdict
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from domain.interfaces import IDbExporter  # ← Fixed import path
-from domain.document import Document, Section
+from domain.document import Document, Page, Section
 from domain.chunk import Chunk, Metadata, ChunkType
 from domain.pipeline import PipelineRun, PipelineStatus
 from datetime import datetime, timezone
 import gzip
+import io
+
+try:
+    import orjson
+except ImportError:  # Optional, stdlib json is used without it
+    orjson = None
+
+def _dumps(data: Any, pretty_print: bool, default) -> bytes:
+    """
+    Serialize data to UTF-8 JSON bytes (orjson if installed, otherwise stdlib json)
+    Args:
+        data: Data to serialize
+        pretty_print: Indent with 2 spaces
+        default: Serializer of objects JSON cannot represent
+    Returns:
+        bytes: Serialized data
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty_print else 0)
+        return orjson.dumps(data, default=default, option=option)
+    return json.dumps(data, indent=2 if pretty_print else None, ensure_ascii=False,
+                      default=default).encode('utf-8')
 
 class JsonExporter(IDbExporter):
     """
@@ -20,6 +43,9 @@ class JsonExporter(IDbExporter):
     Supports both regular JSON and compressed JSON.gz formats
     """
     
+    # Write buffer used for export files (bytes)
+    DEFAULT_BUFFER_SIZE = 1 << 20
+    
     def __init__(self, output_dir: Optional[str] = None, compress: bool = False):
         self.output_dir = output_dir or "./output"
         self.compress = compress
@@ -60,18 +86,8 @@ class JsonExporter(IDbExporter):
             chunk_dict = {
                 "id": chunk.id,
                 "text": chunk.text,
-                "meta": {
-                    "document_id": chunk.meta.document_id,
-                    "page_num": chunk.meta.page_num,
-                    "section_id": chunk.meta.section_id,
-                    "section_title": chunk.meta.section_title,
-                    "section_level": chunk.meta.section_level,
-                    "chunk_type": chunk.meta.chunk_type.value if hasattr(chunk.meta.chunk_type, 'value') else str(chunk.meta.chunk_type),
-                    "pipeline_run_id": chunk.meta.pipeline_run_id,
-                    "source_type": chunk.meta.source_type,
-                    "line_num": chunk.meta.line_num
-                },
-                "extraction_results": chunk.extraction_results,
+                "meta": self._meta_to_dict(chunk.meta),
+                "extraction_results": chunk.extraction_results or {},
                 "exported_at": datetime.now(timezone.utc).isoformat()
             }
             chunk_data.append(chunk_dict)
@@ -80,6 +96,50 @@ class JsonExporter(IDbExporter):
         file_path = os.path.join(self.output_dir, file_name)
         self._write_json_data(chunk_data, file_path)
     
+    def export_to_json(self, chunks: List[Any], output_path: str, file_name: str,
+                       pretty_print: bool = True, include_metadata: bool = True,
+                       buffer_size: Optional[int] = None) -> str:
+        """
+        Export chunks to JSON array file, streaming records through a write buffer
+        Args:
+            chunks: Chunks (or already serializable records) to export
+            output_path: Output directory
+            file_name: Output file name
+            pretty_print: Indent records
+            include_metadata: Include chunk metadata
+            buffer_size: Write buffer size in bytes (DEFAULT_BUFFER_SIZE if None)
+        Returns:
+            str: Path of written file
+        """
+        Path(output_path).mkdir(parents=True, exist_ok=True)
+        file_path = os.path.join(output_path, file_name)
+        exported_at = datetime.now(timezone.utc).isoformat()
+        
+        if self.compress:
+            file_path += ".gz"
+            raw = gzip.open(file_path, 'wb')
+        else:
+            raw = io.FileIO(file_path, 'w')
+        
+        # Records are written piecewise, the buffer turns them into few large writes
+        with io.BufferedWriter(raw, buffer_size=buffer_size or self.DEFAULT_BUFFER_SIZE) as f:
+            f.write(b"[")
+            for i, chunk in enumerate(chunks):
+                if isinstance(chunk, Chunk):
+                    record = {"id": chunk.id, "text": chunk.text}
+                    if include_metadata:
+                        record["meta"] = self._meta_to_dict(chunk.meta)
+                    record["extraction_results"] = chunk.extraction_results or {}
+                    record["exported_at"] = exported_at
+                else:
+                    record = chunk
+                
+                f.write(b",\n" if i else b"\n")
+                f.write(_dumps(record, pretty_print, self._json_serializer))
+            f.write(b"\n]")
+        
+        return file_path
+    
     def export_run_metadata(self, run: PipelineRun):
         """
         Export pipeline run metadata to JSON file
@@ -95,7 +155,7 @@ class JsonExporter(IDbExporter):
             "processed_count": run.processed_count,
             "success_count": run.success_count,
             "error_count": run.error_count,
-            "errors": run.errors,
+            "errors": run.materialize_errors(),
             "metadata": run.metadata,
             "exported_at": datetime.now(timezone.utc).isoformat()
         }
@@ -107,6 +167,22 @@ class JsonExporter(IDbExporter):
         
         self._write_json_data(run_data, file_path)
     
+    def _meta_to_dict(self, meta: Metadata) -> Dict[str, Any]:
+        """
+        Convert chunk metadata to exported dictionary
+        """
+        return {
+            "document_id": meta.document_id,
+            "page_num": meta.page_num,
+            "section_id": meta.section_id,
+            "section_title": meta.section_title,
+            "section_level": meta.section_level,
+            "chunk_type": meta.chunk_type._value_,
+            "pipeline_run_id": meta.pipeline_run_id,
+            "source_type": meta.source_type,
+            "line_num": meta.line_num
+        }
+    
     def _write_json_data(self, data: Any, file_path: str):
         """
         Write JSON data to file (with optional compression)
@@ -114,15 +190,18 @@ class JsonExporter(IDbExporter):
              Data to write
             file_path: Output file path
         """
+        # Serialize once and write a single blob instead of many small encoder pieces
+        payload = _dumps(data, True, self._json_serializer)
+        
         if self.compress:
             # Write compressed JSON
             compressed_path = file_path + ".gz"
-            with gzip.open(compressed_path, 'wt', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=self._json_serializer)
+            with gzip.open(compressed_path, 'wb') as f:
+                f.write(payload)
         else:
             # Write regular JSON
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=self._json_serializer)
+            with open(file_path, 'wb') as f:
+                f.write(payload)
     
     def _json_serializer(self, obj):
         """
@@ -130,6 +209,10 @@ class JsonExporter(IDbExporter):
         """
         if isinstance(obj, datetime):
             return obj.isoformat()
+        elif isinstance(obj, (Metadata, Document)):
+            return obj.to_dict()
+        elif isinstance(obj, (Page, Section)):
+            return asdict(obj)  # Slotted dataclasses have no __dict__
         elif hasattr(obj, '__dict__'):
             return obj.__dict__  # Convert domain objects to dict
         raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
@@ -178,8 +261,8 @@ class JsonExporter(IDbExporter):
             chunk_dict = {
                 "id": chunk.id,
                 "text": chunk.text,
-                "meta": chunk.meta.__dict__,
-                "extraction_results": chunk.extraction_results,
+                "meta": chunk.meta.to_dict(),
+                "extraction_results": chunk.extraction_results or {},
                 "exported_at": datetime.now(timezone.utc).isoformat()
             }
             chunk_data.append(chunk_dict)
@@ -216,8 +299,8 @@ class JsonExporter(IDbExporter):
                 chunk_dict = {
                     "id": chunk.id,
                     "text": chunk.text,
-                    "meta": chunk.meta.__dict__,
-                    "extraction_results": chunk.extraction_results,
+                    "meta": chunk.meta.to_dict(),
+                    "extraction_results": chunk.extraction_results or {},
                     "exported_at": datetime.now(timezone.utc).isoformat()
                 }
                 batch_data.append(chunk_dict)
@@ -115,11 +115,11 @@ class MongoDbExporter(IDbExporter):
                 "section_id": chunk.meta.section_id,
                 "section_title": chunk.meta.section_title,
                 "section_level": chunk.meta.section_level,
-                "chunk_type": chunk.meta.chunk_type.value if hasattr(chunk.meta.chunk_type, 'value') else str(chunk.meta.chunk_type),
+                "chunk_type": chunk.meta.chunk_type._value_,
                 "pipeline_run_id": chunk.meta.pipeline_run_id,
                 "source_type": chunk.meta.source_type,
                 "line_num": chunk.meta.line_num,
-                "extraction_results": chunk.extraction_results,
+                "extraction_results": chunk.extraction_results or {},
                 "created_at": datetime.now()
             }
             documents.append(doc)
@@ -158,7 +158,7 @@ class MongoDbExporter(IDbExporter):
             "processed_count": run.processed_count,
             "success_count": run.success_count,
             "error_count": run.error_count,
-            "errors": run.errors,
+            "errors": run.materialize_errors(),
             "metadata": run.metadata,
             "exported_at": datetime.now()
         }
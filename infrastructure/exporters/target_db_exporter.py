@@ -79,11 +79,11 @@ class TargetDbExporter(IDbExporter):
             "section_id": chunk.meta.section_id,
             "section_title": chunk.meta.section_title,
             "section_level": chunk.meta.section_level,
-            "chunk_type": chunk.meta.chunk_type.value if hasattr(chunk.meta.chunk_type, 'value') else str(chunk.meta.chunk_type),
+            "chunk_type": chunk.meta.chunk_type._value_,
             "pipeline_run_id": chunk.meta.pipeline_run_id,
             "source_type": chunk.meta.source_type,
             "line_num": chunk.meta.line_num,
-            "extraction_results": json.dumps(chunk.extraction_results, ensure_ascii=False),
+            "extraction_results": json.dumps(chunk.extraction_results or {}, ensure_ascii=False),
             "created_at": datetime.now().isoformat()
         }
     
@@ -115,7 +115,7 @@ class TargetDbExporter(IDbExporter):
             "processed_count": run.processed_count,
             "success_count": run.success_count,
             "error_count": run.error_count,
-            "errors": json.dumps(run.errors, ensure_ascii=False),
+            "errors": json.dumps(run.materialize_errors(), ensure_ascii=False),
             "metadata": json.dumps(run.metadata, ensure_ascii=False),
             "exported_at": datetime.now().isoformat()
         }
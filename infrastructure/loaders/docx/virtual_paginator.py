@@ -1,5 +1,5 @@
 from typing import List, Dict, Any
-from domain.document import Page
+from domain.document import Block, Page
 from docx import Document as DocxDocument
 
 class VirtualPaginator:
@@ -32,12 +32,7 @@ class VirtualPaginator:
                 number=(i // paragraphs_per_page) + 1,
                 raw_text=page_text,
                 blocks=[
-                    {
-                        "text": p.text,
-                        "style": p.style.name,
-                        "type": "paragraph",
-                        "line_number": j + 1
-                    }
+                    Block(text=p.text, style=p.style.name, line_number=j + 1)
                     for j, p in enumerate(page_paragraphs)
                     if p.text.strip()
                 ]
@@ -85,7 +80,7 @@ class VirtualPaginator:
                     number=page_number,
                     raw_text=page_text,
                     blocks=[
-                        {"text": p.text, "style": p.style.name, "type": "paragraph"}
+                        Block(text=p.text, style=p.style.name)
                         for p in current_page_content
                     ]
                 )
@@ -106,7 +101,7 @@ class VirtualPaginator:
                 number=page_number,
                 raw_text=page_text,
                 blocks=[
-                    {"text": p.text, "style": p.style.name, "type": "paragraph"}
+                    Block(text=p.text, style=p.style.name)
                     for p in current_page_content
                 ]
             )
@@ -90,7 +90,7 @@ class DelimiterSplitter(IChunkProcessor):
             if part:  # Skip empty parts
                 new_chunk = Chunk(
                     text=part,
-                    meta=Metadata(
+                    meta=Metadata.unchecked(  # Copied from validated parent metadata
                         document_id=chunk.meta.document_id,
                         section_id=chunk.meta.section_id,
                         section_title=chunk.meta.section_title,
@@ -79,7 +79,7 @@ class LineSplitter(IChunkProcessor):
             if line.strip():  # Skip empty lines
                 new_chunk = Chunk(
                     text=line.strip(),
-                    meta=Metadata(
+                    meta=Metadata.unchecked(  # Copied from validated parent metadata
                         document_id=chunk.meta.document_id,
                         section_id=chunk.meta.section_id,
                         section_title=chunk.meta.section_title,
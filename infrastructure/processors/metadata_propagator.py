@@ -202,18 +202,18 @@ class MetadataPropagator(IChunkProcessor):
         processed_texts = set()
         
         for block in page.blocks:
-            if block.get('type') == 'text':
-                all_spans = block.get('all_spans', [])
+            if block.type == 'text':
+                all_spans = block.all_spans
                 
                 if all_spans:
                     # Process spans to detect potential multiline headers
                     self._process_spans_for_headers(all_spans, document, page.number)
                 else:
                     # Fallback to single text processing
-                    text = block.get('text', '')
+                    text = block.text
                     if text and text not in processed_texts:
-                        font_size = block.get('font_size')
-                        font_flags = block.get('font_flags')
+                        font_size = block.font_size
+                        font_flags = block.font_flags
                         
                         header_level = self.header_detector.detect_header_level(
                             text, font_size, font_flags
@@ -284,17 +284,18 @@ class MetadataPropagator(IChunkProcessor):
         Ensure chunk has proper metadata by propagating from parent context
         """
         # Ensure required metadata exists
-        if not chunk.meta.document_id:
-            chunk.meta.document_id = "unknown"
+        meta = chunk.ensure_owned_meta()
+        if not meta.document_id:
+            meta.document_id = "unknown"
         
-        if not chunk.meta.section_id:
-            chunk.meta.section_id = "unknown"
+        if not meta.section_id:
+            meta.section_id = "unknown"
         
-        if not chunk.meta.section_title:
-            chunk.meta.section_title = "unknown"
+        if not meta.section_title:
+            meta.section_title = "unknown"
         
-        if chunk.meta.section_level < 1:
-            chunk.meta.section_level = 1
+        if meta.section_level < 1:
+            meta.section_level = 1
         
         return chunk
     
@@ -306,6 +307,7 @@ class MetadataPropagator(IChunkProcessor):
         
         for child in child_chunks:
             # Copy essential metadata from parent
+            child.ensure_owned_meta()
             child.meta.document_id = parent_chunk.meta.document_id
             child.meta.section_id = parent_chunk.meta.section_id
             child.meta.section_title = parent_chunk.meta.section_title
@@ -78,7 +78,7 @@ class ParagraphSplitter(IChunkProcessor):
             if para:  # Skip empty paragraphs
                 new_chunk = Chunk(
                     text=para,
-                    meta=Metadata(
+                    meta=Metadata.unchecked(  # Copied from validated parent metadata
                         document_id=chunk.meta.document_id,
                         section_id=chunk.meta.section_id,
                         section_title=chunk.meta.section_title,
@@ -76,7 +76,7 @@ class SentenceSplitter(IChunkProcessor):
             if sent:  # Skip empty sentences
                 new_chunk = Chunk(
                     text=sent,
-                    meta=Metadata(
+                    meta=Metadata.unchecked(  # Copied from validated parent metadata
                         document_id=chunk.meta.document_id,
                         section_id=chunk.meta.section_id,
                         section_title=chunk.meta.section_title,
@@ -18,7 +18,6 @@ import os
 import pickle
 import marshal
 from multiprocessing import Process, Queue, TimeoutError as MPTimeoutError
-from datetime import datetime
 import math
 import json
 import datetime
@@ -38,7 +37,7 @@ class SecurityError(Exception):
         self.message = message
         self.violation_type = violation_type
         self.details = details or {}
-        self.timestamp = datetime.now()
+        self.timestamp = datetime.datetime.now()
     
     def __str__(self):
         return f"[{self.violation_type}] {self.message}"
@@ -66,7 +65,7 @@ class ScriptExecutionError(Exception):
         self.script_id = script_id
         self.execution_context = execution_context or {}
         self.original_error = original_error
-        self.timestamp = datetime.now()
+        self.timestamp = datetime.datetime.now()
     
     def __str__(self):
         script_info = f" (Script: {self.script_id})" if self.script_id else ""
@@ -94,7 +93,7 @@ class ScriptExecutionTimeout(Exception):
         self.message = message
         self.timeout_seconds = timeout_seconds
         self.script_id = script_id
-        self.timestamp = datetime.now()
+        self.timestamp = datetime.datetime.now()
     
     def __str__(self):
         script_info = f" (Script: {self.script_id})" if self.script_id else ""
@@ -115,6 +114,9 @@ class ScriptSecurityValidator:
     Validates script code for security compliance
     """
     
+    # Bump when validation rules change so stored validation results are redone
+    VERSION = 1
+    
     @staticmethod
     def validate_script_security(script_code: str) -> List[str]:
         """
@@ -250,6 +252,47 @@ class SecurityASTVisitor(ast.NodeVisitor):
         }
         return attr_name in dangerous_attributes
 
+def execute_sandboxed_code(code, context: Dict[str, Any], secure_builtins: dict) -> Any:
+    """
+    Execute script code with restricted builtins, capturing its stdout
+    Args:
+        code: Script source or code object (already security validated)
+        context: Input context for the script
+        secure_builtins: Builtins available to the script
+    Returns:
+        Any: Script result, combined with captured output if the script printed
+    """
+    # Capture stdout
+    old_stdout = sys.stdout
+    captured_output = StringIO()
+    sys.stdout = captured_output
+    
+    try:
+        # Create secure globals and locals
+        secure_globals = {
+            '__builtins__': secure_builtins
+        }
+        secure_locals = context.copy()
+        
+        # Execute script
+        exec(code, secure_globals, secure_locals)
+        
+        # Get result if defined
+        result = secure_locals.get('result')
+        
+        # Capture output
+        output = captured_output.getvalue()
+        if output:
+            if result is None:
+                result = output
+            else:
+                result = {"output": output, "result": result}
+        
+        return result
+    finally:
+        # Restore stdout
+        sys.stdout = old_stdout
+
 class ScriptSandbox:
     """
     Secure execution environment for user scripts
@@ -408,36 +451,7 @@ class ScriptSandbox:
         
         def execute_function(code, ctx, result_q, error_q):
             try:
-                # Capture stdout
-                old_stdout = sys.stdout
-                captured_output = StringIO()
-                sys.stdout = captured_output
-                
-                try:
-                    # Create secure globals and locals
-                    secure_globals = {
-                        '__builtins__': self.secure_builtins
-                    }
-                    secure_locals = ctx.copy()
-                    
-                    # Execute script
-                    exec(code, secure_globals, secure_locals)
-                    
-                    # Get result if defined
-                    result = secure_locals.get('result')
-                    
-                    # Capture output
-                    output = captured_output.getvalue()
-                    if output:
-                        if result is None:
-                            result = output
-                        else:
-                            result = {"output": output, "result": result}
-                    
-                    result_q.put(("success", result))
-                finally:
-                    # Restore stdout
-                    sys.stdout = old_stdout
+                result_q.put(("success", execute_sandboxed_code(code, ctx, self.secure_builtins)))
             except Exception as e:
                 error_q.put(("error", str(e)))
         
@@ -505,6 +519,7 @@ class ScriptSandbox:
 __all__ = [
     'ScriptSandbox',
     'ScriptSecurityValidator',
+    'execute_sandboxed_code',
     'SecurityError',
     'ScriptExecutionError',
     'ScriptExecutionTimeout'
@@ -208,8 +208,8 @@ class MetadataInspector(QWidget):
         raw_data = {
             "chunk_id": chunk.id,
             "text_preview": chunk.text[:100] + "..." if len(chunk.text) > 100 else chunk.text,
-            "metadata": meta.__dict__,
-            "extraction_results": chunk.extraction_results
+            "metadata": meta.to_dict(),
+            "extraction_results": chunk.extraction_results or {}
         }
         
         self.raw_metadata_view.setText(json.dumps(raw_data, indent=2, ensure_ascii=False, default=str))